@@ -1,5 +1,10 @@
 # Package marker for Sortune API
+from sortune_adapters.env import load_env
+
 try:
     from ._version import __version__
 except Exception:
     __version__ = "0.0.0"
+
+# .env first: routes, middleware and settings read the environment from here on
+load_env()
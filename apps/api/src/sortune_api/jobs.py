@@ -0,0 +1,179 @@
+"""
+Producer side of the background jobs in sortune_worker.jobs.
+
+Jobs are enqueued by dotted path, so the API does not need the worker's job
+dependencies (deduplication is sortune_adapters.jobs).
+Identical jobs (same type and arguments) are deduplicated: while one is waiting
+or running, enqueueing it again returns that job. Each job type goes to its own queue
+(names as in sortune_worker.queues) so long imports never sit in front of quick
+sorts. Progress that jobs publish to their event stream (sortune_worker.context)
+is relayed as server-sent events, read with redis.asyncio so a waiting stream does
+not hold a threadpool thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+from rq import Queue, Retry
+from rq.exceptions import NoSuchJobError
+from rq.job import Job, JobStatus
+from sortune_adapters.jobs import enqueue_once
+from sortune_adapters.telemetry import inject_context
+
+from .profiling import current_profile
+from .settings import settings
+
+# How long finished jobs (and their results) stay readable via GET /jobs/{id}
+RESULT_TTL_SECONDS = 24 * 3600
+# Per-job progress stream written by sortune_worker.context (keep the key format in sync)
+EVENTS_KEY = "job-events:{job_id}"
+# How long one read of the event stream blocks before checking the job / sending a heartbeat
+EVENTS_BLOCK_MS = 5000
+_ENDED = (JobStatus.FINISHED, JobStatus.FAILED, JobStatus.STOPPED, JobStatus.CANCELED)
+
+
+@dataclass(frozen=True)
+class JobType:
+    func: str  # dotted path of the worker function
+    queue: str
+    timeout: int  # seconds
+    retry: Retry | None = None
+
+
+JOB_TYPES: dict[str, JobType] = {
+    "import": JobType("sortune_worker.jobs.playlists.import_playlist", "import", 1800),
+    "refresh": JobType("sortune_worker.jobs.playlists.refresh_playlist", "import", 1800),
+    "sort": JobType("sortune_worker.jobs.playlists.sort_playlist", "sort", 300),
+    "dedupe": JobType("sortune_worker.jobs.playlists.dedupe_playlist", "sort", 300),
+    # Interrupted write-backs resume from their checkpoint, so retrying is cheap
+    "writeback": JobType(
+        "sortune_worker.jobs.writeback.write_back_playlist",
+        "writeback",
+        3600,
+        Retry(max=3, interval=[10, 60, 300]),
+    ),
+}
+
+
+def enqueue(redis: Redis, job_type: str, *args: Any, **kwargs: Any) -> Job:
+    """
+    Queue a `job_type` job (`args`/`kwargs` go to the job function), or return the
+    identical job already waiting or running.
+    """
+    spec = JOB_TYPES[job_type]
+    # The worker continues the enqueuing request's trace (sortune_worker.tracing)
+    meta: dict[str, Any] = {"type": job_type, "trace": inject_context()}
+    profile = current_profile()
+    if profile is not None:  # a profiled request: profile the job too (sortune_worker.profiling)
+        meta["profile"] = {"format": profile.format, "ttl": settings.PROFILE_TTL_SECONDS}
+    job, _ = enqueue_once(
+        Queue(spec.queue, connection=redis),
+        job_type,
+        spec.func,
+        args=args,
+        kwargs=kwargs,
+        timeout=spec.timeout,
+        result_ttl=RESULT_TTL_SECONDS,
+        failure_ttl=RESULT_TTL_SECONDS,
+        retry=spec.retry,
+        meta=meta,
+    )
+    return job
+
+
+def fetch(redis: Redis, job_id: str) -> Job | None:
+    try:
+        return Job.fetch(job_id, connection=redis)
+    except NoSuchJobError:
+        return None
+
+
+def describe(job: Job) -> dict[str, Any]:
+    """Status, progress and (once finished) result or error of a job, as JSON-ready data."""
+    status = job.get_status(refresh=False)
+    out: dict[str, Any] = {
+        "id": job.id,
+        "type": job.meta.get("type"),
+        "queue": job.origin,
+        "status": JobStatus(status).value,
+        "progress": job.meta.get("progress"),
+        "result": None,
+        "error": None,
+        "enqueued_at": _iso(job.enqueued_at),
+        "started_at": _iso(job.started_at),
+        "ended_at": _iso(job.ended_at),
+    }
+    if "profile" in job.meta:
+        out["profile"] = f"/profiles/{job.id}"
+    if status == JobStatus.FINISHED:
+        out["result"] = job.return_value()
+    elif status == JobStatus.FAILED:
+        latest = job.latest_result()
+        if latest is not None and latest.exc_string:
+            # The exception line, not the worker's traceback
+            out["error"] = latest.exc_string.strip().splitlines()[-1]
+    return out
+
+
+async def events(
+    redis: AsyncRedis,
+    job: Job,
+    last_event_id: str | None = None,
+    *,
+    block_ms: int = EVENTS_BLOCK_MS,
+) -> AsyncIterator[str]:
+    """
+    The job's progress as server-sent events, starting after `last_event_id` (a
+    reconnecting client's Last-Event-ID), ending with one `finished`/`failed`/...
+    event carrying `describe(job)` once the job is over:
+
+        id: 1718000000000-0
+        event: progress
+        data: {"stage": "storing", "done": 500, "total": 10000, "eta_seconds": 4.2, ...}
+    """
+    key = EVENTS_KEY.format(job_id=job.id)
+    last = last_event_id or "0-0"
+    yield f"retry: {block_ms}\n\n"
+    while True:
+        raw = await redis.hget(job.key, "status")
+        if raw is None:
+            return  # expired meanwhile
+        status = JobStatus(_text(raw))
+        ended = status in _ENDED
+        # Once the job is over nothing more is written: drain without blocking
+        batch = await redis.xread({key: last}, block=None if ended else block_ms)
+        for _, entries in batch or ():
+            for entry_id, fields in entries:
+                last = _text(entry_id)
+                yield _sse("progress", _text(fields[b"data"]), last)
+        if ended:
+            # Once per stream: the result through the job's own (blocking) connection
+            yield _sse(status.value, await asyncio.to_thread(_describe_ended, job))
+            return
+        if not batch:
+            yield ": keep-alive\n\n"
+
+
+def _describe_ended(job: Job) -> str:
+    job.refresh()
+    return json.dumps(describe(job), default=str)
+
+
+def _sse(event: str, data: str, event_id: str | None = None) -> str:
+    head = f"id: {event_id}\n" if event_id else ""
+    return f"{head}event: {event}\ndata: {data}\n\n"
+
+
+def _text(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _iso(value) -> str | None:
+    return value.isoformat() if value is not None else None
@@ -1,7 +1,15 @@
+import os
+
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from sortune_adapters.telemetry import configure_tracing
 
+from . import metrics, tracing
 from .routes import ai as ai_routes
-from .routes import playlists
+from .routes import discover, jobs, playlists, profiles
+
+# Opt-in OpenTelemetry spans (SORTUNE_TRACING=console|memory|otlp)
+configure_tracing("sortune-api")
 
 app = FastAPI(
     title="Sortune API",
@@ -9,9 +17,26 @@ app = FastAPI(
     description="API for managing, sorting, and curating YouTube Music playlists",
 )
 
+# Playlist JSON compresses >10x; responses under SORTUNE_GZIP_MINIMUM_SIZE bytes are
+# not worth the CPU
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=int(os.getenv("SORTUNE_GZIP_MINIMUM_SIZE", "1024")),
+    compresslevel=int(os.getenv("SORTUNE_GZIP_LEVEL", "5")),
+)
+
+# Added last = outermost: request latency includes compression, and the request's
+# span encloses everything else
+app.add_middleware(metrics.RequestMetricsMiddleware)
+app.add_middleware(tracing.RequestTracingMiddleware)
+
 # Routers
 app.include_router(playlists.router)
 app.include_router(ai_routes.router)
+app.include_router(discover.router)
+app.include_router(jobs.router)
+app.include_router(metrics.router)
+app.include_router(profiles.router)
 
 
 @app.get("/health", tags=["system"])
@@ -0,0 +1,61 @@
+"""
+HTTP metrics for the API and the `GET /metrics` scrape endpoint.
+
+Requests are labelled by route template (`/playlists/{playlist_id}`), not by path,
+so label cardinality stays bounded. The same registry carries the repo, YouTube
+Music, rule and LLM metrics recorded in this process (sortune_adapters.telemetry,
+sortune_ai.metrics).
+"""
+
+from __future__ import annotations
+
+import time
+
+from fastapi import APIRouter, Response
+from prometheus_client import Histogram
+from sortune_adapters.telemetry import metrics_payload
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+HTTP_SECONDS = Histogram(
+    "sortune_http_request_seconds",
+    "API request latency, until the last body chunk is sent (long for event streams)",
+    ["method", "route", "status"],
+)
+
+router = APIRouter(tags=["system"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus exposition of this process's metrics."""
+    body, content_type = metrics_payload()
+    return Response(body, media_type=content_type)
+
+
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware (does not buffer streamed responses)."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router records the matched route on the (shared) scope
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_SECONDS.labels(method=scope["method"], route=route, status=str(status)).observe(
+                time.perf_counter() - start
+            )
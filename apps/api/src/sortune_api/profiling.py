@@ -0,0 +1,114 @@
+"""
+Opt-in cProfile captures of single requests (and the background jobs they queue).
+
+When settings.PROFILING_ENABLED (SORTUNE_PROFILING_ENABLED) is on, a request with
+`?profile=text` or `X-Sortune-Profile: text` (or `pstats`, see
+sortune_adapters.telemetry.profiling) is profiled. The response is the usual one
+plus an `X-Sortune-Profile-Id` header; the profile is at `GET /profiles/{id}` for
+settings.PROFILE_TTL_SECONDS. With `profile_inline=true` (`X-Sortune-Profile-Inline:
+true`) the profile is returned instead, the endpoint's status code in
+`X-Sortune-Profile-Status`.
+
+Only one request per process is profiled at a time (cProfile's profiler is
+process-wide): a request arriving while another is being profiled is served
+unprofiled, with `X-Sortune-Profile-Skipped: busy`.
+
+Only the endpoint function runs under the profiler, in the thread FastAPI runs it
+in: dependency resolution, response serialization and the body of streamed
+responses are not included. A background job queued by a profiled request is
+profiled by the worker and stored under the job's id.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import uuid
+from collections.abc import Callable
+from contextvars import ContextVar
+from typing import Any
+
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+from sortune_adapters.telemetry import Profile, store_profile
+
+from .settings import settings
+
+# The profile of the request being handled (copied into the endpoint's thread)
+_current: ContextVar[Profile | None] = ContextVar("sortune_profile", default=None)
+
+
+def current_profile() -> Profile | None:
+    return _current.get()
+
+
+class ProfiledRoute(APIRoute):
+    """Route class for the API's routers: endpoints run under the request's profiler."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, _profiled(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        handler = super().get_route_handler()
+
+        async def profiled_handler(request: Request) -> Response:
+            fmt = _requested(request)
+            if fmt is None:
+                return await handler(request)
+            try:
+                profile = Profile(fmt)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
+            token = _current.set(profile)
+            try:
+                response = await handler(request)
+            finally:
+                _current.reset(token)
+            if profile.skipped:
+                response.headers["X-Sortune-Profile-Skipped"] = "busy"
+                return response
+            if _flag(request, "profile_inline", "x-sortune-profile-inline"):
+                return Response(
+                    profile.render(),
+                    media_type=profile.content_type,
+                    headers={"X-Sortune-Profile-Status": str(response.status_code)},
+                )
+            profile_id = uuid.uuid4().hex
+            store_profile(_redis(request), profile_id, profile, settings.PROFILE_TTL_SECONDS)
+            response.headers["X-Sortune-Profile-Id"] = profile_id
+            return response
+
+        return profiled_handler
+
+
+def _profiled(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    if inspect.iscoroutinefunction(endpoint):
+        return endpoint  # none yet; they would share the profiler with the event loop
+
+    @functools.wraps(endpoint)  # FastAPI reads the signature through __wrapped__
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        profile = _current.get()
+        if profile is None:
+            return endpoint(*args, **kwargs)
+        with profile.capture():
+            return endpoint(*args, **kwargs)
+
+    return wrapper
+
+
+def _requested(request: Request) -> str | None:
+    if not settings.PROFILING_ENABLED:
+        return None
+    return request.query_params.get("profile") or request.headers.get("x-sortune-profile")
+
+
+def _flag(request: Request, param: str, header: str) -> bool:
+    value = request.query_params.get(param) or request.headers.get(header) or ""
+    return value.lower() in ("1", "true", "yes")
+
+
+def _redis(request: Request):
+    # The routes' Redis dependency, honouring overrides (tests)
+    from .routes.playlists import get_redis
+
+    return request.app.dependency_overrides.get(get_redis, get_redis)()
@@ -2,9 +2,11 @@ from __future__ import annotations
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
-from sortune_ai import PlaylistSuggestions, generate_playlist_name_suggestions
+from sortune_ai.schemas import PlaylistSuggestions
 
-router = APIRouter(prefix="/ai", tags=["ai"])
+from ..profiling import ProfiledRoute
+
+router = APIRouter(prefix="/ai", tags=["ai"], route_class=ProfiledRoute)
 
 
 class NameSuggestRequest(BaseModel):
@@ -13,6 +15,13 @@ class NameSuggestRequest(BaseModel):
     seed: int | None = Field(None, description="Optional seed for determinism if supported")
 
 
+def generate_playlist_name_suggestions(**kwargs) -> PlaylistSuggestions:
+    # The LLM provider stack is imported on the first request, not at API start-up
+    from sortune_ai.playlist_namer import generate_playlist_name_suggestions as generate
+
+    return generate(**kwargs)
+
+
 @router.post("/suggest-playlist-names", response_model=PlaylistSuggestions)
 def suggest_playlist_names(payload: NameSuggestRequest) -> PlaylistSuggestions:
     """Return AI-generated playlist name suggestions (validated schema)."""
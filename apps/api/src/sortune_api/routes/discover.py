@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import asdict
+from typing import TYPE_CHECKING
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from redis import Redis
+from sortune_adapters.storage.redis_graph import RedisGraphRepo
+from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
+from sortune_core.models.playlist import Track
+from sortune_core.services.graph_service import RelatedArtistsService
+
+from ..profiling import ProfiledRoute
+
+if TYPE_CHECKING:
+    # numpy-backed; imported by the first fill request rather than at start-up
+    from sortune_core.recommend.vibe import TrackIndex
+    from sortune_core.services.vibe_service import VibeService
+
+router = APIRouter(prefix="/discover", tags=["discover"], route_class=ProfiledRoute)
+
+
+def get_graph_service() -> RelatedArtistsService:
+    r = Redis.from_url(os.getenv("REDIS_URL", "redis://redis:6379/0"))
+    return RelatedArtistsService(RedisPlaylistRepo(r), RedisGraphRepo(r))
+
+
+# Process-wide vibe index: (built_at monotonic seconds, index)
+VIBE_INDEX_TTL = float(os.getenv("SORTUNE_VIBE_INDEX_TTL", "300"))
+_vibe_index: tuple[float, TrackIndex] | None = None
+
+
+def get_vibe_service() -> VibeService:
+    from sortune_core.services.vibe_service import VibeService
+
+    global _vibe_index
+    r = Redis.from_url(os.getenv("REDIS_URL", "redis://redis:6379/0"))
+    svc = VibeService(RedisPlaylistRepo(r))
+    now = time.monotonic()
+    if _vibe_index is None or now - _vibe_index[0] > VIBE_INDEX_TTL:
+        _vibe_index = (now, svc.build_index())
+    return VibeService(svc.playlists, index=_vibe_index[1])
+
+
+def reset_vibe_index() -> None:
+    global _vibe_index
+    _vibe_index = None
+
+
+class RelatedArtist(BaseModel):
+    key: str
+    name: str
+    score: float
+    shared_playlists: int
+
+
+class RelatedArtists(BaseModel):
+    artist: str
+    items: list[RelatedArtist]
+
+
+class FillSuggestion(BaseModel):
+    track: Track
+    score: float
+
+
+class FillSuggestions(BaseModel):
+    playlist: str
+    items: list[FillSuggestion]
+
+
+# ruff: noqa: B008
+@router.get("/artists/related", response_model=RelatedArtists)
+def related_artists(
+    artist: str = Query(..., description="Artist name or YouTube channel id"),
+    k: int = Query(default=10, ge=1, le=100),
+    svc: RelatedArtistsService = Depends(get_graph_service),
+):
+    """Top-k artists that most often share playlists with `artist` (served from cache)."""
+    items = svc.related(artist, k=k)
+    if not items:
+        raise HTTPException(status_code=404, detail=f"No related artists for: {artist}")
+    return RelatedArtists(artist=artist, items=[RelatedArtist(**asdict(n)) for n in items])
+
+
+# ruff: noqa: B008
+@router.post("/graph/rebuild")
+def rebuild_graph(
+    playlist_id: str | None = Query(
+        default=None, description="Only fold in this playlist (incremental update)"
+    ),
+    svc: RelatedArtistsService = Depends(get_graph_service),
+):
+    """Rebuild the artist graph from all stored playlists, or update it for one playlist."""
+    graph = svc.refresh_playlist(playlist_id) if playlist_id else svc.rebuild()
+    return {"status": "ok", "artists": len(graph), "playlists": len(graph.playlist_ids)}
+
+
+# ruff: noqa: B008
+@router.get("/playlists/{playlist_id}/fill", response_model=FillSuggestions)
+def fill_the_vibe(
+    playlist_id: str,
+    k: int = Query(default=20, ge=1, le=200),
+    svc: VibeService = Depends(get_vibe_service),
+):
+    """Suggest up to k on-theme tracks from the stored library that the playlist lacks."""
+    items = svc.fill(playlist_id, k=k)
+    return FillSuggestions(
+        playlist=playlist_id,
+        items=[FillSuggestion(track=rec.track, score=rec.score) for rec in items],
+    )
+
+
+@router.post("/vibe/rebuild")
+def rebuild_vibe_index():
+    """Drop the cached vibe index; the next fill request rebuilds it from storage."""
+    reset_vibe_index()
+    return {"status": "ok"}
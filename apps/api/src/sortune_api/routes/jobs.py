@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import StreamingResponse
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+
+from .. import jobs
+from ..profiling import ProfiledRoute
+from .playlists import get_async_redis, get_redis
+
+router = APIRouter(prefix="/jobs", tags=["jobs"], route_class=ProfiledRoute)
+
+
+# ruff: noqa: B008
+@router.get("/{job_id}")
+def get_job(job_id: str, redis: Redis = Depends(get_redis)):
+    """
+    Status of a background job (`queued`, `started`, `finished`, `failed`, ...), its
+    last progress report and, once done, its result or error. Jobs are kept for a
+    day after they end.
+    """
+    job = jobs.fetch(redis, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return jobs.describe(job)
+
+
+# ruff: noqa: B008
+@router.get("/{job_id}/events")
+def stream_job_events(
+    job_id: str,
+    last_event_id: str | None = Header(default=None),
+    redis: Redis = Depends(get_redis),
+    stream_redis: AsyncRedis = Depends(get_async_redis),
+):
+    """
+    Server-sent events for a background job: one `progress` event per report the job
+    publishes (stage, done/total, pages, bytes written, ETA, ...), then a final event
+    named after the job's end status with the same body as GET /jobs/{id}.
+    Reconnecting clients resume after their Last-Event-ID.
+    """
+    job = jobs.fetch(redis, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return StreamingResponse(
+        jobs.events(stream_redis, job, last_event_id),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
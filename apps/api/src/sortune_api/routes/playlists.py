@@ -1,20 +1,120 @@
 from __future__ import annotations
 
+import json
 import os
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import asdict
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import orjson
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import TypeAdapter
 from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+from rq.job import Job
 from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
 from sortune_adapters.ytmusic.client import YTMusicClient
-from sortune_core.models.playlist import Playlist, Track
+from sortune_adapters.ytmusic.pool import get_client_pool
+from sortune_adapters.ytmusic.writeback import WriteBackError
+from sortune_core.models.playlist import Playlist, Track, payload_hash
+from sortune_core.models.projection import Fields, model_include, parse_fields
 from sortune_core.rules.simple import ByTitle
+from sortune_core.services.playlist_service import PlaylistService
 
-router = APIRouter(prefix="/playlists", tags=["playlists"])
+from .. import jobs
+from ..profiling import ProfiledRoute
+
+router = APIRouter(prefix="/playlists", tags=["playlists"], route_class=ProfiledRoute)
+
+_TRACK_LIST = TypeAdapter(list[Track])
+# Tracks per chunk of the NDJSON track stream
+_NDJSON_CHUNK = 500
+
+_FIELDS_QUERY = Query(
+    default=None,
+    description="Comma-separated dotted fields to return, e.g. tracks.id,tracks.artists.name",
+)
+
+
+def get_redis() -> Redis:
+    return Redis.from_url(os.getenv("REDIS_URL", "redis://redis:6379/0"))
+
+
+async def get_async_redis() -> AsyncIterator[AsyncRedis]:
+    """An asyncio client for long waits (job event streams), closed after the response."""
+    redis = AsyncRedis.from_url(os.getenv("REDIS_URL", "redis://redis:6379/0"))
+    try:
+        yield redis
+    finally:
+        await redis.aclose()
 
 
 def get_repo() -> RedisPlaylistRepo:
-    r = Redis.from_url(os.getenv("REDIS_URL", "redis://redis:6379/0"))
-    return RedisPlaylistRepo(r)
+    return RedisPlaylistRepo(get_redis())
+
+
+def get_yt_client() -> Iterator[YTMusicClient]:
+    """Check out a long-lived client from the process-wide pool for one request."""
+    with get_client_pool().client() as client:
+        yield client
+
+
+def _set_etag(response: Response, repo: RedisPlaylistRepo, playlist_id: str) -> None:
+    """Expose the stored content hash so clients can skip unchanged downloads."""
+    _etag_headers(response, repo.get_hash(playlist_id))
+
+
+def _etag_headers(response: Response, version: str | None) -> None:
+    if version:
+        response.headers["ETag"] = f'"{version}"'
+        # Cacheable, but only after revalidating with If-None-Match
+        response.headers["Cache-Control"] = "no-cache"
+
+
+def _json_response(body: bytes | str, version: str | None, status_code: int = 200) -> Response:
+    """
+    Already-serialized JSON. Returning a Response skips FastAPI's `response_model`
+    pass (re-validating and re-encoding every nested model); `response_model` stays
+    on the routes for the OpenAPI schema.
+    """
+    response = Response(content=body, status_code=status_code, media_type="application/json")
+    _etag_headers(response, version)
+    return response
+
+
+def _accepted(job: Job) -> JSONResponse:
+    """202 for a queued background job; poll the Location (GET /jobs/{id}) for its outcome."""
+    return JSONResponse(
+        {"status": "queued", "job_id": job.id, "queue": job.origin},
+        status_code=202,
+        headers={"Location": f"/jobs/{job.id}"},
+    )
+
+
+def _parse_fields(spec: str | None, model: type[Playlist] | type[Track]) -> Fields | None:
+    try:
+        return parse_fields(spec, model)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+def _variant(version: str | None, fields: Fields | None) -> str | None:
+    """Version of a projected representation: each projection gets its own ETag."""
+    if not version or fields is None:
+        return version
+    return f"{version}-{payload_hash(orjson.dumps(fields, option=orjson.OPT_SORT_KEYS))[:8]}"
+
+
+def _not_modified(if_none_match: str | None, version: str | None) -> Response | None:
+    """A 304 for a matching If-None-Match (weak comparison, as RFC 9110 requires), else None."""
+    if not if_none_match or not version:
+        return None
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    if "*" not in tags and f'"{version}"' not in tags:
+        return None
+    response = Response(status_code=304)
+    _etag_headers(response, version)
+    return response
 
 
 # ---------------- Storage-backed endpoints (unchanged behavior) ----------------
@@ -22,33 +122,116 @@ def get_repo() -> RedisPlaylistRepo:
 
 # ruff: noqa: B008
 @router.get("/{playlist_id}", response_model=Playlist)
-def get_playlist(playlist_id: str, repo: RedisPlaylistRepo = Depends(get_repo)):
-    """Fetch a playlist from storage."""
-    pl = repo.get(playlist_id)
-    if not pl:
+def get_playlist(
+    playlist_id: str,
+    fields: str | None = _FIELDS_QUERY,
+    if_none_match: str | None = Header(default=None),
+    repo: RedisPlaylistRepo = Depends(get_repo),
+):
+    """
+    Fetch a playlist from storage. Send the last ETag as If-None-Match to get a 304
+    when it is unchanged; that check reads only the small content-hash key.
+
+    `fields` (e.g. `title,tracks.id,tracks.artists.name`) trims the response; the repo
+    skips loading what is not selected (no tracks selected: only the metadata is read).
+    """
+    projection = _parse_fields(fields, Playlist)
+    # Read the version before the body: a concurrent write can then only leave the
+    # ETag older than the body (next poll refetches), never newer (a false 304 later)
+    version = _variant(repo.get_hash(playlist_id), projection)
+    not_modified = _not_modified(if_none_match, version)
+    if not_modified is not None:
+        return not_modified
+    doc = repo.get_document(playlist_id, projection)
+    if not doc:
         raise HTTPException(status_code=404, detail="Playlist not found")
-    return pl
+    return _json_response(orjson.dumps(doc), version)
+
+
+# ruff: noqa: B008
+@router.get("/{playlist_id}/tracks")
+def stream_playlist_tracks(
+    playlist_id: str,
+    fields: str | None = _FIELDS_QUERY,
+    if_none_match: str | None = Header(default=None),
+    repo: RedisPlaylistRepo = Depends(get_repo),
+):
+    """
+    Stored tracks as NDJSON, one Track object per line, so large playlists can be
+    consumed incrementally. Same ETag / If-None-Match handling as GET /{playlist_id};
+    `fields` is relative to a track (e.g. `id,title,artists.name`).
+    """
+    projection = _parse_fields(fields, Track)
+    version = _variant(repo.get_hash(playlist_id), projection)
+    not_modified = _not_modified(if_none_match, version)
+    if not_modified is not None:
+        return not_modified
+    tracks = repo.get_document(playlist_id, {"tracks": projection})["tracks"]
+
+    def lines() -> Iterator[bytes]:
+        for start in range(0, len(tracks), _NDJSON_CHUNK):
+            yield b"".join(orjson.dumps(t) + b"\n" for t in tracks[start : start + _NDJSON_CHUNK])
+
+    response = StreamingResponse(lines(), media_type="application/x-ndjson")
+    _etag_headers(response, version)
+    return response
 
 
 # ruff: noqa: B008
 @router.post("/{playlist_id}/sort")
 def sort_playlist(
     playlist_id: str,
+    response: Response,
     rule_name: str = ByTitle.name,
+    background: bool = Query(default=False),
     repo: RedisPlaylistRepo = Depends(get_repo),
+    redis: Redis = Depends(get_redis),
 ):
-    """Sort a playlist by the given rule and persist it."""
-    pl = repo.get(playlist_id)
-    if not pl:
-        raise HTTPException(status_code=404, detail="Playlist not found")
+    """
+    Sort a playlist by the given rule and persist it.
+    Re-applying a rule to an already-sorted playlist is a no-op (`changed: false`).
+    `background=true` queues it on the `sort` queue instead (202 + job id).
+    """
+    if background:
+        try:
+            repo.load_rule(rule_name)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Unsupported rule: {rule_name}") from e
+        return _accepted(jobs.enqueue(redis, "sort", playlist_id, rule_name=rule_name))
 
-    if rule_name == ByTitle.name:
-        pl.tracks = list(ByTitle.apply(pl.tracks))
-    else:
-        raise HTTPException(status_code=400, detail=f"Unsupported rule: {rule_name}")
+    before = repo.get_hash(playlist_id)
+    try:
+        pl = PlaylistService(tracks=None, playlists=repo).sort_playlist(playlist_id, rule_name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Unsupported rule: {rule_name}") from e
 
-    repo.save(pl)
-    return {"status": "ok", "rule": rule_name, "count": len(pl.tracks)}
+    _set_etag(response, repo, playlist_id)
+    return {
+        "status": "ok",
+        "rule": rule_name,
+        "count": len(pl.tracks),
+        "changed": repo.get_hash(playlist_id) != before,
+    }
+
+
+# ruff: noqa: B008
+@router.post("/{playlist_id}/dedupe")
+def dedupe_playlist(
+    playlist_id: str,
+    response: Response,
+    background: bool = Query(default=False),
+    repo: RedisPlaylistRepo = Depends(get_repo),
+    redis: Redis = Depends(get_redis),
+):
+    """
+    Remove repeated tracks (same video id) from the stored playlist, keeping the first
+    of each. `background=true` queues it on the `sort` queue instead (202 + job id).
+    """
+    if background:
+        return _accepted(jobs.enqueue(redis, "dedupe", playlist_id))
+    pl, removed = PlaylistService(tracks=None, playlists=repo).dedupe_playlist(playlist_id)
+    _set_etag(response, repo, playlist_id)
+    return {"status": "ok", "count": len(pl.tracks), "removed": removed, "changed": removed > 0}
 
 
 # ---------------- New YouTube Music live endpoints ----------------
@@ -56,16 +239,33 @@ def sort_playlist(
 
 # ruff: noqa: B008
 @router.get("/library/live")
-def list_yt_library_playlists(limit: int = Query(default=100, ge=1, le=500)):
+def list_yt_library_playlists(
+    response: Response,
+    limit: int = Query(default=100, ge=1, le=500),
+    refresh: bool = Query(default=False, description="Bypass the upstream response cache"),
+    if_none_match: str | None = Header(default=None),
+    client: YTMusicClient = Depends(get_yt_client),
+):
     """
-    Fetch the user's YouTube Music *library* playlists (live; not from Redis).
+    Fetch the user's YouTube Music *library* playlists (from YouTube Music, not Redis).
     Returns a compact summary list with playlistId/title/count/thumbnails.
+
+    Served through the upstream response cache (see sortune_adapters.ytmusic.cache):
+    up to an hour old, or older while a stale entry is revalidated in the background;
+    `refresh=true` always fetches. The ETag is the version of the cached upstream
+    response; If-None-Match against a still-fresh cache entry answers 304 without
+    decoding or mapping it.
     """
+    if not refresh:
+        not_modified = _not_modified(if_none_match, client.library_playlists_version(limit))
+        if not_modified is not None:
+            return not_modified
     try:
-        client = YTMusicClient()
-        return {"items": client.list_library_playlists(limit=limit)}
+        items = client.list_library_playlists(limit=limit, refresh=refresh)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
+    _etag_headers(response, client.last_version)
+    return {"items": items}
 
 
 # ruff: noqa: B008
@@ -73,15 +273,31 @@ def list_yt_library_playlists(limit: int = Query(default=100, ge=1, le=500)):
 def get_yt_playlist_tracks_live(
     playlist_id: str,
     limit: int | None = Query(default=None, ge=1),
+    fields: str | None = _FIELDS_QUERY,
+    refresh: bool = Query(default=False, description="Bypass the upstream response cache"),
+    if_none_match: str | None = Header(default=None),
+    client: YTMusicClient = Depends(get_yt_client),
 ):
     """
-    Fetch tracks for a YouTube Music playlist (live; not from Redis) and map to core Track.
+    Fetch tracks for a YouTube Music playlist (from YouTube Music, not Redis) and map to
+    core Track. Caching, `refresh` and conditional requests work as for /library/live;
+    `fields` as for /{playlist_id}/tracks.
     """
+    projection = _parse_fields(fields, Track)
+    if not refresh:
+        version = _variant(client.playlist_version(playlist_id, limit), projection)
+        not_modified = _not_modified(if_none_match, version)
+        if not_modified is not None:
+            return not_modified
     try:
-        client = YTMusicClient()
-        return client.get_playlist_tracks(playlist_id=playlist_id, limit=limit)
+        tracks = client.get_playlist_tracks(playlist_id=playlist_id, limit=limit, refresh=refresh)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
+    include = model_include(Track, projection)
+    body = _TRACK_LIST.dump_json(
+        tracks, by_alias=True, include=None if include is None else {"__all__": include}
+    )
+    return _json_response(body, _variant(client.last_version, projection))
 
 
 # ruff: noqa: B008
@@ -90,19 +306,31 @@ def import_yt_playlist_into_redis(
     playlist_id: str,
     repo: RedisPlaylistRepo = Depends(get_repo),
     limit: int | None = Query(default=None, ge=1),
+    title: str | None = Query(default=None),
+    background: bool = Query(default=False),
+    redis: Redis = Depends(get_redis),
+    client: YTMusicClient = Depends(get_yt_client),
 ):
     """
     Import a YouTube Music playlist into Redis so local operations (like /sort) can run.
+    Always fetched from upstream, never the response cache. `background=true` queues it
+    on the `import` queue instead (202 + job id), for playlists too big to import within
+    a request.
 
     Name resolution:
-      - We don't pull the playlist title in the tracks call; use env YT_PLAYLIST_NAME
-        if set, else fallback to 'YT:<id>'.
+      - We don't pull the playlist title in the tracks call; use `title` if given,
+        else env YT_PLAYLIST_NAME if set, else fallback to 'YT:<id>'.
     """
+    display_name = title or os.getenv("YT_PLAYLIST_NAME") or f"YT:{playlist_id}"
+    if background:
+        return _accepted(
+            jobs.enqueue(
+                redis, "import", playlist_id, limit=limit, title=display_name, refresh=True
+            )
+        )
     try:
-        client = YTMusicClient()
-        tracks = client.get_playlist_tracks(playlist_id=playlist_id, limit=limit)
+        tracks = client.get_playlist_tracks(playlist_id=playlist_id, limit=limit, refresh=True)
 
-        display_name = os.getenv("YT_PLAYLIST_NAME") or f"YT:{playlist_id}"
         playlist = Playlist.model_validate(
             {
                 "playlistId": playlist_id,
@@ -112,25 +340,89 @@ def import_yt_playlist_into_redis(
         )
 
         repo.save(playlist)
-        return playlist
+        return _json_response(
+            playlist.model_dump_json(by_alias=True), repo.get_hash(playlist_id), status_code=201
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+# ruff: noqa: B008
+@router.post("/yt/import/{playlist_id}/stream")
+def stream_import_yt_playlist(
+    playlist_id: str,
+    repo: RedisPlaylistRepo = Depends(get_repo),
+    limit: int | None = Query(default=None, ge=1),
+    page_size: int = Query(default=500, ge=1, le=5000),
+    client: YTMusicClient = Depends(get_yt_client),
+):
+    """
+    Import a YouTube Music playlist into Redis page by page, reporting progress as NDJSON:
+
+        {"event": "page", "stored": 500}
+        ...
+        {"event": "done", "count": 10000, "changed": true, "etag": "\"...\""}
+
+    Failures end the stream with {"event": "error", "detail": ...}; the stored copy is
+    only replaced once every page has been written. Pages come from upstream, never the
+    response cache.
+    """
+    display_name = os.getenv("YT_PLAYLIST_NAME") or f"YT:{playlist_id}"
+    meta = Playlist.model_validate({"playlistId": playlist_id, "title": display_name})
+
+    def events() -> Iterator[str]:
+        try:
+            stored = 0
+            with repo.open_stream(meta) as writer:
+                pages = client.iter_playlist_tracks(
+                    playlist_id, limit, page_size=page_size, refresh=True
+                )
+                for page in pages:
+                    stored = writer.append(page)
+                    yield _ndjson({"event": "page", "stored": stored})
+                changed = writer.commit()
+            digest = repo.get_hash(playlist_id)
+            yield _ndjson(
+                {
+                    "event": "done",
+                    "count": stored,
+                    "changed": changed,
+                    "etag": f'"{digest}"' if digest else None,
+                }
+            )
+        except Exception as e:
+            yield _ndjson({"event": "error", "detail": str(e)})
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+def _ndjson(event: dict) -> str:
+    return json.dumps(event) + "\n"
+
+
 # ruff: noqa: B008
 @router.post("/yt/refresh/{playlist_id}", response_model=Playlist)
 def refresh_yt_playlist(
     playlist_id: str,
     repo: RedisPlaylistRepo = Depends(get_repo),
     limit: int | None = Query(default=None, ge=1),
+    background: bool = Query(default=False),
+    redis: Redis = Depends(get_redis),
+    client: YTMusicClient = Depends(get_yt_client),
 ):
     """
-    Re-import a YouTube Music playlist and overwrite the stored copy in Redis.
+    Re-import a YouTube Music playlist (from upstream, not the response cache) and
+    overwrite the stored copy in Redis. Unchanged content is not rewritten; the ETag
+    reflects the stored version.
+    `background=true` queues it on the `import` queue instead (202 + job id).
     """
+    display_name = os.getenv("YT_PLAYLIST_NAME") or f"YT:{playlist_id}"
+    if background:
+        return _accepted(
+            jobs.enqueue(redis, "refresh", playlist_id, limit=limit, title=display_name)
+        )
     try:
-        client = YTMusicClient()
-        tracks = client.get_playlist_tracks(playlist_id=playlist_id, limit=limit)
-        display_name = os.getenv("YT_PLAYLIST_NAME") or f"YT:{playlist_id}"
+        tracks = client.get_playlist_tracks(playlist_id=playlist_id, limit=limit, refresh=True)
         pl = Playlist.model_validate(
             {
                 "playlistId": playlist_id,
@@ -139,6 +431,47 @@ def refresh_yt_playlist(
             }
         )
         repo.save(pl)
-        return pl
+        return _json_response(pl.model_dump_json(by_alias=True), repo.get_hash(playlist_id))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+# ruff: noqa: B008
+@router.post("/yt/writeback/{playlist_id}")
+def write_back_yt_playlist(
+    playlist_id: str,
+    track_ids: list[str] | None = Body(default=None, embed=True),
+    dry_run: bool = Query(default=False),
+    background: bool = Query(default=False),
+    batch_size: int = Query(default=100, ge=1, le=500),
+    repo: RedisPlaylistRepo = Depends(get_repo),
+    redis: Redis = Depends(get_redis),
+    client: YTMusicClient = Depends(get_yt_client),
+):
+    """
+    Apply the stored playlist's order (or an explicit `track_ids` list) to the YouTube
+    Music playlist: removals, adds and the fewest moves, in batched edit requests.
+
+    `dry_run=true` only returns the plan's counts. `background=true` runs it as an RQ
+    job on the `writeback` queue (202 + job id) instead of within the request.
+    Interrupted runs resume from their Redis checkpoint when repeated.
+    """
+    if track_ids is None:
+        track_ids = [t.id for t in repo.get(playlist_id).tracks]
+        if not track_ids:
+            raise HTTPException(status_code=404, detail="Playlist not stored; import it first")
+
+    if background and not dry_run:
+        return _accepted(
+            jobs.enqueue(redis, "writeback", playlist_id, track_ids, batch_size=batch_size)
+        )
+
+    try:
+        report = client.write_back(
+            playlist_id, track_ids, dry_run=dry_run, checkpoints=redis, batch_size=batch_size
+        )
+    except WriteBackError as e:
+        raise HTTPException(
+            status_code=502, detail={"error": str(e), "report": asdict(e.report)}
+        ) from e
+    return asdict(report)
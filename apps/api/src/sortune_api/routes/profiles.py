@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from redis import Redis
+from sortune_adapters.telemetry import load_profile
+
+from .playlists import get_redis
+
+router = APIRouter(prefix="/profiles", tags=["system"])
+
+
+# ruff: noqa: B008
+@router.get("/{profile_id}")
+def get_profile(profile_id: str, redis: Redis = Depends(get_redis)):
+    """
+    A stored request or job profile (`?profile=...`, see sortune_api.profiling): a
+    text report or raw pstats, as requested.
+    """
+    stored = load_profile(redis, profile_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    body, content_type = stored
+    return Response(body, media_type=content_type)
@@ -2,7 +2,8 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
-    model_config = SettingsConfigDict(env_file=".env", env_prefix="SORTUNE_")
+    # .env is shared with the worker, UI and adapters: skip the keys declared elsewhere
+    model_config = SettingsConfigDict(env_file=".env", env_prefix="SORTUNE_", extra="ignore")
 
     # General
     ENV: str = "dev"
@@ -10,6 +11,11 @@ class Settings(BaseSettings):
     # Connections
     REDIS_URL: str = "redis://redis:6379/0"  # docker default; use localhost in local runs
 
+    # Per-request/per-job profiling (`?profile=text|pstats`, see sortune_api.profiling);
+    # requests asking for a profile are served normally while this is off
+    PROFILING_ENABLED: bool = False
+    PROFILE_TTL_SECONDS: int = 24 * 3600
+
     # Optional providers (future)
     OPENAI_API_KEY: str | None = None
     DATABASE_URL: str | None = None
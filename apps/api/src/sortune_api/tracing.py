@@ -0,0 +1,50 @@
+"""
+A server span per API request (see sortune_adapters.telemetry.tracing for turning
+tracing on). Spans are named by route template, e.g. `GET /playlists/{playlist_id}`,
+and continue the caller's trace when the request carries a W3C `traceparent`.
+"""
+
+from __future__ import annotations
+
+from opentelemetry import trace
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from sortune_adapters.telemetry import extract_context
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+tracer = trace.get_tracer(__name__)
+
+
+class RequestTracingMiddleware:
+    """Pure ASGI middleware (spans cover streamed bodies to the last chunk)."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]}
+        method = scope["method"]
+        with tracer.start_as_current_span(
+            method,
+            context=extract_context(headers),
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": method, "url.path": scope["path"]},
+        ) as span:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                # The router records the matched route on the (shared) scope
+                route = getattr(scope.get("route"), "path", None)
+                if route is not None:
+                    span.set_attribute("http.route", route)
+                    span.update_name(f"{method} {route}")
@@ -1,18 +1,27 @@
+import json
 import os
+from collections.abc import Iterator
 from typing import Any
 
+import requests
 import streamlit as st
 from redis import Redis
+from sortune_adapters.env import load_env
 from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
-from sortune_adapters.ytmusic.client import YTMusicClient
+from sortune_adapters.ytmusic.pool import get_client_pool
 from sortune_ai import generate_playlist_name_suggestions
+from sortune_core.models.playlist import Playlist
 from sortune_core.rules.simple import ByTitle
+from sortune_core.services.playlist_service import PlaylistService
 
 # ---- Config ----
+load_env()
 st.set_page_config(page_title="Sortune", layout="centered")
 st.title("🎶 Sortune — Playlist Manager (Demo)")
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# Imports run as API background jobs (progress over SSE); in-process if the API is down
+API_URL = os.getenv("SORTUNE_API_URL", "http://localhost:8000").rstrip("/")
 YT_OAUTH_PATH = os.getenv("YT_OAUTH_PATH", ".cache/ytmusic_oauth.json")
 r = Redis.from_url(REDIS_URL)
 repo = RedisPlaylistRepo(r)
@@ -36,25 +45,102 @@ def seed_demo(pid: str = "demo") -> dict[str, Any]:
     pl = repo.get(pid)
     if not pl.tracks:
         pl.name = "Demo Playlist"
-        pl.tracks = YTMusicClient().sample_tracks()
+        with get_client_pool().client() as client:
+            pl.tracks = client.sample_tracks()
         repo.save(pl)
     return {"playlist": pl.id, "tracks": len(pl.tracks)}
 
 
 def import_yt_playlist(
-    pid: str, name_hint: str | None = None, limit: int | None = None
+    pid: str, name_hint: str | None = None, limit: int | None = None, total: int | None = None
 ) -> dict[str, Any]:
     """
-    Import a YT playlist (by id) into Redis under the same id.
+    Import a YT playlist (by id) into Redis under the same id as an API background
+    job, following its progress events (`/jobs/{id}/events`) in a progress bar, so
+    big imports never hang on one request. Imports in-process if the API is down.
     """
-    client = YTMusicClient()
-    tracks = client.get_playlist_tracks(playlist_id=pid, limit=limit)
     display_name = name_hint or os.getenv("YT_PLAYLIST_NAME") or f"YT:{pid}"
-    pl = repo.get(pid)
-    pl.name = display_name
-    pl.tracks = tracks
-    repo.save(pl)
-    return {"playlist": pl.id, "tracks": len(pl.tracks), "name": display_name}
+    try:
+        res = requests.post(
+            f"{API_URL}/playlists/yt/import/{pid}",
+            params={"background": "true", "title": display_name, "limit": limit},
+            timeout=10,
+        )
+    except requests.ConnectionError:
+        st.warning(f"API not reachable at {API_URL}; importing here instead.")
+        return _import_in_process(pid, display_name, limit, total)
+    res.raise_for_status()
+    job_id = res.json()["job_id"]
+
+    progress = st.progress(0.0, text="Queued…")
+    # The server sends a heartbeat every few seconds, so a long read timeout means it is gone
+    with requests.get(f"{API_URL}/jobs/{job_id}/events", stream=True, timeout=(10, 60)) as events:
+        events.raise_for_status()
+        for event, data in _sse_events(events):
+            if event == "progress":
+                progress.progress(*_progress_view(data, total))
+            elif event == "finished":
+                result = data["result"]
+                progress.progress(1.0, text=f"Stored {result['count']} tracks.")
+                return {
+                    "playlist": pid,
+                    "tracks": result["count"],
+                    "name": display_name,
+                    "changed": result["changed"],
+                }
+            else:
+                raise RuntimeError(data.get("error") or f"Import job {job_id} {event}")
+    raise RuntimeError(f"Lost the progress stream of import job {job_id}")
+
+
+def _import_in_process(
+    pid: str, display_name: str, limit: int | None, total: int | None
+) -> dict[str, Any]:
+    """Import page by page in this process (`total` is the library's track count, if known)."""
+    meta = Playlist.model_validate({"playlistId": pid, "title": display_name})
+    progress = st.progress(0.0, text="Fetching tracks…")
+    stored = 0
+    with get_client_pool().client() as client, repo.open_stream(meta) as writer:
+        # Bypass the response cache: an import stores what is upstream now
+        for page in client.iter_playlist_tracks(pid, limit, refresh=True):
+            stored = writer.append(page)
+            done = min(stored / total, 1.0) if total else 0.0
+            progress.progress(done, text=f"Stored {stored} tracks…")
+        changed = writer.commit()
+    progress.progress(1.0, text=f"Stored {stored} tracks.")
+    return {"playlist": pid, "tracks": stored, "name": display_name, "changed": changed}
+
+
+def _sse_events(res: requests.Response) -> Iterator[tuple[str, dict[str, Any]]]:
+    """(event, data) pairs from a text/event-stream response (comments are skipped)."""
+    event, data = "message", []
+    for line in res.iter_lines(decode_unicode=True):
+        if not line:
+            if data:
+                yield event, json.loads("\n".join(data))
+            event, data = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:") :].strip()
+        elif line.startswith("data:"):
+            data.append(line[len("data:") :].strip())
+
+
+def _progress_view(report: dict[str, Any], total_hint: int | None) -> tuple[float, str]:
+    if report.get("stage") != "storing":
+        return 0.0, "Fetching tracks…"
+    done, total = report.get("done") or 0, report.get("total") or total_hint
+    text = f"Stored {done}" + (f" of {total}" if total else "") + " tracks"
+    text += f" ({(report.get('bytes_written') or 0) / 1e6:.1f} MB)"
+    if report.get("eta_seconds") is not None:
+        text += f", ~{report['eta_seconds']:.0f}s left"
+    return (min(done / total, 1.0) if total else 0.0), text + "…"
+
+
+def _track_count(summary: dict[str, Any]) -> int | None:
+    try:
+        return int(str(summary.get("count") or "").replace(",", ""))
+    except ValueError:
+        return None
 
 
 # ---- Sidebar ----
@@ -77,7 +163,8 @@ with st.expander("YouTube Music (beta) — connect & import", expanded=False):
     with cols_y[0]:
         if st.button("Connect & List My Playlists"):
             try:
-                items = YTMusicClient().list_library_playlists(limit=200)
+                with get_client_pool().client() as client:
+                    items = client.list_library_playlists(limit=200)
                 st.session_state["yt_playlists"] = items or []
                 st.success(f"Fetched {len(items)} playlists from your library.")
             except Exception as e:
@@ -101,9 +188,11 @@ with st.expander("YouTube Music (beta) — connect & import", expanded=False):
                     res = import_yt_playlist(
                         pid=sel.get("playlistId", ""),
                         name_hint=sel.get("title") or None,
+                        total=_track_count(sel),
                     )
                     st.success(
                         f"Imported {res['tracks']} tracks into '{res['name']}' ({res['playlist']})."
+                        + ("" if res["changed"] else " Stored copy was already up to date.")
                     )
                     st.session_state["current_pid"] = res["playlist"]
                 except Exception as e:
@@ -151,12 +240,13 @@ with cols[0]:
         load_playlist(pid)
 with cols[1]:
     if st.button("Sort by title"):
-        pl = repo.get(pid)
-        if not pl or not pl.tracks:
+        before = repo.get_hash(pid)
+        pl = PlaylistService(tracks=None, playlists=repo).sort_playlist(pid, ByTitle.name)
+        if not pl.tracks:
             st.warning("No tracks to sort.")
+        elif repo.get_hash(pid) == before:
+            st.info("Already sorted by title; nothing to write.")
         else:
-            pl.tracks = list(ByTitle.apply(pl.tracks))
-            repo.save(pl)
             st.success("Sorted! Click 'Load playlist' to refresh.")
 with cols[2]:
     if st.button("Refresh"):
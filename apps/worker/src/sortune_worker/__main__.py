@@ -0,0 +1,71 @@
+"""
+Run an RQ worker:
+
+    python -m sortune_worker                 # SORTUNE_WORKER_QUEUES (all, sort first)
+    python -m sortune_worker import writeback
+
+With SORTUNE_WORKER_METRICS_PORT set, Prometheus metrics are served on that port;
+with SORTUNE_TRACING set, jobs are traced (see sortune_worker.tracing). Jobs queued
+by a profiled API request are profiled (sortune_worker.profiling).
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+from pathlib import Path
+
+from redis import Redis
+from rq import Worker
+
+from .settings import METRICS_DIR, METRICS_PORT, REDIS_URL, WORKER_QUEUES
+
+
+def main(argv: list[str] | None = None) -> None:
+    queues = (argv if argv is not None else sys.argv[1:]) or WORKER_QUEUES
+    if METRICS_PORT:
+        _prepare_multiproc_dir()
+    # Imported only now: they load prometheus_client, which must see the directory
+    from sortune_adapters.telemetry import configure_tracing
+
+    from .metrics import MetricsWorker, serve
+    from .worker import SortuneWorker
+
+    worker_class: type[Worker] = SortuneWorker
+    if METRICS_PORT:
+        serve(METRICS_PORT)
+        print(f"Serving metrics on :{METRICS_PORT}/metrics")
+        worker_class = MetricsWorker
+    configure_tracing("sortune-worker")
+    print(f"Starting worker on {', '.join(queues)}...")
+    worker_class(queues, connection=Redis.from_url(REDIS_URL)).work()
+
+
+def _prepare_multiproc_dir() -> None:
+    """
+    Work horses are forked per job, so their samples are shared through
+    PROMETHEUS_MULTIPROC_DIR, which must be set before prometheus_client is imported.
+
+    prometheus_client names the sample files after the process id, so every horse
+    would leave its own files behind: the directory (and each scrape) would grow
+    with every job. RQ runs one horse at a time, so all of this worker's horses
+    share one set of files instead, each carrying on from the last one's totals.
+    """
+    path = Path(os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", METRICS_DIR))
+    shutil.rmtree(path, ignore_errors=True)  # samples of an earlier run
+    path.mkdir(parents=True)
+
+    from prometheus_client import values
+
+    worker_pid = os.getpid()
+
+    def process_identifier() -> str:
+        pid = os.getpid()
+        return str(pid) if pid == worker_pid else f"{worker_pid}-horse"
+
+    values.ValueClass = values.MultiProcessValue(process_identifier)
+
+
+if __name__ == "__main__":
+    main()
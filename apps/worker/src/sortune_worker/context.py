@@ -0,0 +1,75 @@
+"""
+Helpers for code running inside an RQ job (they also work when a job function
+is called directly, e.g. from a script or a test).
+
+Progress reports are stored on the job (`GET /jobs/{id}`) and appended to a
+per-job Redis Stream, which `GET /jobs/{id}/events` relays as server-sent events.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Any
+
+from redis import Redis
+from rq import get_current_job
+
+from .settings import REDIS_URL
+
+# Per-job progress stream, read by sortune_api.jobs (keep the key format in sync)
+EVENTS_KEY = "job-events:{job_id}"
+EVENTS_MAXLEN = 1000
+EVENTS_TTL_SECONDS = 24 * 3600  # as long as the API keeps job results
+
+
+def connection() -> Redis:
+    """The worker's Redis connection inside a job, else a new one to REDIS_URL."""
+    job = get_current_job()
+    return job.connection if job is not None else Redis.from_url(REDIS_URL)
+
+
+def report_progress(**progress: Any) -> None:
+    """
+    Publish the current job's progress: replaces the job's last report and appends
+    it to the job's event stream. A no-op outside a job.
+    """
+    job = get_current_job()
+    if job is None:
+        return
+    job.meta["progress"] = progress
+    job.save_meta()
+    key = EVENTS_KEY.format(job_id=job.id)
+    pipe = job.connection.pipeline(transaction=False)
+    pipe.xadd(key, {"data": json.dumps(progress)}, maxlen=EVENTS_MAXLEN, approximate=True)
+    pipe.expire(key, EVENTS_TTL_SECONDS)
+    pipe.execute()
+
+
+class ProgressTracker:
+    """
+    Reports `done` out of `total` units of one stage, with the elapsed time and a
+    linear ETA (from the rate since the tracker was created):
+
+        tracker = ProgressTracker("storing", total=10_000)
+        tracker.report(500, pages=1)
+    """
+
+    def __init__(self, stage: str, total: int | None = None):
+        self.stage = stage
+        self.total = total
+        self.started = time.monotonic()
+
+    def report(self, done: int, **extra: Any) -> None:
+        elapsed = time.monotonic() - self.started
+        eta = None
+        if self.total and done:
+            eta = round(elapsed / done * max(self.total - done, 0), 1)
+        report_progress(
+            stage=self.stage,
+            done=done,
+            total=self.total,
+            elapsed_seconds=round(elapsed, 2),
+            eta_seconds=eta,
+            **extra,
+        )
@@ -0,0 +1,20 @@
+"""
+Discovery rebuilds: the artist co-occurrence graph behind `GET /discover/artists/related`,
+rebuilt from every stored playlist (what `POST /discover/graph/rebuild` does in the API).
+Run on a schedule by sortune_worker.scheduler.
+"""
+
+from __future__ import annotations
+
+from sortune_adapters.storage.redis_graph import RedisGraphRepo
+from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
+from sortune_core.services.graph_service import RelatedArtistsService
+
+from ..context import connection, report_progress
+
+
+def rebuild_graph() -> dict:
+    r = connection()
+    report_progress(stage="rebuilding")
+    graph = RelatedArtistsService(RedisPlaylistRepo(r), RedisGraphRepo(r)).rebuild()
+    return {"artists": len(graph), "playlists": len(graph.playlist_ids)}
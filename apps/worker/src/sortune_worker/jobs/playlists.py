@@ -0,0 +1,85 @@
+"""
+Per-playlist jobs behind the API's `?background=true` variants: import/refresh
+from YouTube Music (the `import` queue) and sort/dedupe of the stored copy (the
+`sort` queue). Imports publish progress (pages, tracks stored, bytes written, ETA;
+see ..context) and results are small dicts, for `GET /jobs/{id}` and its event
+stream.
+
+    Queue("import").enqueue(import_playlist, "PL...")
+"""
+
+from __future__ import annotations
+
+from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
+from sortune_adapters.ytmusic.pool import get_client_pool
+from sortune_core.models.playlist import Playlist
+from sortune_core.services.playlist_service import PlaylistService
+
+from ..context import ProgressTracker, connection, report_progress
+
+
+def import_playlist(
+    playlist_id: str,
+    limit: int | None = None,
+    title: str | None = None,
+    page_size: int = 500,
+    refresh: bool = False,
+) -> dict:
+    """
+    Import a YouTube Music playlist into Redis page by page (nothing is replaced until
+    every page is stored). `refresh=True` bypasses the upstream response cache.
+    """
+    repo = RedisPlaylistRepo(connection())
+    meta = Playlist.model_validate(
+        {"playlistId": playlist_id, "title": title or f"YT:{playlist_id}"}
+    )
+    stored = 0
+    report_progress(stage="fetching")
+    with get_client_pool().client() as client, repo.open_stream(meta) as writer:
+        pages = client.iter_playlist_tracks(
+            playlist_id, limit, page_size=page_size, refresh=refresh
+        )
+        tracker = None
+        for n, page in enumerate(pages, start=1):
+            if tracker is None:  # the upstream fetch is over once the first page is mapped
+                tracker = ProgressTracker("storing", total=client.last_track_total)
+            stored = writer.append(page)
+            tracker.report(stored, pages=n, bytes_written=writer.bytes_written)
+        changed = writer.commit()
+    return {
+        "playlist_id": playlist_id,
+        "count": stored,
+        "changed": changed,
+        "etag": repo.get_hash(playlist_id),
+    }
+
+
+def refresh_playlist(playlist_id: str, limit: int | None = None, title: str | None = None) -> dict:
+    """Re-import from upstream (not the response cache); unchanged content is not rewritten."""
+    return import_playlist(playlist_id, limit, title, refresh=True)
+
+
+def sort_playlist(playlist_id: str, rule_name: str = "by_title") -> dict:
+    repo = RedisPlaylistRepo(connection())
+    before = repo.get_hash(playlist_id)
+    pl = PlaylistService(tracks=None, playlists=repo).sort_playlist(playlist_id, rule_name)
+    after = repo.get_hash(playlist_id)
+    return {
+        "playlist_id": playlist_id,
+        "rule": rule_name,
+        "count": len(pl.tracks),
+        "changed": after != before,
+        "etag": after,
+    }
+
+
+def dedupe_playlist(playlist_id: str) -> dict:
+    repo = RedisPlaylistRepo(connection())
+    pl, removed = PlaylistService(tracks=None, playlists=repo).dedupe_playlist(playlist_id)
+    return {
+        "playlist_id": playlist_id,
+        "count": len(pl.tracks),
+        "removed": removed,
+        "changed": removed > 0,
+        "etag": repo.get_hash(playlist_id),
+    }
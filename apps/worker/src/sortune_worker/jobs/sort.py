@@ -0,0 +1,70 @@
+"""
+Batch sort job: re-sort many (or all) stored playlists with one rule.
+
+Sorting is spread over a process pool; reads and writes go to Redis in batches.
+Enqueue with e.g. `Queue("default").enqueue(sort_library, rule_name="by_title")`
+or run `scripts/sort_library.py`.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from multiprocessing import get_context
+
+from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
+from sortune_core.services.playlist_service import PlaylistService, SortResult
+
+from ..context import ProgressTracker, connection
+
+# Spawned (not forked) sort processes: sort_many runs a prefetch thread, and forking
+# a multi-threaded process can deadlock the child.
+_SPAWN = get_context("spawn")
+
+
+def sort_library(
+    playlist_ids: list[str] | None = None,
+    rule_name: str = "by_title",
+    batch_size: int = 50,
+    workers: int | None = None,
+) -> dict:
+    """
+    Sort `playlist_ids` (default: every stored playlist) and return a summary
+    with per-playlist timings. `workers=0` sorts inline without a process pool.
+    """
+    repo = RedisPlaylistRepo(connection())
+    svc = PlaylistService(tracks=None, playlists=repo)
+    ids = playlist_ids if playlist_ids is not None else repo.list_ids()
+
+    start = time.perf_counter()
+    tracker = ProgressTracker("sorting", total=len(ids))
+    tracker.report(0)
+    if workers == 0:
+        results = _collect(svc.sort_many(ids, rule_name, batch_size=batch_size), tracker)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_SPAWN) as pool:
+            results = _collect(
+                svc.sort_many(ids, rule_name, batch_size=batch_size, executor=pool), tracker
+            )
+
+    return {
+        "rule": rule_name,
+        "playlists": len(results),
+        "changed": sum(r.changed for r in results),
+        "seconds": round(time.perf_counter() - start, 3),
+        "results": [asdict(r) for r in results],
+    }
+
+
+def _collect(results: Iterable[SortResult], tracker: ProgressTracker) -> list[SortResult]:
+    """Drain `sort_many`, reporting progress as each batch lands."""
+    out: list[SortResult] = []
+    changed = 0
+    for result in results:
+        out.append(result)
+        changed += result.changed
+        if len(out) % 50 == 0 or len(out) == tracker.total:
+            tracker.report(len(out), changed=changed)
+    return out
@@ -0,0 +1,33 @@
+"""
+Library sync job: the background variant of `scripts/sync_library.py`, run on a
+schedule by sortune_worker.scheduler. Only playlists whose library markers changed
+since the last sync are re-fetched (see sortune_adapters.ytmusic.sync).
+
+    Queue("import").enqueue(sync_library, entities=True)
+"""
+
+from __future__ import annotations
+
+from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
+from sortune_adapters.ytmusic.pool import get_client_pool
+from sortune_adapters.ytmusic.sync import LibrarySync
+
+from ..context import connection, report_progress
+
+
+def sync_library(full: bool = False, entities: bool = False) -> dict:
+    """Sync the YouTube Music library into Redis and return the report's counts."""
+    repo = RedisPlaylistRepo(connection())
+    report_progress(stage="syncing")
+    with get_client_pool().client() as client:
+        report = LibrarySync(client, repo).run(full=full, entities=entities)
+    return {
+        "listed": report.listed,
+        "skipped": report.skipped,
+        "fetched": report.fetched,
+        "written": report.written,
+        "failed": report.failed,
+        "gone": report.gone,
+        "entities_changed": report.entities_changed,
+        "seconds": round(report.seconds, 3),
+    }
@@ -0,0 +1,40 @@
+"""
+Write-back job: apply a stored (sorted) playlist's order to YouTube Music.
+
+Progress is checkpointed in Redis after every batched edit request, so a job
+that fails or times out picks up where it stopped when retried. Enqueue with
+e.g. `Queue("writeback").enqueue(write_back_playlist, "PL...", retry=Retry(max=3))`
+or through `POST /playlists/yt/writeback/{playlist_id}?background=true`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+
+from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
+from sortune_adapters.ytmusic.pool import get_client_pool
+
+from ..context import connection
+
+
+def write_back_playlist(
+    playlist_id: str,
+    video_ids: list[str] | None = None,
+    dry_run: bool = False,
+    batch_size: int = 100,
+) -> dict:
+    """
+    Reorder/add/remove upstream so `playlist_id` matches `video_ids` (default: the
+    stored copy's track order). Returns the write-back report as a dict.
+    """
+    r = connection()
+    if video_ids is None:
+        video_ids = [t.id for t in RedisPlaylistRepo(r).get(playlist_id).tracks]
+        if not video_ids:
+            # An empty target would empty the upstream playlist; never infer that
+            raise ValueError(f"No stored tracks for {playlist_id}; import it first")
+    with get_client_pool().client() as client:
+        report = client.write_back(
+            playlist_id, video_ids, dry_run=dry_run, checkpoints=r, batch_size=batch_size
+        )
+    return asdict(report)
@@ -0,0 +1,54 @@
+"""
+Prometheus metrics for the worker: job durations, plus everything the jobs record
+through the adapters (repo, YouTube Music, rules; see sortune_adapters.telemetry).
+
+RQ runs each job in a forked work horse, so samples only reach the scrape endpoint
+through prometheus_client's multiprocess mode: PROMETHEUS_MULTIPROC_DIR has to be
+set before this module is imported (`python -m sortune_worker` does that, and has
+all of a worker's horses share one set of sample files).
+"""
+
+from __future__ import annotations
+
+import time
+
+from prometheus_client import CollectorRegistry, Histogram, multiprocess, start_http_server
+from rq.job import Job
+from rq.queue import Queue
+
+from .worker import SortuneWorker
+
+JOB_SECONDS = Histogram(
+    "sortune_job_seconds",
+    "Background job duration",
+    ["queue", "job", "outcome"],  # outcome: ok | error
+    buckets=(0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 900, 1800, 3600),
+)
+
+
+def serve(port: int) -> None:
+    """Expose the metrics of this worker and all its work horses on `port`."""
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    start_http_server(port, registry=registry)
+
+
+class JobMetricsMixin:
+    """Records `sortune_job_seconds` for every job an RQ worker class performs."""
+
+    def perform_job(self, job: Job, queue: Queue) -> bool:
+        start = time.perf_counter()
+        ok = False
+        try:
+            ok = super().perform_job(job, queue)
+            return ok
+        finally:
+            JOB_SECONDS.labels(
+                queue=queue.name,
+                job=job.func_name.rsplit(".", 1)[-1],
+                outcome="ok" if ok else "error",
+            ).observe(time.perf_counter() - start)
+
+
+class MetricsWorker(JobMetricsMixin, SortuneWorker):
+    pass
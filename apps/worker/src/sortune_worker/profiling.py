@@ -0,0 +1,25 @@
+"""
+Profiles of single jobs: a job queued by a profiled API request carries
+`job.meta["profile"]` (format and TTL, see sortune_api.profiling) and is run under
+cProfile, the result stored under the job's id (`GET /profiles/{job_id}`).
+"""
+
+from __future__ import annotations
+
+from rq.job import Job
+from rq.queue import Queue
+from sortune_adapters.telemetry import Profile, store_profile
+
+
+class ProfiledJobsMixin:
+    """Profiles the jobs that ask for it, for an RQ worker class."""
+
+    def perform_job(self, job: Job, queue: Queue) -> bool:
+        options = job.meta.get("profile")
+        if not options:
+            return super().perform_job(job, queue)
+        profile = Profile(options["format"])
+        with profile.capture():
+            ok = super().perform_job(job, queue)
+        store_profile(job.connection, job.id, profile, options["ttl"])
+        return ok
@@ -0,0 +1,13 @@
+"""
+RQ queues, one per job type, so a long import never sits in front of a quick sort.
+
+A worker drains the queues it listens on in order, so `sort` comes first; run a
+second worker on `import writeback` (see infra/compose.yaml) to keep sorts
+responsive while big imports run. The API enqueues by these names
+(sortune_api.jobs); keep the two in sync.
+"""
+
+SORT = "sort"  # sort, dedupe: seconds
+IMPORT = "import"  # import, refresh: minutes for big playlists
+WRITEBACK = "writeback"  # batched upstream edits, rate limited
+DEFAULT = "default"  # everything else (demo seeding, library re-sort)
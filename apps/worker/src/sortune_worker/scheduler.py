@@ -0,0 +1,268 @@
+"""
+Cron-style scheduler: enqueues recurring jobs (library sync, library re-sort, artist
+graph rebuild) for the RQ workers.
+
+    python -m sortune_worker.scheduler        # SORTUNE_SCHEDULES, else DEFAULT_SCHEDULES
+
+Each schedule's state lives in the Redis hash `schedule:{name}` (next slot, when it
+is due, the last run and its job), so a restarted scheduler carries on where the
+last one stopped:
+
+- Runs missed while no scheduler was up are coalesced into one run, after which the
+  schedule moves on to its next future slot.
+- A run is skipped while the schedule's previous job is still waiting or running
+  (the job is enqueued through sortune_adapters.jobs).
+- Each run starts up to `jitter` seconds after its slot (a fixed offset per schedule
+  and slot), so schedules sharing a cron expression do not hit YouTube Music and
+  Redis at the same moment.
+
+Cron expressions are evaluated in UTC. Several schedulers may run (one per host,
+say): only the holder of the `scheduler-lock` key enqueues, the others wait to take
+over if it goes away.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import signal
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+from croniter import croniter
+from redis import Redis
+from redis.exceptions import WatchError
+from rq import Queue
+from sortune_adapters.jobs import enqueue_once
+
+from .queues import DEFAULT, IMPORT
+from .settings import REDIS_URL, SCHEDULER_INTERVAL, SCHEDULES
+
+SCHEDULE_KEY = "schedule:{name}"
+LOCK_KEY = "scheduler-lock"
+# How long finished scheduled jobs (and their results) stay readable, as for the API's jobs
+RESULT_TTL_SECONDS = 24 * 3600
+# Upper bound on the missed slots counted when coalescing (e.g. "* * * * *" after a long outage)
+_MAX_MISSED = 10_000
+
+
+@dataclass(frozen=True)
+class Schedule:
+    name: str
+    cron: str  # five-field cron expression, UTC
+    func: str  # dotted path of the worker function
+    queue: str = DEFAULT
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    jitter: int = 0  # seconds
+    timeout: int = 3600  # seconds
+
+    def __post_init__(self) -> None:
+        if not croniter.is_valid(self.cron):
+            raise ValueError(f"Invalid cron expression {self.cron!r} for schedule {self.name!r}")
+        if self.jitter < 0:
+            raise ValueError(f"Negative jitter for schedule {self.name!r}")
+
+    def next_slot(self, after: float) -> float:
+        """The first slot strictly after `after` (epoch seconds)."""
+        return croniter(self.cron, datetime.fromtimestamp(after, UTC)).get_next(float)
+
+    def offset(self, slot: float) -> float:
+        """Seconds after `slot` its run starts: fixed per schedule and slot, within `jitter`."""
+        return random.Random(f"{self.name}:{slot}").uniform(0, self.jitter) if self.jitter else 0.0
+
+
+DEFAULT_SCHEDULES: list[Schedule] = [
+    Schedule(
+        "library-sync",
+        "0 */6 * * *",
+        "sortune_worker.jobs.sync.sync_library",
+        IMPORT,
+        jitter=300,
+    ),
+    Schedule(
+        "library-sort",
+        "30 3 * * *",
+        "sortune_worker.jobs.sort.sort_library",
+        DEFAULT,
+        jitter=300,
+    ),
+    Schedule("graph-rebuild", "30 4 * * *", "sortune_worker.jobs.discover.rebuild_graph", DEFAULT),
+]
+
+
+def load_schedules(raw: str | None = SCHEDULES) -> list[Schedule]:
+    """
+    Schedules from a JSON list of `Schedule` fields, or the defaults for None:
+
+        [{"name": "nightly-sync", "cron": "0 2 * * *",
+          "func": "sortune_worker.jobs.sync.sync_library", "queue": "import",
+          "kwargs": {"entities": true}, "jitter": 600}]
+    """
+    if raw is None:
+        return list(DEFAULT_SCHEDULES)
+    schedules = [Schedule(**item) for item in json.loads(raw)]
+    names = [s.name for s in schedules]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate schedule names in {names}")
+    return schedules
+
+
+@dataclass(frozen=True)
+class Run:
+    """One due slot of a schedule: the job doing it and whether it was enqueued or skipped."""
+
+    schedule: str
+    slot: float
+    job_id: str
+    enqueued: bool  # False: the previous job was still waiting or running
+    coalesced: int  # later missed slots folded into this run
+
+
+class Scheduler:
+    def __init__(
+        self,
+        redis: Redis,
+        schedules: list[Schedule],
+        *,
+        interval: float = SCHEDULER_INTERVAL,
+    ):
+        self.redis = redis
+        self.schedules = schedules
+        self.interval = interval
+        self.token = uuid.uuid4().hex
+        # Long enough to survive a slow tick, short enough for a quick takeover
+        self.lock_ttl = max(int(interval * 3), 5)
+
+    def lead(self) -> bool:
+        """Take or renew the scheduler lock; True while this scheduler holds it."""
+        if self.redis.set(LOCK_KEY, self.token, nx=True, ex=self.lock_ttl):
+            return True
+        with self.redis.pipeline() as pipe:
+            try:
+                pipe.watch(LOCK_KEY)
+                if _text(pipe.get(LOCK_KEY)) != self.token:
+                    return False
+                pipe.multi()
+                pipe.expire(LOCK_KEY, self.lock_ttl)
+                pipe.execute()
+                return True
+            except WatchError:
+                return False
+
+    def resign(self) -> None:
+        """Release the lock (if still held) so another scheduler takes over right away."""
+        with self.redis.pipeline() as pipe:
+            try:
+                pipe.watch(LOCK_KEY)
+                if _text(pipe.get(LOCK_KEY)) == self.token:
+                    pipe.multi()
+                    pipe.delete(LOCK_KEY)
+                    pipe.execute()
+            except WatchError:
+                pass
+
+    def tick(self, now: float | None = None) -> list[Run]:
+        """Enqueue every schedule that is due at `now` (default: the current time)."""
+        now = time.time() if now is None else now
+        runs = []
+        for schedule in self.schedules:
+            run = self._tick(schedule, now)
+            if run is not None:
+                runs.append(run)
+        return runs
+
+    def state(self, name: str) -> dict[str, str]:
+        raw = self.redis.hgetall(SCHEDULE_KEY.format(name=name))
+        return {_text(k): _text(v) for k, v in raw.items()}
+
+    def run(self) -> None:
+        """Tick every `interval` seconds while holding the lock, until interrupted."""
+        try:
+            while True:
+                if self.lead():
+                    for run in self.tick():
+                        _report(run)
+                time.sleep(self.interval)
+        finally:
+            self.resign()
+
+    def _tick(self, schedule: Schedule, now: float) -> Run | None:
+        key = SCHEDULE_KEY.format(name=schedule.name)
+        state = self.state(schedule.name)
+        if state.get("cron") != schedule.cron or "next_run" not in state:
+            # New (or edited) schedule: its first run is the next slot from now
+            self.redis.hset(key, mapping={"cron": schedule.cron, **_plan(schedule, now)})
+            return None
+        if now < float(state["due_at"]):
+            return None
+
+        slot = float(state["next_run"])
+        coalesced = _missed(schedule, slot, now)
+        job, created = enqueue_once(
+            Queue(schedule.queue, connection=self.redis),
+            f"schedule:{schedule.name}",
+            schedule.func,
+            kwargs=schedule.kwargs,
+            timeout=schedule.timeout,
+            result_ttl=RESULT_TTL_SECONDS,
+            failure_ttl=RESULT_TTL_SECONDS,
+            meta={"type": schedule.func.rsplit(".", 1)[-1], "schedule": schedule.name},
+        )
+        self.redis.hset(
+            key,
+            mapping={
+                "last_run": repr(slot),
+                "last_job_id": job.id,
+                "last_outcome": "enqueued" if created else "skipped",
+                "coalesced": coalesced,
+                **_plan(schedule, now),
+            },
+        )
+        return Run(schedule.name, slot, job.id, created, coalesced)
+
+
+def _plan(schedule: Schedule, now: float) -> dict[str, str]:
+    slot = schedule.next_slot(now)
+    return {"next_run": repr(slot), "due_at": repr(slot + schedule.offset(slot))}
+
+
+def _missed(schedule: Schedule, slot: float, now: float) -> int:
+    """Slots after `slot` that are already past at `now`."""
+    it = croniter(schedule.cron, datetime.fromtimestamp(slot, UTC))
+    count = 0
+    while count < _MAX_MISSED and it.get_next(float) <= now:
+        count += 1
+    return count
+
+
+def _report(run: Run) -> None:
+    slot = datetime.fromtimestamp(run.slot, UTC).isoformat(timespec="minutes")
+    if not run.enqueued:
+        print(f"{run.schedule} ({slot}): skipped, job {run.job_id} still in progress")
+        return
+    extra = f", {run.coalesced} missed runs coalesced" if run.coalesced else ""
+    print(f"{run.schedule} ({slot}): enqueued job {run.job_id}{extra}")
+
+
+def _text(value: bytes | str | None) -> str | None:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def main() -> None:
+    scheduler = Scheduler(Redis.from_url(REDIS_URL), load_schedules())
+    # `docker stop` sends SIGTERM: exit through `run`'s cleanup, releasing the lock
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    names = ", ".join(f"{s.name} ({s.cron})" for s in scheduler.schedules) or "nothing"
+    print(f"Scheduling {names}...")
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
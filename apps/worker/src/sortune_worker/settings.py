@@ -1,4 +1,20 @@
 import os
+import tempfile
+
+from .queues import DEFAULT, IMPORT, SORT, WRITEBACK
 
 # Redis connection string; in Docker it's "redis://redis:6379/0"
 REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# Queues `python -m sortune_worker` listens on when none are given, highest priority first
+WORKER_QUEUES: list[str] = os.getenv(
+    "SORTUNE_WORKER_QUEUES", ",".join([SORT, DEFAULT, IMPORT, WRITEBACK])
+).split(",")
+# Port `python -m sortune_worker` serves Prometheus metrics on (unset: no metrics)
+METRICS_PORT: int = int(os.getenv("SORTUNE_WORKER_METRICS_PORT") or 0)
+# Where work horses leave their samples (PROMETHEUS_MULTIPROC_DIR, if set, wins)
+METRICS_DIR: str = os.path.join(tempfile.gettempdir(), "sortune-worker-metrics")
+# Schedules `python -m sortune_worker.scheduler` runs, as a JSON list (unset: the defaults
+# in sortune_worker.scheduler; "[]" schedules nothing)
+SCHEDULES: str | None = os.getenv("SORTUNE_SCHEDULES")
+# Seconds between the scheduler's checks for due schedules
+SCHEDULER_INTERVAL: float = float(os.getenv("SORTUNE_SCHEDULER_INTERVAL") or 15)
@@ -0,0 +1,32 @@
+"""
+Job spans that continue the trace of the request that enqueued the job (its trace
+context travels in `job.meta["trace"]`, see sortune_api.jobs). Tracing is turned on
+with SORTUNE_TRACING, as for the API (sortune_adapters.telemetry.tracing).
+"""
+
+from __future__ import annotations
+
+from opentelemetry import trace
+from opentelemetry.trace import SpanKind
+from rq.job import Job
+from rq.queue import Queue
+from sortune_adapters.telemetry import extract_context, flush
+
+tracer = trace.get_tracer(__name__)
+
+
+class TracedJobsMixin:
+    """Runs every job an RQ worker class performs inside a consumer span."""
+
+    def perform_job(self, job: Job, queue: Queue) -> bool:
+        with tracer.start_as_current_span(
+            f"job {job.meta.get('type') or job.func_name}",
+            context=extract_context(job.meta.get("trace")),
+            kind=SpanKind.CONSUMER,
+            attributes={"messaging.destination.name": queue.name, "sortune.job_id": job.id},
+        ) as span:
+            ok = super().perform_job(job, queue)
+            span.set_attribute("sortune.job_ok", ok)
+        # Forked work horses exit right after the job: export before they do
+        flush()
+        return ok
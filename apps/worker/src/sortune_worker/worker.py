@@ -0,0 +1,12 @@
+"""The RQ worker `python -m sortune_worker` runs: jobs are traced and, on request, profiled."""
+
+from __future__ import annotations
+
+from rq import Worker
+
+from .profiling import ProfiledJobsMixin
+from .tracing import TracedJobsMixin
+
+
+class SortuneWorker(TracedJobsMixin, ProfiledJobsMixin, Worker):
+    pass
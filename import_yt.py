@@ -3,7 +3,12 @@ Imports user's YouTube Music playlists into Sortune.
 
 - Fetches all library playlists.
 - Filters out playlists authored by "YouTube Music".
-- Saves the remaining playlists and their tracks to Redis.
+- Fetches the remaining playlists concurrently (rate limited) and saves them to Redis
+  in batches.
+
+Env:
+    IMPORT_WORKERS (default 8)  - concurrent playlist fetches
+    IMPORT_RATE    (default 5)  - starting requests/second (adapts to throttling)
 """
 
 import logging
@@ -12,7 +17,8 @@ import os
 from redis import Redis
 from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
 from sortune_adapters.ytmusic.client import YTMusicClient
-from sortune_core.models.playlist import Playlist
+from sortune_adapters.ytmusic.importer import LibraryImporter
+from sortune_adapters.ytmusic.ratelimit import AIMDRateLimiter
 
 log = logging.getLogger(__name__)
 
@@ -28,31 +34,25 @@ def main():
 
     # Fetch playlists
     log.info("Fetching library playlists from YouTube Music...")
-    playlists = yt_client.list_library_playlists(limit=500)  # Increased limit
+    # A re-import must see upstream changes: bypass the client's response cache
+    playlists = yt_client.list_library_playlists(limit=500, refresh=True)
     log.info(f"Found {len(playlists)} total playlists.")
 
-    # Filter and save
-    saved_count = 0
-    for p_summary in playlists:
-        authors = p_summary.get("author")
-        if authors and any(author.get("name") == "YouTube Music" for author in authors):
-            log.info(f"Skipping playlist from 'YouTube Music': {p_summary['title']}")
-            continue
-
-        playlist_id = p_summary["playlistId"]
-        log.info(f"Importing playlist: {p_summary['title']} ({playlist_id})")
-
-        try:
-            tracks = yt_client.get_playlist_tracks(playlist_id)
-            playlist = Playlist.model_validate(p_summary)
-            playlist.tracks = tracks
-            redis_repo.save(playlist)
-            saved_count += 1
-            log.info(f"  ...saved with {len(tracks)} tracks.")
-        except Exception as e:
-            log.error(f"Could not import playlist {p_summary['title']}: {e}")
-
-    log.info(f"Successfully imported {saved_count} playlists to Redis.")
+    importer = LibraryImporter(
+        yt_client,
+        redis_repo,
+        max_workers=int(os.getenv("IMPORT_WORKERS", "8")),
+        limiter=AIMDRateLimiter(rate=float(os.getenv("IMPORT_RATE", "5"))),
+        refresh=True,
+    )
+    report = importer.run(playlists)
+
+    log.info(
+        f"Imported {report.imported} playlists ({report.unchanged} unchanged, "
+        f"{report.skipped} auto-generated skipped, {len(report.failed)} failed) "
+        f"with {report.tracks} tracks in {report.seconds:.1f}s "
+        f"({report.playlists_per_second:.1f} playlists/s, {report.throttled} throttled)."
+    )
 
 
 if __name__ == "__main__":
@@ -1,29 +1,15 @@
-import json
 import os
 from typing import Any
 
 from dotenv import load_dotenv
-from ytmusicapi import OAuthCredentials, YTMusic
+from redis import Redis
+from sortune_adapters.storage.redis_entities import RedisEntityRepo
+from sortune_adapters.ytmusic.client import YTMusicClient
+from sortune_adapters.ytmusic.sync import sync_library_entities
 
 load_dotenv()
 
 
-def write_to_cache(cache_file_name: str, data: list[dict[str, Any]]):
-    if not data:
-        return
-    filepath = os.path.join("cache", cache_file_name)
-    with open(filepath, "w") as f:
-        json.dump(data, f, indent=4)
-
-
-def get_from_cache(cache_file_name: str) -> list[dict[str, Any]]:
-    if not os.path.exists(os.path.join("cache", cache_file_name)):
-        return None
-    filepath = os.path.join("cache", cache_file_name)
-    with open(filepath) as f:
-        return json.load(f)
-
-
 def get_playlists_of_interest(playlists: list[dict[str, Any]]):
     if not playlists:
         return None
@@ -38,34 +24,18 @@ def get_playlists_of_interest(playlists: list[dict[str, Any]]):
 
 
 if __name__ == "__main__":
-    yt = YTMusic(
-        "oauth.json",
-        oauth_credentials=OAuthCredentials(
-            client_id=os.getenv("YT_API_CLIENT_ID"), client_secret=os.getenv("YT_API_CLIENT_SECRET")
-        ),
-    )
-
-    playlists = get_from_cache("playlists.json")
-    if not playlists:
-        playlists = yt.get_library_playlists()
-        playlists_of_interest = get_playlists_of_interest(playlists)
-        write_to_cache("playlists.json", playlists_of_interest)
+    client = YTMusicClient()
+    entities = RedisEntityRepo(Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0")))
 
+    playlists = get_playlists_of_interest(client.list_library_playlists()) or []
     for playlist in playlists:
         print(playlist)
 
-    albums = get_from_cache("albums.json")
-    if not albums:
-        albums = yt.get_library_albums()
-        write_to_cache("albums.json", albums)
+    # Library albums/artists go into the entity store, where suggest_playlist_names.py reads them
+    sync_library_entities(client, entities)
 
-    for album in albums:
+    for album in entities.list_albums(library=True):
         print(album)
 
-    artists = get_from_cache("artists.json")
-    if not artists:
-        artists = yt.get_library_artists()
-        write_to_cache("artists.json", artists)
-
-    for artist in artists:
+    for artist in entities.list_artists(library=True):
         print(artist)
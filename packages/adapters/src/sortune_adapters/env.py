@@ -0,0 +1,18 @@
+"""
+.env loading for the Sortune processes (API, worker jobs, UI, scripts).
+"""
+
+from __future__ import annotations
+
+import functools
+
+
+@functools.cache
+def load_env() -> None:
+    """
+    Load .env into the environment (variables already set win), once per process.
+    Entry points call it before reading their settings; it imports only python-dotenv.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
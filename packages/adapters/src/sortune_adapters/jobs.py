@@ -0,0 +1,108 @@
+"""
+Idempotent RQ enqueueing: identical jobs (same type and arguments) share one RQ job
+while it is waiting or running, so a burst of identical requests costs one run.
+
+The key `job-idempotency:{type}:{digest}` points at the job that owns the work. It
+is claimed with SET NX plus a TTL (a lost job cannot block the work for longer than
+that). Once the job has ended, the next enqueue replaces it, so later requests run
+again on fresh data.
+
+    job, created = enqueue_once(
+        Queue("sort", connection=r), "sort",
+        "sortune_worker.jobs.playlists.sort_playlist", args=("PL...",),
+    )
+
+Shared by every producer: the API, the worker's scheduler and the scripts. Jobs are
+referred to by dotted path, so producers do not need the worker package.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import uuid
+from typing import Any
+
+from redis import Redis
+from redis.exceptions import WatchError
+from rq import Queue
+from rq.exceptions import NoSuchJobError
+from rq.job import Job, JobStatus
+
+IDEMPOTENCY_KEY = "job-idempotency:{job_type}:{digest}"
+# Upper bound on how long one job holds its key (queue wait included)
+IDEMPOTENCY_TTL_SECONDS = 24 * 3600
+_ENDED = (JobStatus.FINISHED, JobStatus.FAILED, JobStatus.STOPPED, JobStatus.CANCELED)
+_ATTEMPTS = 5
+
+
+def idempotency_key(job_type: str, args: tuple | list = (), kwargs: dict | None = None) -> str:
+    """The key identical jobs share: the job type and a digest of the arguments."""
+    payload = json.dumps([list(args), kwargs or {}], sort_keys=True, default=str)
+    digest = hashlib.sha256(payload.encode()).hexdigest()[:32]
+    return IDEMPOTENCY_KEY.format(job_type=job_type, digest=digest)
+
+
+def enqueue_once(
+    queue: Queue,
+    job_type: str,
+    func: Any,
+    *,
+    args: tuple | list = (),
+    kwargs: dict | None = None,
+    key: str | None = None,
+    ttl: int = IDEMPOTENCY_TTL_SECONDS,
+    **options: Any,
+) -> tuple[Job, bool]:
+    """
+    Enqueue `func(*args, **kwargs)` unless an identical job is already waiting or
+    running; returns the job that will do the work and whether it was created by
+    this call. `options` go to `Queue.create_job` (timeout, result_ttl, meta, ...).
+    """
+    redis: Redis = queue.connection
+    key = key or idempotency_key(job_type, args, kwargs)
+    for _ in range(_ATTEMPTS):
+        # The job exists before the key points at it, so a reader of the key never
+        # finds a missing job and mistakes it for an ended one
+        job = queue.create_job(
+            func,
+            args=args,
+            kwargs=kwargs,
+            job_id=uuid.uuid4().hex,
+            status=JobStatus.CREATED,
+            **options,
+        )
+        job.save()
+        if redis.set(key, job.id, nx=True, ex=ttl):
+            return queue.enqueue_job(job), True
+        job.delete()
+
+        owner_id = redis.get(key)
+        owner = _pending(redis, owner_id)
+        if owner is not None:
+            return owner, False
+        _release(redis, key, owner_id)  # its job ended or expired: take over
+    raise RuntimeError(f"Could not claim {key} after {_ATTEMPTS} attempts")
+
+
+def _pending(redis: Redis, job_id: bytes | None) -> Job | None:
+    if job_id is None:
+        return None
+    try:
+        job = Job.fetch(job_id.decode(), connection=redis)
+    except NoSuchJobError:
+        return None
+    return None if job.get_status(refresh=False) in _ENDED else job
+
+
+def _release(redis: Redis, key: str, job_id: bytes | None) -> None:
+    """Delete `key` if it still points at `job_id` (another producer may have taken it)."""
+    with redis.pipeline() as pipe:
+        try:
+            pipe.watch(key)
+            if pipe.get(key) == job_id:
+                pipe.multi()
+                pipe.delete(key)
+                pipe.execute()
+        except WatchError:
+            pass
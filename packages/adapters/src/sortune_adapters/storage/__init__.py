@@ -1,3 +1,5 @@
+from .redis_entities import RedisEntityRepo
+from .redis_graph import RedisGraphRepo
 from .redis_repo import RedisPlaylistRepo
 
-__all__ = ["RedisPlaylistRepo"]
+__all__ = ["RedisEntityRepo", "RedisGraphRepo", "RedisPlaylistRepo"]
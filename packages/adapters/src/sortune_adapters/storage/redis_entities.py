@@ -0,0 +1,174 @@
+"""
+Redis-backed implementation of EntityRepo.
+
+Artists and albums are stored once each, normalized through the core models'
+unify validators and keyed by browse id, in two hashes:
+
+    entities:artists   {artist id -> Artist JSON}
+    entities:albums    {album id  -> Album JSON}
+
+so any lookup is a single HGET/HMGET. Upserts merge field by field: a sparse copy
+(e.g. the {name, id} embedded in a playlist track) never erases richer data
+ingested from the library (thumbnails, subscribers, year, ...). A stored name never
+changes: playlist tracks reference entities by id on the strength of it (see
+`claim_names` and redis_repo.py).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+from redis import Redis
+from sortune_core.models.playlist import Album, Artist, Track
+
+# Library artists are browsed as "MPLA" + channel id; tracks carry the bare channel id
+_LIBRARY_ARTIST_PREFIX = "MPLA"
+
+
+def artist_id(artist: Artist) -> str | None:
+    key = artist.id or artist.browseId
+    if key and key.startswith(_LIBRARY_ARTIST_PREFIX + "UC"):
+        return key[len(_LIBRARY_ARTIST_PREFIX) :]
+    return key
+
+
+def album_id(album: Album) -> str | None:
+    return album.id or album.browseId
+
+
+class RedisEntityRepo:
+    ARTISTS_KEY = "entities:artists"
+    ALBUMS_KEY = "entities:albums"
+
+    def __init__(self, redis: Redis):
+        self.r = redis
+
+    # ---------- Writes ----------
+
+    def upsert_artists(self, artists: Iterable[Artist]) -> int:
+        """Merge artists into the store. Returns how many entries changed."""
+        return self._upsert(self.ARTISTS_KEY, Artist, artists, artist_id)
+
+    def upsert_albums(self, albums: Iterable[Album]) -> int:
+        """Merge albums into the store. Returns how many entries changed."""
+        return self._upsert(self.ALBUMS_KEY, Album, albums, album_id)
+
+    def upsert_from_tracks(self, tracks: Iterable[Track]) -> None:
+        """Record the artists/albums referenced by `tracks` (one round trip per kind)."""
+        artists: list[Artist] = []
+        albums: list[Album] = []
+        for t in tracks:
+            artists.extend(a for a in t.artists if artist_id(a))
+            if t.album is not None and album_id(t.album):
+                albums.append(t.album)
+        if artists:
+            self.upsert_artists(artists)
+        if albums:
+            self.upsert_albums(albums)
+
+    def claim_names(self, kind: str, credits: dict[str, str]) -> dict[str, str]:
+        """
+        The stored names for `credits` ({id: name}, "artists" or "albums"), first
+        storing `{name, id}` for ids not stored yet. Only unknown ids are written; a
+        concurrent claim of the same id keeps whichever name got there first.
+        """
+        stored = self.names(kind, list(credits))
+        missing = {eid: name for eid, name in credits.items() if eid not in stored}
+        if not missing:
+            return stored
+        key, model = self._kind(kind)
+        pipe = self.r.pipeline(transaction=False)
+        for eid, name in missing.items():
+            pipe.hsetnx(key, eid, model(name=name, id=eid).model_dump_json(exclude_none=True))
+        lost = [eid for eid, won in zip(missing, pipe.execute(), strict=True) if not won]
+        stored.update((eid, name) for eid, name in missing.items() if eid not in lost)
+        if lost:
+            stored.update(self.names(kind, lost))
+        return stored
+
+    # ---------- Reads ----------
+
+    def get_artist(self, entity_id: str) -> Artist | None:
+        return self.get_artists([entity_id]).get(entity_id)
+
+    def get_album(self, entity_id: str) -> Album | None:
+        return self.get_albums([entity_id]).get(entity_id)
+
+    def get_artists(self, ids: Sequence[str]) -> dict[str, Artist]:
+        return self._get_many(self.ARTISTS_KEY, Artist, ids)
+
+    def get_albums(self, ids: Sequence[str]) -> dict[str, Album]:
+        return self._get_many(self.ALBUMS_KEY, Album, ids)
+
+    def list_artists(self, *, library: bool = False) -> list[Artist]:
+        """All stored artists; `library=True` keeps those ingested from the library listing."""
+        return self._list(self.ARTISTS_KEY, Artist, library)
+
+    def list_albums(self, *, library: bool = False) -> list[Album]:
+        """All stored albums; `library=True` keeps those ingested from the library listing."""
+        return self._list(self.ALBUMS_KEY, Album, library)
+
+    def names(self, kind: str, ids: Sequence[str]) -> dict[str, str]:
+        """Just the display names for `ids` ("artists" or "albums"), for hydrating refs."""
+        key, model = self._kind(kind)
+        return {k: v.name for k, v in self._get_many(key, model, ids).items()}
+
+    # ---------- Internals ----------
+
+    def _kind(self, kind: str) -> tuple[str, type[Artist] | type[Album]]:
+        return (self.ARTISTS_KEY, Artist) if kind == "artists" else (self.ALBUMS_KEY, Album)
+
+    def _upsert[E: (Artist, Album)](
+        self, key: str, model: type[E], entities: Iterable[E], ident
+    ) -> int:
+        incoming: dict[str, E] = {}
+        for entity in entities:
+            eid = ident(entity)
+            if not eid:
+                continue
+            if eid in incoming:
+                entity = _merge(incoming[eid], entity)
+            incoming[eid] = entity
+        if not incoming:
+            return 0
+
+        ids = list(incoming)
+        changed: dict[str, str] = {}
+        for eid, raw in zip(ids, self.r.hmget(key, ids), strict=True):
+            entity = incoming[eid]
+            if raw is not None:
+                entity = _merge(model.model_validate_json(raw), entity)
+            entity = entity.model_copy(update={"id": eid})
+            payload = entity.model_dump_json(exclude_none=True)
+            if raw is None or _text(raw) != payload:
+                changed[eid] = payload
+        if changed:
+            self.r.hset(key, mapping=changed)
+        return len(changed)
+
+    def _get_many[E: (Artist, Album)](
+        self, key: str, model: type[E], ids: Sequence[str]
+    ) -> dict[str, E]:
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return {}
+        out: dict[str, E] = {}
+        for eid, raw in zip(ids, self.r.hmget(key, ids), strict=True):
+            if raw is not None:
+                out[eid] = model.model_validate_json(raw)
+        return out
+
+    def _list[E: (Artist, Album)](self, key: str, model: type[E], library: bool) -> list[E]:
+        raw = self.r.hgetall(key)
+        entities = [model.model_validate_json(v) for _, v in sorted(raw.items())]
+        # Only library listings carry browseId; track/album credits have just {name, id}
+        return [e for e in entities if e.browseId] if library else entities
+
+
+def _merge[E: (Artist, Album)](old: E, new: E) -> E:
+    """`old` updated with every field `new` actually has a value for, except its name."""
+    return old.model_copy(update={k: v for k, v in new if v is not None and k != "name"})
+
+
+def _text(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
@@ -0,0 +1,25 @@
+"""
+Redis-backed implementation of GraphRepo.
+Stores the artist co-occurrence graph (incidence + compiled CSR rows) as one JSON blob.
+"""
+
+import json
+
+from redis import Redis
+from sortune_core.graph.cooccurrence import ArtistGraph
+
+
+class RedisGraphRepo:
+    KEY = "graph:artists"
+
+    def __init__(self, redis: Redis):
+        self.r = redis
+
+    def load(self) -> ArtistGraph | None:
+        raw = self.r.get(self.KEY)
+        if not raw:
+            return None
+        return ArtistGraph.from_dict(json.loads(raw))
+
+    def save(self, graph: ArtistGraph) -> None:
+        self.r.set(self.KEY, json.dumps(graph.to_dict(), separators=(",", ":")))
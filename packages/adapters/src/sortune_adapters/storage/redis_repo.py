@@ -1,42 +1,451 @@
 """
 Redis-backed implementation of PlaylistRepo.
-Stores playlists as JSON blobs keyed by playlist ID.
+Stores playlists as JSON blobs keyed by playlist ID, with a content hash alongside
+so unchanged saves are skipped and clients can use the hash as an ETag.
+
+Track artists/albums that are plain {name, id} references are stored as their id
+only and resolved against the entity store (redis_entities.py) on read, instead
+of embedding a copy of every artist and album in every track. A credit is stored
+that way only when its name is the (never changing) stored name of the entity;
+otherwise it stays embedded, so what a read returns is exactly what was saved.
 """
 
 import json
+import logging
+import uuid
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from typing import Any
 
+from opentelemetry import trace
+from pydantic import BaseModel
 from redis import Redis
-from sortune_core.models.playlist import Playlist
+from sortune_core.models.playlist import (
+    Album,
+    Artist,
+    Playlist,
+    Track,
+    payload_hash,
+    payload_hasher,
+)
+from sortune_core.models.projection import Fields, project
+
+from ..telemetry.metrics import REPO_BYTES, REPO_SECONDS, TimedRule, timed
+from .redis_entities import RedisEntityRepo, album_id, artist_id
+
+log = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+# A playlist serialized with no tracks ends with this; `tracks` is the model's last field
+_EMPTY_TRACKS_TAIL = '"tracks":[]}'
+# Abandoned staging blobs (crashed writers) clean themselves up
+_STAGING_TTL_SECONDS = 3600
+# First GETRANGE size when only playlist metadata is wanted; grows until it covers the head
+_HEAD_PROBE_BYTES = 4096
+
+
+def _text(value: bytes | str | None) -> str | None:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _playlist_head(playlist: Playlist) -> str:
+    """The stored JSON of `playlist` up to and including the opening of its tracks list."""
+    head = playlist.model_copy(update={"tracks": []}).model_dump_json(by_alias=True)
+    if not head.endswith(_EMPTY_TRACKS_TAIL):  # pragma: no cover - model layout guard
+        raise RuntimeError("Playlist.tracks must be the last serialized field")
+    return head[: -len("]}")]
+
+
+@contextmanager
+def _operation(name: str, **attributes: Any) -> Iterator[None]:
+    """A span and a latency sample for one repo operation."""
+    with (
+        tracer.start_as_current_span(
+            f"RedisPlaylistRepo.{name}",
+            attributes={f"sortune.{k}": v for k, v in attributes.items()},
+        ),
+        timed(REPO_SECONDS, operation=name),
+    ):
+        yield
+
+
+def _observe_read(operation: str, raws: Sequence[bytes | str | None]) -> None:
+    total = 0
+    for raw in raws:
+        if raw:
+            REPO_BYTES.labels(operation=operation).observe(len(raw))
+            total += len(raw)
+    trace.get_current_span().set_attribute("sortune.payload_bytes", total)
+
+
+def _is_reference(entity: BaseModel) -> bool:
+    """True for the bare {name, id} copies ytmusicapi embeds in tracks."""
+    return bool(entity.id) and all(v is None for k, v in entity if k not in ("name", "id"))
+
+
+def _richly_credited(tracks: Sequence[Track]) -> list[Track]:
+    """Tracks crediting an artist/album with more than {name, id} (merged into the store)."""
+    return [
+        t
+        for t in tracks
+        if any(a.id and not _is_reference(a) for a in t.artists)
+        or (t.album is not None and t.album.id and not _is_reference(t.album))
+    ]
+
+
+class RedisPlaylistStreamWriter:
+    """
+    Builds a playlist's stored JSON page by page in a staging key (APPEND), then swaps
+    it in with RENAME on commit. Only one page is serialized at a time, and the result
+    is byte-identical to `save`, so content hashes/ETags agree between both paths.
+    Each writer stages under its own key, so concurrent imports of one playlist never
+    mix their pages (the last commit wins).
+    """
+
+    def __init__(self, repo: "RedisPlaylistRepo", playlist: Playlist):
+        self.repo = repo
+        self.playlist_id = playlist.id
+        self.count = 0
+        self.bytes_written = 0
+        self._staging = repo._staging_key(playlist.id)
+        self._hasher = payload_hasher()
+        self._credited: list[Track] = []
+        self._done = False
+        self._write(_playlist_head(playlist), first=True)
+
+    def append(self, tracks: Sequence[Track]) -> int:
+        if tracks:
+            body = ",".join(self.repo._encode_tracks(tracks))
+            self._write(("," if self.count else "") + body)
+            self._credited.extend(_richly_credited(tracks))
+            self.count += len(tracks)
+        return self.count
+
+    def commit(self) -> bool:
+        self._write("]}")
+        REPO_BYTES.labels(operation="save").observe(self.bytes_written)
+        self._done = True
+        digest = self._hasher.hexdigest()
+        r, pid = self.repo.r, self.playlist_id
+        if r.exists(self.repo._key(pid)) and self.repo.get_hash(pid) == digest:
+            r.delete(self._staging)
+            return False
+        with r.pipeline() as pipe:
+            pipe.watch(self._staging)
+            # Gone (or replaced) staging data must never be swapped in
+            if pipe.strlen(self._staging) != self.bytes_written:
+                pipe.delete(self._staging)
+                raise RuntimeError(f"Staged copy of playlist {pid} expired before its commit")
+            pipe.multi()
+            pipe.rename(self._staging, self.repo._key(pid))
+            pipe.persist(self.repo._key(pid))
+            pipe.set(self.repo._hash_key(pid), digest)
+            pipe.execute()
+        self.repo._record_credits(self._credited)
+        return True
+
+    def abort(self) -> None:
+        if not self._done:
+            self._done = True
+            self.repo.r.delete(self._staging)
+
+    def __enter__(self) -> "RedisPlaylistStreamWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        # Uncommitted writers (errors, early exits) never touch the stored copy
+        self.abort()
+
+    def _write(self, chunk: str, first: bool = False) -> None:
+        data = chunk.encode("utf-8")
+        self.bytes_written += len(data)
+        self._hasher.update(data)
+        if first:
+            self.repo.r.set(self._staging, data, ex=_STAGING_TTL_SECONDS)
+        elif self.repo.r.append(self._staging, data) != self.bytes_written:
+            raise RuntimeError(f"Staged copy of playlist {self.playlist_id} expired mid-write")
 
 
 class RedisPlaylistRepo:
-    def __init__(self, redis: Redis):
+    FINGERPRINTS_KEY = "playlist-fingerprints"
+
+    def __init__(self, redis: Redis, entities: RedisEntityRepo | bool = True):
+        """
+        `entities` is the artist/album store track references resolve against (by
+        default one on the same Redis); False stores every track fully embedded.
+        """
         self.r = redis
+        if entities is True:
+            entities = RedisEntityRepo(redis)
+        self.entities: RedisEntityRepo | None = entities or None
 
     def _key(self, pid: str) -> str:
         return f"playlist:{pid}"
 
+    def _hash_key(self, pid: str) -> str:
+        return f"playlist-hash:{pid}"
+
+    def _applied_key(self, pid: str) -> str:
+        return f"playlist-applied:{pid}"
+
+    def _staging_key(self, pid: str) -> str:
+        return f"playlist-staging:{pid}:{uuid.uuid4().hex}"
+
     def get(self, playlist_id: str) -> Playlist:
-        raw = self.r.get(self._key(playlist_id))
-        if not raw:
-            # Return an empty playlist if nothing exists
-            return Playlist.model_validate(
-                {
-                    "playlistId": playlist_id,
-                    "title": f"Playlist {playlist_id}",
-                    "tracks": [],
-                }
+        with _operation("get", playlist_id=playlist_id):
+            raw = self.r.get(self._key(playlist_id))
+            _observe_read("get", [raw])
+            return self._decode_many([playlist_id], [raw])[0]
+
+    def get_document(self, playlist_id: str, fields: Fields | None = None) -> dict[str, Any]:
+        """
+        The playlist as `Playlist.model_dump(by_alias=True)` would render it, built
+        straight from the stored JSON without validating models (for API responses).
+
+        With a `fields` projection (sortune_core.models.projection), only the metadata
+        prefix of the blob is read when no tracks are selected, and artist/album
+        references are only resolved when selected.
+        """
+        with _operation("get_document", playlist_id=playlist_id):
+            if fields is not None and "tracks" not in fields:
+                raw = self._read_head(playlist_id)
+            else:
+                raw = self.r.get(self._key(playlist_id))
+            _observe_read("get_document", [raw])
+            if not raw:
+                return project(self._empty(playlist_id).model_dump(by_alias=True), fields)
+            doc = project(json.loads(raw), fields)
+            self._resolve_references([doc], (fields or {}).get("tracks"))
+            return doc
+
+    def get_many(self, playlist_ids: Sequence[str]) -> list[Playlist]:
+        if not playlist_ids:
+            return []
+        with _operation("get_many", playlists=len(playlist_ids)):
+            raws = self.r.mget([self._key(pid) for pid in playlist_ids])
+            _observe_read("get_many", raws)
+            return self._decode_many(playlist_ids, raws)
+
+    def save(self, playlist: Playlist) -> bool:
+        return self.save_many([playlist])[0]
+
+    def save_many(self, playlists: Sequence[Playlist]) -> list[bool]:
+        """
+        Write only the playlists whose content hash changed.
+        Costs two round trips regardless of batch size.
+        """
+        if not playlists:
+            return []
+        with _operation("save", playlists=len(playlists)):
+            return self._save_many(playlists)
+
+    def _save_many(self, playlists: Sequence[Playlist]) -> list[bool]:
+        payloads = [self._encode(pl) for pl in playlists]
+        digests = [payload_hash(p) for p in payloads]
+
+        pipe = self.r.pipeline(transaction=False)
+        for pl in playlists:
+            pipe.get(self._hash_key(pl.id))
+            pipe.exists(self._key(pl.id))
+        state = pipe.execute()
+
+        written: list[bool] = []
+        pipe = self.r.pipeline()
+        for i, pl in enumerate(playlists):
+            stored, exists = state[2 * i], state[2 * i + 1]
+            if exists and _text(stored) == digests[i]:
+                written.append(False)
+                continue
+            pipe.set(self._key(pl.id), payloads[i])
+            pipe.set(self._hash_key(pl.id), digests[i])
+            REPO_BYTES.labels(operation="save").observe(len(payloads[i].encode("utf-8")))
+            written.append(True)
+        if any(written):
+            pipe.execute()
+            self._record_credits(
+                [t for pl, w in zip(playlists, written, strict=True) if w for t in pl.tracks]
             )
-        data = json.loads(raw)
-        return Playlist.model_validate(data)
+        return written
+
+    def open_stream(self, playlist: Playlist) -> RedisPlaylistStreamWriter:
+        """
+        Write `playlist` with tracks appended page by page (its own `tracks` are ignored):
+
+            with repo.open_stream(meta) as w:
+                for page in client.iter_playlist_tracks(pid):
+                    w.append(page)
+                changed = w.commit()
+        """
+        return RedisPlaylistStreamWriter(self, playlist)
+
+    def get_hash(self, playlist_id: str) -> str | None:
+        return _text(self.r.get(self._hash_key(playlist_id)))
+
+    def get_applied_hash(self, playlist_id: str, rule_name: str) -> str | None:
+        return _text(self.r.hget(self._applied_key(playlist_id), rule_name))
+
+    def set_applied_hash(self, playlist_id: str, rule_name: str, content_hash: str) -> None:
+        self.r.hset(self._applied_key(playlist_id), rule_name, content_hash)
+
+    def get_hashes(self, playlist_ids: Sequence[str]) -> list[str | None]:
+        if not playlist_ids:
+            return []
+        return [_text(h) for h in self.r.mget([self._hash_key(pid) for pid in playlist_ids])]
 
-    def save(self, playlist: Playlist) -> None:
-        self.r.set(self._key(playlist.id), playlist.model_dump_json(by_alias=True))
+    def get_applied_hashes(self, playlist_ids: Sequence[str], rule_name: str) -> list[str | None]:
+        pipe = self.r.pipeline(transaction=False)
+        for pid in playlist_ids:
+            pipe.hget(self._applied_key(pid), rule_name)
+        return [_text(h) for h in pipe.execute()]
+
+    def set_applied_hashes(self, rule_name: str, content_hashes: Mapping[str, str]) -> None:
+        if not content_hashes:
+            return
+        pipe = self.r.pipeline(transaction=False)
+        for pid, digest in content_hashes.items():
+            pipe.hset(self._applied_key(pid), rule_name, digest)
+        pipe.execute()
+
+    def get_fingerprints(self) -> dict[str, str]:
+        """Upstream change markers recorded by the last library sync, per playlist."""
+        raw = self.r.hgetall(self.FINGERPRINTS_KEY)
+        return {_text(k): _text(v) for k, v in raw.items()}
+
+    def set_fingerprints(self, fingerprints: dict[str, str]) -> None:
+        if fingerprints:
+            self.r.hset(self.FINGERPRINTS_KEY, mapping=fingerprints)
+
+    def list_ids(self) -> list[str]:
+        prefix = self._key("")
+        ids: list[str] = []
+        for key in self.r.scan_iter(match=f"{prefix}*", count=500):
+            ids.append(_text(key)[len(prefix) :])
+        return sorted(ids)
 
     def load_rule(self, name: str):
         # Simple inline registry for now
         from sortune_core.rules.simple import ByTitle
 
         if name == ByTitle.name:
-            return ByTitle()
+            return TimedRule(ByTitle())
         raise ValueError(f"Unknown rule: {name}")
+
+    # ---------- Encoding ----------
+
+    def _encode(self, playlist: Playlist) -> str:
+        if self.entities is None:
+            return playlist.model_dump_json(by_alias=True)
+        return _playlist_head(playlist) + ",".join(self._encode_tracks(playlist.tracks)) + "]}"
+
+    def _encode_tracks(self, tracks: Sequence[Track]) -> list[str]:
+        """Serialize tracks as stored; byte-identical to `model_dump_json` without refs."""
+        if self.entities is None:
+            return [t.model_dump_json(by_alias=True) for t in tracks]
+        artist_refs: dict[str, str] = {}
+        album_refs: dict[str, str] = {}
+        for t in tracks:
+            for a in t.artists:
+                if _is_reference(a):
+                    artist_refs.setdefault(artist_id(a), a.name)
+            if t.album is not None and _is_reference(t.album):
+                album_refs.setdefault(album_id(t.album), t.album.name)
+        artists = self.entities.claim_names("artists", artist_refs) if artist_refs else {}
+        albums = self.entities.claim_names("albums", album_refs) if album_refs else {}
+
+        out: list[str] = []
+        for t in tracks:
+            data = t.model_dump(by_alias=True)
+            data["artists"] = [
+                ref if _is_reference(a) and artists.get(ref := artist_id(a)) == a.name else raw
+                for a, raw in zip(t.artists, data["artists"], strict=True)
+            ]
+            album = t.album
+            if album is not None and _is_reference(album):
+                if albums.get(ref := album_id(album)) == album.name:
+                    data["album"] = ref
+            out.append(json.dumps(data, separators=(",", ":"), ensure_ascii=False))
+        return out
+
+    def _record_credits(self, tracks: Sequence[Track]) -> None:
+        """Merge the richer artist/album credits of written tracks into the entity store."""
+        rich = _richly_credited(tracks)
+        if self.entities is not None and rich:
+            self.entities.upsert_from_tracks(rich)
+
+    def _decode_many(
+        self, playlist_ids: Sequence[str], raws: Sequence[bytes | str | None]
+    ) -> list[Playlist]:
+        docs = [json.loads(raw) if raw else None for raw in raws]
+        self._resolve_references([d for d in docs if d])
+        return [
+            Playlist.model_validate(doc) if doc else self._empty(pid)
+            for pid, doc in zip(playlist_ids, docs, strict=True)
+        ]
+
+    def _read_head(self, playlist_id: str) -> str | None:
+        """
+        The stored playlist without its tracks, read with GETRANGE in growing chunks
+        until the opening of the tracks list (the last field, see `_playlist_head`).
+        """
+        key, size, head = self._key(playlist_id), _HEAD_PROBE_BYTES, b""
+        while True:
+            head += self.r.getrange(key, len(head), size - 1)
+            # Cannot occur inside a JSON string: the quote before the colon would be escaped
+            end = head.find(b'"tracks":[')
+            if end != -1:
+                return head[:end].decode("utf-8") + '"tracks":[]}'
+            if len(head) < size:
+                return None  # missing key (or not a playlist blob)
+            size *= 4
+
+    def _resolve_references(self, docs: list[dict[str, Any]], tracks: Fields | None = None) -> None:
+        """
+        Swap stored artist/album ids back for their {name, id} dumps (two HMGETs in
+        total), rendered through the `tracks` projection when one is given.
+        """
+        artist_refs: set[str] = set()
+        album_refs: set[str] = set()
+        for doc in docs:
+            for t in doc.get("tracks", ()):
+                artist_refs.update(a for a in t.get("artists", ()) if isinstance(a, str))
+                if isinstance(t.get("album"), str):
+                    album_refs.add(t["album"])
+        if not artist_refs and not album_refs:
+            return
+        if self.entities is None:
+            self.entities = RedisEntityRepo(self.r)  # data written by an entity-aware repo
+        artists = self.entities.names("artists", sorted(artist_refs))
+        albums = self.entities.names("albums", sorted(album_refs))
+        if len(artists) < len(artist_refs) or len(albums) < len(album_refs):
+            log.warning("Entity store is missing names for some stored track references")
+
+        # Rendered once per entity, exactly as an embedded {name, id} copy would dump
+        artist_fields = (tracks or {}).get("artists")
+        album_fields = (tracks or {}).get("album")
+        artist_docs = {
+            a: project(Artist(name=artists.get(a, a), id=a).model_dump(), artist_fields)
+            for a in artist_refs
+        }
+        album_docs = {
+            a: project(Album(name=albums.get(a, a), id=a).model_dump(), album_fields)
+            for a in album_refs
+        }
+        for doc in docs:
+            for t in doc.get("tracks", ()):
+                if "artists" in t:  # may be projected away
+                    t["artists"] = [
+                        dict(artist_docs[a]) if isinstance(a, str) else a for a in t["artists"]
+                    ]
+                if isinstance(t.get("album"), str):
+                    t["album"] = dict(album_docs[t["album"]])
+
+    @staticmethod
+    def _empty(playlist_id: str) -> Playlist:
+        # Return an empty playlist if nothing exists
+        return Playlist.model_validate(
+            {
+                "playlistId": playlist_id,
+                "title": f"Playlist {playlist_id}",
+                "tracks": [],
+            }
+        )
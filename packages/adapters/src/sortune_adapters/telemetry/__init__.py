@@ -0,0 +1,26 @@
+from .metrics import TimedRule, metrics_payload, timed, track_bucket
+from .profiling import Profile, load_profile, store_profile
+from .tracing import (
+    clear_spans,
+    configure_tracing,
+    extract_context,
+    finished_spans,
+    flush,
+    inject_context,
+)
+
+__all__ = [
+    "Profile",
+    "TimedRule",
+    "clear_spans",
+    "configure_tracing",
+    "extract_context",
+    "finished_spans",
+    "flush",
+    "inject_context",
+    "load_profile",
+    "metrics_payload",
+    "store_profile",
+    "timed",
+    "track_bucket",
+]
@@ -0,0 +1,99 @@
+"""
+Prometheus metrics for the adapters: Redis playlist repo, YouTube Music client and
+sort rules.
+
+Metrics live in prometheus_client's default registry, so any process that uses the
+adapters (API, worker, scripts) records them and can expose them with
+`metrics_payload()`. Processes that fork work out (RQ work horses, multi-worker
+uvicorn/gunicorn) must set PROMETHEUS_MULTIPROC_DIR, so samples recorded in
+children are aggregated when scraped.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Playlist blobs range from a few KB to tens of MB
+_BYTES_BUCKETS = (1e3, 1e4, 1e5, 3e5, 1e6, 3e6, 1e7, 3e7, 1e8)
+
+REPO_SECONDS = Histogram(
+    "sortune_repo_operation_seconds",
+    "RedisPlaylistRepo operation latency",
+    ["operation"],
+)
+REPO_BYTES = Histogram(
+    "sortune_repo_payload_bytes",
+    "Size of each stored playlist blob read or written by RedisPlaylistRepo",
+    ["operation"],
+    buckets=_BYTES_BUCKETS,
+)
+YT_SECONDS = Histogram(
+    "sortune_ytmusic_call_seconds",
+    "Latency of YouTube Music calls that reach upstream (cache hits are not counted)",
+    ["endpoint"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+YT_ERRORS = Counter(
+    "sortune_ytmusic_call_errors_total",
+    "Failed YouTube Music calls",
+    ["endpoint", "kind"],  # kind: throttled | error
+)
+RULE_SECONDS = Histogram(
+    "sortune_rule_apply_seconds",
+    "Time to apply a sort rule to one playlist",
+    ["rule", "tracks"],  # tracks: size class, see track_bucket
+)
+
+
+def track_bucket(count: int) -> str:
+    """Playlist size class for labels (exact counts would explode label cardinality)."""
+    for limit, label in ((100, "<100"), (1000, "<1k"), (10_000, "<10k")):
+        if count < limit:
+            return label
+    return ">=10k"
+
+
+@contextmanager
+def timed(histogram: Histogram, **labels: str) -> Iterator[None]:
+    """Observe the block's duration, whether it returns or raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - start)
+
+
+class TimedRule:
+    """Wraps a sort rule to record `sortune_rule_apply_seconds` (picklable, like the rules)."""
+
+    def __init__(self, rule: Any):
+        self.rule = rule
+        self.name = rule.name
+
+    def apply(self, tracks: Iterable[Any]) -> list[Any]:
+        tracks = list(tracks)
+        with timed(RULE_SECONDS, rule=self.name, tracks=track_bucket(len(tracks))):
+            return list(self.rule.apply(tracks))
+
+
+def metrics_payload() -> tuple[bytes, str]:
+    """Exposition text and content type for this process (or all of them, multiprocess)."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,102 @@
+"""
+cProfile captures of single executions (an API request or a background job),
+rendered and stored in Redis for later download.
+
+Formats:
+    text    pstats report, functions sorted by cumulative time (text/plain)
+    pstats  raw stats as written by `cProfile.Profile.dump_stats`; open them with
+            `python -m pstats FILE`, snakeviz, gprof2dot, ...
+
+Stored profiles live under PROFILE_KEY for their TTL; the API serves them at
+`GET /profiles/{id}` (the id of a job's profile is the job id).
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import marshal
+import pstats
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from redis import Redis
+
+PROFILE_KEY = "profile:{id}"
+PROFILE_TTL_SECONDS = 24 * 3600
+FORMATS = {"text": "text/plain; charset=utf-8", "pstats": "application/octet-stream"}
+# Rows in a text report
+TEXT_LIMIT = 80
+# Since 3.12 cProfile is a process-wide sys.monitoring tool: one capture at a time
+_CAPTURING = threading.Lock()
+
+
+class Profile:
+    """
+    A cProfile profiler that only runs inside `capture()` blocks (which may be
+    entered several times). While a block runs, cProfile sees every thread of the
+    process, so only one block in the process is profiled at a time.
+    """
+
+    def __init__(self, fmt: str = "text"):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown profile format {fmt!r}; use one of {sorted(FORMATS)}")
+        self.format = fmt
+        self._profiler = cProfile.Profile()
+        self._captured = False
+        self.skipped = False  # a block ran unprofiled: another capture was active
+
+    @property
+    def content_type(self) -> str:
+        return FORMATS[self.format]
+
+    @contextmanager
+    def capture(self) -> Iterator[bool]:
+        """Profile the block; yields False, running it unprofiled, if another capture is on."""
+        if not _CAPTURING.acquire(blocking=False):
+            self.skipped = True
+            yield False
+            return
+        try:
+            self._profiler.enable()
+        except ValueError:  # another sys.monitoring profiler (not ours) is active
+            _CAPTURING.release()
+            self.skipped = True
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            self._profiler.disable()
+            self._captured = True
+            _CAPTURING.release()
+
+    def render(self) -> bytes:
+        if not self._captured:
+            return b"" if self.format == "pstats" else b"Nothing was profiled.\n"
+        self._profiler.create_stats()
+        if self.format == "pstats":
+            return marshal.dumps(self._profiler.stats)
+        out = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=out)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TEXT_LIMIT)
+        return out.getvalue().encode()
+
+
+def store_profile(
+    redis: Redis, profile_id: str, profile: Profile, ttl: int = PROFILE_TTL_SECONDS
+) -> None:
+    key = PROFILE_KEY.format(id=profile_id)
+    pipe = redis.pipeline(transaction=False)
+    pipe.hset(key, mapping={"format": profile.format, "body": profile.render()})
+    pipe.expire(key, ttl)
+    pipe.execute()
+
+
+def load_profile(redis: Redis, profile_id: str) -> tuple[bytes, str] | None:
+    """A stored profile's body and content type, or None once it expired."""
+    stored = redis.hgetall(PROFILE_KEY.format(id=profile_id))
+    if not stored:
+        return None
+    return stored[b"body"], FORMATS[stored[b"format"].decode()]
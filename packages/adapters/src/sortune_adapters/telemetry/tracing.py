@@ -0,0 +1,102 @@
+"""
+Opt-in OpenTelemetry tracing.
+
+Code across the packages creates spans through the OpenTelemetry API
+(`trace.get_tracer(__name__)`), which records nothing until a tracer provider is
+installed. `configure_tracing()` installs one when SORTUNE_TRACING names an exporter:
+
+    SORTUNE_TRACING=console   # spans printed to stdout as JSON, works offline
+    SORTUNE_TRACING=memory    # kept in process (tests, notebooks): see `finished_spans()`
+    SORTUNE_TRACING=otlp      # OTLP/HTTP to OTEL_EXPORTER_OTLP_ENDPOINT (collector, Jaeger, ...)
+
+The SDK (opentelemetry-sdk, plus opentelemetry-exporter-otlp-proto-http for `otlp`)
+is only needed when tracing is turned on.
+
+Background jobs carry the enqueuing request's trace context in their meta
+(`inject_context` / `extract_context`), so a job's spans join the request's trace.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from typing import Any
+
+from opentelemetry import context, propagate, trace
+
+log = logging.getLogger(__name__)
+
+EXPORTERS = ("console", "memory", "otlp")
+
+_memory: Any = None  # the InMemorySpanExporter once configured with "memory"
+
+
+def configure_tracing(service_name: str, exporter: str | None = None) -> bool:
+    """
+    Install a tracer provider exporting with `exporter` (default: SORTUNE_TRACING).
+    Returns False, changing nothing, when tracing is off. Call once per process,
+    before the first request or job.
+    """
+    global _memory
+    exporter = (exporter if exporter is not None else os.getenv("SORTUNE_TRACING", "")).lower()
+    if not exporter:
+        return False
+    if exporter not in EXPORTERS:
+        raise ValueError(f"Unknown SORTUNE_TRACING exporter {exporter!r}; use one of {EXPORTERS}")
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import (
+            BatchSpanProcessor,
+            ConsoleSpanExporter,
+            SimpleSpanProcessor,
+        )
+    except ImportError as e:
+        raise RuntimeError(
+            "SORTUNE_TRACING is set but opentelemetry-sdk is not installed "
+            "(pip install opentelemetry-sdk)."
+        ) from e
+
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    if exporter == "memory":
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+        _memory = InMemorySpanExporter()
+        provider.add_span_processor(SimpleSpanProcessor(_memory))
+    elif exporter == "console":
+        provider.add_span_processor(SimpleSpanProcessor(ConsoleSpanExporter()))
+    else:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    log.info("Tracing %s with the %s exporter", service_name, exporter)
+    return True
+
+
+def finished_spans() -> list[Any]:
+    """Spans recorded so far with the "memory" exporter (empty otherwise)."""
+    return list(_memory.get_finished_spans()) if _memory is not None else []
+
+
+def clear_spans() -> None:
+    if _memory is not None:
+        _memory.clear()
+
+
+def flush() -> None:
+    """Export pending spans now (before a forked RQ work horse exits)."""
+    force_flush = getattr(trace.get_tracer_provider(), "force_flush", None)
+    if force_flush is not None:
+        force_flush()
+
+
+def inject_context() -> dict[str, str]:
+    """The current trace context as a carrier (W3C traceparent) to store with a job."""
+    carrier: dict[str, str] = {}
+    propagate.inject(carrier)
+    return carrier
+
+
+def extract_context(carrier: dict[str, str] | None) -> context.Context:
+    return propagate.extract(carrier or {})
@@ -1,3 +1,23 @@
-from .client import YTMusicClient
+from .client import TrackBatch, TrackReject, YTMusicClient, map_tracks
+from .fake import FakeYTMusic
+from .importer import ImportReport, LibraryImporter
+from .pool import YTMusicClientPool, get_client_pool
+from .ratelimit import AIMDRateLimiter, TokenBucket
+from .writeback import PlaylistWriteBack, WriteBackError, WriteBackReport
 
-__all__ = ["YTMusicClient"]
+__all__ = [
+    "AIMDRateLimiter",
+    "FakeYTMusic",
+    "ImportReport",
+    "LibraryImporter",
+    "PlaylistWriteBack",
+    "TokenBucket",
+    "TrackBatch",
+    "TrackReject",
+    "WriteBackError",
+    "WriteBackReport",
+    "YTMusicClient",
+    "YTMusicClientPool",
+    "get_client_pool",
+    "map_tracks",
+]
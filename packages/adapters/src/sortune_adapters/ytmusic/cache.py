@@ -0,0 +1,206 @@
+"""
+Persistent response cache for ytmusicapi calls.
+
+Responses are stored in SQLite, keyed by a hash of (endpoint, arguments) and
+zlib-compressed. Each endpoint has a freshness TTL; past it, an entry is still
+served for `stale_ttl` more seconds while a background thread re-fetches it
+(stale-while-revalidate). Callers can bypass the cache per call with `refresh=True`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+log = logging.getLogger(__name__)
+
+# Seconds an entry is fresh, per endpoint
+DEFAULT_TTLS: dict[str, float] = {
+    "get_library_playlists": 10 * 60,
+    "get_playlist": 60 * 60,
+    "get_library_albums": 24 * 60 * 60,
+    "get_library_artists": 24 * 60 * 60,
+}
+DEFAULT_TTL = 60 * 60
+# Extra seconds a stale entry may be served while it is refreshed in the background
+DEFAULT_STALE_TTL = 7 * 24 * 60 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key      TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    created  REAL NOT NULL,
+    digest   TEXT NOT NULL,
+    body     BLOB NOT NULL
+)
+"""
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    value: Any
+    created: float
+    digest: str  # hash of the uncompressed JSON body (usable as an ETag)
+
+
+def request_key(endpoint: str, kwargs: dict[str, Any]) -> str:
+    canonical = json.dumps([endpoint, kwargs], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        path: Path | str,
+        *,
+        ttls: dict[str, float] | None = None,
+        stale_ttl: float = DEFAULT_STALE_TTL,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = Path(path)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._refreshing: set[str] = set()
+        self._bg = ThreadPoolExecutor(max_workers=2, thread_name_prefix="yt-cache-refresh")
+        self._conn: sqlite3.Connection | None = None  # opened on first use
+
+    # ---------- Public API ----------
+
+    def get_or_fetch(
+        self,
+        endpoint: str,
+        kwargs: dict[str, Any],
+        fetch: Callable[[], Any],
+        *,
+        refresh: bool = False,
+    ) -> Any:
+        """
+        Return the cached response for (endpoint, kwargs), calling `fetch` on a miss.
+        `refresh=True` skips the lookup and always re-fetches (the result is stored).
+        """
+        return self.get_or_fetch_entry(endpoint, kwargs, fetch, refresh=refresh).value
+
+    def get_or_fetch_entry(
+        self,
+        endpoint: str,
+        kwargs: dict[str, Any],
+        fetch: Callable[[], Any],
+        *,
+        refresh: bool = False,
+    ) -> CacheEntry:
+        """`get_or_fetch`, returning the entry served (so its digest matches the value)."""
+        key = request_key(endpoint, kwargs)
+        if not refresh:
+            entry = self.lookup(key)
+            if entry is not None:
+                age = self._clock() - entry.created
+                ttl = self.ttls.get(endpoint, DEFAULT_TTL)
+                if age <= ttl:
+                    return entry
+                if age <= ttl + self.stale_ttl:
+                    self._revalidate(key, endpoint, fetch)
+                    return entry
+        value = fetch()
+        created = self._clock()
+        return CacheEntry(value, created, self.store(key, endpoint, value, created=created))
+
+    def fresh_digest(self, endpoint: str, kwargs: dict[str, Any]) -> str | None:
+        """
+        Digest of the entry a call would be served without fetching, or None if it
+        would fetch (or revalidate). Reads no response body.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT created, digest FROM responses WHERE key = ?",
+                (request_key(endpoint, kwargs),),
+            ).fetchone()
+        if row is None or self._clock() - row[0] > self.ttls.get(endpoint, DEFAULT_TTL):
+            return None
+        return row[1]
+
+    def entry(self, endpoint: str, kwargs: dict[str, Any]) -> CacheEntry | None:
+        return self.lookup(request_key(endpoint, kwargs))
+
+    def lookup(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, created, digest FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        body, created, digest = row
+        return CacheEntry(json.loads(zlib.decompress(body)), created, digest)
+
+    def store(self, key: str, endpoint: str, value: Any, *, created: float | None = None) -> str:
+        """Store a response; returns its digest."""
+        raw = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, created, digest, body) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    key,
+                    endpoint,
+                    self._clock() if created is None else created,
+                    digest,
+                    zlib.compress(raw, 6),
+                ),
+            )
+        return digest
+
+    def clear(self, endpoint: str | None = None) -> None:
+        with self._lock:
+            if endpoint is None:
+                self._db.execute("DELETE FROM responses")
+            else:
+                self._db.execute("DELETE FROM responses WHERE endpoint = ?", (endpoint,))
+
+    def close(self) -> None:
+        self._bg.shutdown(wait=True)
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ---------- Internals ----------
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        # Callers hold self._lock
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _revalidate(self, key: str, endpoint: str, fetch: Callable[[], Any]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run() -> None:
+            try:
+                self.store(key, endpoint, fetch())
+            except Exception as e:
+                log.warning("Background refresh of %s failed: %s", endpoint, e)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._bg.submit(run)
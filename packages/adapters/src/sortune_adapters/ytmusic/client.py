@@ -2,31 +2,61 @@
 YouTube Music client (ytmusicapi) with a thin anti-corruption layer.
 
 - Handles first-run OAuth and reuses a saved token file thereafter.
-- Exposes read-only helpers:
+- Exposes read helpers:
     • list_library_playlists(limit=...) -> list[PlaylistSummary]
     • get_playlist_tracks(playlist_id, limit=...) -> list[Track]
-- Maps external responses into core domain models (Track, Artist).
+    • iter_playlist_tracks(playlist_id, limit=..., page_size=...) -> Iterator[list[Track]]
+    • list_library_albums(limit=...) -> list[Album]
+    • list_library_artists(limit=...) -> list[Artist]
+- And playlist writes (never cached or coalesced):
+    • get_playlist_items(playlist_id) -> list[PlaylistItem] (fresh, with setVideoIds)
+    • edit_playlist_items(playlist_id, actions) -> one batched edit request
+    • write_back(playlist_id, video_ids, ...) -> WriteBackReport (see writeback.py)
+- Maps external responses into core domain models (Track, Artist), a page at a
+  time via `map_tracks` (one TypeAdapter call per page, rejects collected in bulk).
+- Caches responses on disk (see cache.py); pass refresh=True to bypass.
+- Optionally coalesces identical concurrent upstream calls (see singleflight.py).
 
 Env vars (see .env.example):
     YT_API_CLIENT_ID
     YT_API_CLIENT_SECRET
     YT_OAUTH_PATH (optional, defaults to .cache/ytmusic_oauth.json)
+    YT_CACHE_PATH (optional, defaults to cache/ytmusic_cache.sqlite)
+    YT_CACHE_DISABLED (optional, "1" turns the response cache off)
+    YT_BACKEND (optional, "fake" serves the offline stand-in from fake.py)
 """
 
 from __future__ import annotations
 
+import functools
 import logging
 import os
-from dataclasses import dataclass
+import time
+from collections import defaultdict
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, TypedDict
+from typing import TYPE_CHECKING, Any, TypedDict
 
-from dotenv import load_dotenv
-from sortune_core.models.playlist import Track
+from opentelemetry import trace
+from pydantic import TypeAdapter, ValidationError
+from sortune_core.models.playlist import Album, Artist, Track
 
-load_dotenv()
+from ..env import load_env
+from ..telemetry.metrics import YT_ERRORS, YT_SECONDS
+from .cache import ResponseCache, request_key
+from .fake import env_backend
+from .ratelimit import is_throttle_error
+from .singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from redis import Redis
+
+    from .ratelimit import AIMDRateLimiter
+    from .writeback import WriteBackReport
 
 log = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
 
 
 class PlaylistSummary(TypedDict, total=False):
@@ -37,6 +67,117 @@ class PlaylistSummary(TypedDict, total=False):
     thumbnails: list | None
 
 
+class PlaylistItem(TypedDict):
+    """One entry of a playlist; `setVideoId` identifies it for edits (moves, removals)."""
+
+    videoId: str
+    setVideoId: str
+
+
+@dataclass(frozen=True)
+class TrackReject:
+    index: int  # position in the raw page
+    title: str | None
+    reasons: list[str]
+
+
+@dataclass
+class TrackBatch:
+    tracks: list[Track] = field(default_factory=list)
+    rejects: list[TrackReject] = field(default_factory=list)
+
+
+_TRACK_LIST = TypeAdapter(list[Track])
+
+
+# Raw keys Track actually reads; everything else in a ytmusicapi track (thumbnails,
+# feedback tokens, ...) is dropped before validation, which roughly halves its cost
+_TRACK_KEYS = tuple(f.alias or name for name, f in Track.model_fields.items())
+
+
+def _project(t: dict[str, Any]) -> dict[str, Any]:
+    """Copy just the Track fields, with the fallbacks `_to_track` applies."""
+    out = {k: t[k] for k in _TRACK_KEYS if k in t}
+    if "videoId" not in out and "id" in t:
+        out["videoId"] = t["id"]
+    if out.get("inLibrary") is None:
+        out["inLibrary"] = False
+    return out
+
+
+def map_tracks(raw: Sequence[Any]) -> TrackBatch:
+    """
+    Map a page of ytmusicapi track dicts to Track models with one validation call.
+
+    Entries that cannot be mapped (most often unavailable tracks without a videoId)
+    are dropped and returned as rejects with their reasons; the raw dicts are not
+    mutated. The common rejects are screened out before validation so a page is
+    normally validated exactly once.
+    """
+    with tracer.start_as_current_span("ytmusic.map_tracks") as span:
+        batch = _map_tracks(raw)
+        span.set_attribute("sortune.tracks", len(batch.tracks))
+        span.set_attribute("sortune.rejects", len(batch.rejects))
+        return batch
+
+
+def _map_tracks(raw: Sequence[Any]) -> TrackBatch:
+    items: list[dict[str, Any]] = []
+    positions: list[int] = []
+    rejects: list[TrackReject] = []
+    for i, t in enumerate(raw):
+        if not isinstance(t, dict):
+            rejects.append(TrackReject(i, None, ["not a track object"]))
+        elif not isinstance(t.get("videoId", t.get("id")), str):
+            rejects.append(TrackReject(i, t.get("title"), ["videoId: missing"]))
+        else:
+            items.append(_project(t))
+            positions.append(i)
+
+    while True:
+        try:
+            tracks = _TRACK_LIST.validate_python(items)
+            break
+        except ValidationError as e:
+            reasons: dict[int, list[str]] = defaultdict(list)
+            for err in e.errors(include_url=False):
+                where = ".".join(str(p) for p in err["loc"][1:])
+                reasons[err["loc"][0]].append(f"{where}: {err['msg']}" if where else err["msg"])
+            for i in reasons:
+                rejects.append(TrackReject(positions[i], items[i].get("title"), reasons[i]))
+            items = [t for i, t in enumerate(items) if i not in reasons]
+            positions = [p for i, p in enumerate(positions) if i not in reasons]
+    rejects.sort(key=lambda r: r.index)
+    return TrackBatch(tracks, rejects)
+
+
+def _map_entities(model: type[Album] | type[Artist], raw: Sequence[Any]) -> list:
+    """Map library albums/artists through the models' unify validators."""
+    out = []
+    for item in raw:
+        try:
+            # The validators fill name/id in place; responses may be shared, so copy
+            out.append(model.model_validate(dict(item)))
+        except (TypeError, ValueError) as e:
+            log.warning("Skipping unmappable library %s: %s", model.__name__.lower(), e)
+    return out
+
+
+def _observed(endpoint: str, fn: Any, *args: Any, **kwargs: Any) -> Any:
+    """Call upstream in a span, recording its latency and (by kind) its failures."""
+    start = time.perf_counter()
+    with tracer.start_as_current_span(f"ytmusic.upstream.{endpoint}") as span:
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            kind = "throttled" if is_throttle_error(e) else "error"
+            YT_ERRORS.labels(endpoint=endpoint, kind=kind).inc()
+            span.set_attribute("sortune.error_kind", kind)
+            raise
+        finally:
+            YT_SECONDS.labels(endpoint=endpoint).observe(time.perf_counter() - start)
+
+
 @dataclass(frozen=True)
 class _Config:
     oauth_path: Path
@@ -57,23 +198,53 @@ class YTMusicClient:
         client_id: str | None = None,
         client_secret: str | None = None,
         open_browser: bool = True,
+        yt: Any | None = None,
+        cache: ResponseCache | None | bool = True,
+        session: Any | None = None,
+        flight: SingleFlight | None = None,
     ) -> None:
+        """
+        `yt` injects a ready ytmusicapi-compatible backend (tests, benchmarks);
+        with YT_BACKEND=fake the process-wide FakeYTMusic is used; otherwise the
+        real client is built lazily on first use, on `session` (a requests.Session
+        shared for keep-alive, see pool.py) if given.
+
+        `cache` is a ResponseCache, or True for the default on-disk cache (real
+        backend only; injected backends are never cached implicitly), or False/None.
+
+        `flight` shares upstream calls between concurrent identical requests, usually
+        across every client of a pool (see pool.py).
+        """
+        load_env()
         self._cfg = _Config(
             oauth_path=oauth_path or Path(os.getenv("YT_OAUTH_PATH", "cache/ytmusic_oauth.json")),
             client_id=client_id or os.getenv("YT_API_CLIENT_ID") or None,
             client_secret=client_secret or os.getenv("YT_API_CLIENT_SECRET") or None,
         )
         self._open_browser = open_browser
-        self._yt = None  # lazy
+        self._session = session
+        self._flight = flight
+        if yt is None and os.getenv("YT_BACKEND", "").strip().lower() == "fake":
+            yt = env_backend()
+        self._yt = yt  # lazy unless injected
+        if cache is True:
+            cache = _default_cache() if yt is None else None
+        self._cache: ResponseCache | None = cache or None
+        # Digest of the cached upstream response behind the last read (None if uncached);
+        # a stable version for anything derived from it, e.g. an HTTP ETag
+        self.last_version: str | None = None
+        # Entries in the playlist behind the last `iter_playlist_tracks` (for progress/ETA)
+        self.last_track_total: int | None = None
 
     # ---------- Public API ----------
 
-    def list_library_playlists(self, limit: int = 200) -> list[PlaylistSummary]:
+    def list_library_playlists(
+        self, limit: int = 200, *, refresh: bool = False
+    ) -> list[PlaylistSummary]:
         """
         Return the user's library playlists (summary list).
         """
-        yt = self._yt_client()
-        items = yt.get_library_playlists(limit=limit)
+        items = self._call("get_library_playlists", refresh=refresh, limit=limit)
         out: list[PlaylistSummary] = []
         for p in items:
             out.append(
@@ -87,20 +258,149 @@ class YTMusicClient:
             )
         return out
 
-    def get_playlist_tracks(self, playlist_id: str, limit: int | None = None) -> list[Track]:
+    def get_playlist_tracks(
+        self, playlist_id: str, limit: int | None = None, *, refresh: bool = False
+    ) -> list[Track]:
         """
         Return tracks for a playlist, mapped to core Track/Artist models.
         """
+        return [
+            t
+            for page in self.iter_playlist_tracks(playlist_id, limit, refresh=refresh)
+            for t in page
+        ]
+
+    def iter_playlist_tracks(
+        self,
+        playlist_id: str,
+        limit: int | None = None,
+        *,
+        page_size: int = 500,
+        refresh: bool = False,
+    ) -> Iterator[list[Track]]:
+        """
+        Yield a playlist's tracks in pages of up to `page_size` mapped Track models.
+
+        ytmusicapi follows the playlist's continuations inside one `get_playlist` call,
+        so the raw response arrives whole; mapping is deferred page by page, so callers
+        that persist pages as they arrive (see RedisPlaylistRepo.open_stream) never hold
+        the full list of mapped models.
+        """
+        raw = self._call("get_playlist", refresh=refresh, playlistId=playlist_id, limit=limit)
+        items = raw.get("tracks", []) or []
+        self.last_track_total = len(items)
+        for start in range(0, len(items), page_size):
+            batch = map_tracks(items[start : start + page_size])
+            if batch.rejects:
+                first = batch.rejects[0]
+                log.warning(
+                    "Skipped %d unmappable track(s) in %s (first: %r, %s)",
+                    len(batch.rejects),
+                    playlist_id,
+                    first.title,
+                    "; ".join(first.reasons),
+                )
+            if batch.tracks:
+                yield batch.tracks
+
+    def library_playlists_version(self, limit: int = 200) -> str | None:
+        """
+        Version `list_library_playlists(limit)` would be served with from the cache
+        without going upstream, or None. Cheap enough to check before every call.
+        """
+        return self._fresh_version("get_library_playlists", limit=limit)
+
+    def playlist_version(self, playlist_id: str, limit: int | None = None) -> str | None:
+        """Like `library_playlists_version`, for `get_playlist_tracks(playlist_id, limit)`."""
+        return self._fresh_version("get_playlist", playlistId=playlist_id, limit=limit)
+
+    def list_library_albums(self, limit: int = 200, *, refresh: bool = False) -> list[Album]:
+        """Return the user's saved albums (entries that cannot be mapped are skipped)."""
+        raw = self._call("get_library_albums", refresh=refresh, limit=limit) or []
+        return _map_entities(Album, raw)
+
+    def list_library_artists(self, limit: int = 200, *, refresh: bool = False) -> list[Artist]:
+        """Return the user's library artists (entries that cannot be mapped are skipped)."""
+        raw = self._call("get_library_artists", refresh=refresh, limit=limit) or []
+        return _map_entities(Artist, raw)
+
+    def get_playlist_items(self, playlist_id: str) -> list[PlaylistItem]:
+        """
+        Return a playlist's current entries straight from upstream (edits need fresh
+        setVideoIds), never a coalesced read from before an edit. Refreshes the cache
+        entry of a full `get_playlist_tracks` read, so that read sees the edits too.
+        """
+        raw = self._call(
+            "get_playlist", refresh=True, coalesce=False, playlistId=playlist_id, limit=None
+        )
+        return [
+            PlaylistItem(videoId=t["videoId"], setVideoId=t["setVideoId"])
+            for t in raw.get("tracks", []) or []
+            if t.get("videoId") and t.get("setVideoId")
+        ]
+
+    def edit_playlist_items(
+        self, playlist_id: str, actions: Sequence[dict[str, Any]]
+    ) -> list[PlaylistItem]:
+        """
+        Apply a batch of playlist edit actions (ACTION_MOVE_VIDEO_BEFORE,
+        ACTION_ADD_VIDEO, ACTION_REMOVE_VIDEO) in one request; returns the added items.
+
+        ytmusicapi's `edit_playlist` sends one move per request, but the endpoint behind
+        it takes any number of actions, so batches go to it directly.
+        """
+        body = {"playlistId": playlist_id.removeprefix("VL"), "actions": list(actions)}
         yt = self._yt_client()
-        raw = yt.get_playlist(playlistId=playlist_id, limit=limit)
-        tracks = raw.get("tracks", []) or []
-        out: list[Track] = []
-        for t in tracks:
-            try:
-                out.append(self._to_track(t))
-            except Exception:
-                log.warning("Skipping track with missing videoId: %s", t.get("title"))
-        return out
+        response = _observed("edit_playlist", yt._send_request, "browse/edit_playlist", body)
+        status = response.get("status", "")
+        if "SUCCEEDED" not in status:
+            raise RuntimeError(f"Playlist edit failed for {playlist_id}: {status or response}")
+        added = (
+            r.get("playlistEditVideoAddedResultData") or {}
+            for r in response.get("playlistEditResults", [])
+        )
+        return [
+            PlaylistItem(videoId=a["videoId"], setVideoId=a["setVideoId"])
+            for a in added
+            if a.get("setVideoId")
+        ]
+
+    def write_back(
+        self,
+        playlist_id: str,
+        video_ids: Sequence[str],
+        *,
+        dry_run: bool = False,
+        checkpoints: Redis | None = None,
+        limiter: AIMDRateLimiter | None = None,
+        batch_size: int = 100,
+    ) -> WriteBackReport:
+        """
+        Make the upstream playlist hold `video_ids` in this order: removals, adds and
+        a minimal set of moves, batched and rate limited. With `checkpoints` (Redis)
+        an interrupted run resumes where it stopped. See writeback.py.
+        """
+        from .writeback import PlaylistWriteBack
+
+        return PlaylistWriteBack(
+            self, checkpoints=checkpoints, limiter=limiter, batch_size=batch_size
+        ).run(playlist_id, video_ids, dry_run=dry_run)
+
+    def refresh_token(self, margin: float = 300.0) -> bool:
+        """
+        Refresh the OAuth access token if it expires within `margin` seconds.
+        ytmusicapi only refreshes inside a request, once the token is under a minute
+        from expiry; calling this ahead of time keeps that cost off the request path.
+        Returns True if a refresh happened (never for injected or unbuilt clients).
+        """
+        token = getattr(self._yt, "_token", None)
+        if token is None or not hasattr(token, "credentials"):
+            return False
+        if token.expires_at - time.time() > margin:
+            return False
+        token.update(token.credentials.refresh_token(token.refresh_token))
+        token.store_token()
+        return True
 
     # Backward-compat demo data used elsewhere in the repo
     def sample_tracks(self) -> list[Track]:
@@ -125,6 +425,36 @@ class YTMusicClient:
 
     # ---------- Internals ----------
 
+    def _call(
+        self, endpoint: str, *, refresh: bool = False, coalesce: bool = True, **kwargs: Any
+    ) -> Any:
+        """
+        Invoke a ytmusicapi endpoint through the response cache and the
+        single-flight layer (each if enabled). `coalesce=False` skips the latter.
+        """
+
+        def upstream() -> Any:
+            return _observed(endpoint, getattr(self._yt_client(), endpoint), **kwargs)
+
+        def fetch() -> Any:
+            if self._flight is None or not coalesce:
+                return upstream()
+            return self._flight.do(request_key(endpoint, kwargs), upstream)
+
+        # Cache hits show up as spans without an `ytmusic.upstream.*` child
+        with tracer.start_as_current_span(
+            f"ytmusic.{endpoint}", attributes={"sortune.refresh": refresh}
+        ):
+            if self._cache is None:
+                self.last_version = None
+                return fetch()
+            entry = self._cache.get_or_fetch_entry(endpoint, kwargs, fetch, refresh=refresh)
+            self.last_version = entry.digest
+            return entry.value
+
+    def _fresh_version(self, endpoint: str, **kwargs: Any) -> str | None:
+        return None if self._cache is None else self._cache.fresh_digest(endpoint, kwargs)
+
     def _yt_client(self):
         """
         Lazy-initialize and return the underlying ytmusicapi client.
@@ -148,8 +478,11 @@ class YTMusicClient:
         # Instantiate client from saved oauth json
         self._yt = YTMusic(
             str(self._cfg.oauth_path),
+            requests_session=self._session,
             oauth_credentials=OAuthCredentials(
-                client_id=self._cfg.client_id, client_secret=self._cfg.client_secret
+                client_id=self._cfg.client_id,
+                client_secret=self._cfg.client_secret,
+                session=self._session,
             ),
         )
         return self._yt
@@ -199,3 +532,15 @@ class YTMusicClient:
         if t.get("inLibrary") is None:
             t["inLibrary"] = False
         return Track.model_validate(t)
+
+
+def _default_cache() -> ResponseCache | None:
+    if os.getenv("YT_CACHE_DISABLED", "").strip().lower() in ("1", "true", "yes"):
+        return None
+    return _shared_cache(os.getenv("YT_CACHE_PATH", "cache/ytmusic_cache.sqlite"))
+
+
+@functools.cache
+def _shared_cache(path: str) -> ResponseCache:
+    # One cache (SQLite connection + refresh threads) per file, per process
+    return ResponseCache(Path(path))
@@ -0,0 +1,381 @@
+"""
+Offline stand-in for ytmusicapi.YTMusic, for benchmarks and resilience tests.
+
+FakeYTMusic answers the read endpoints YTMusicClient uses with responses shaped
+like the real ones (see the *_data_example.json files at the repo root). Library
+size, playlist sizes, per-call latency, a requests/second quota (HTTP 429 past
+it) and a random error rate (HTTP 500) are all configurable; everything is
+deterministic for a given seed.
+
+Playlist edits (moves, adds, removals; single or batched through the
+`browse/edit_playlist` endpoint) are applied to an in-memory copy, so later
+reads see them.
+
+Responses are synthetic by default. Point `fixtures` at a directory of recorded
+responses to serve those instead:
+    playlist_data_example.json   library playlists (get_library_playlists)
+    track_data_example.json      track templates cycled to fill playlists
+    album_data_example.json      library albums
+    artist_data_example.json     library artists
+    playlists/<playlistId>.json  full get_playlist responses, served verbatim
+
+YTMusicClient targets it with `YTMusicClient(yt=FakeYTMusic(...))`, or with
+YT_BACKEND=fake so the API, worker and UI run offline unchanged:
+    YT_FAKE_PLAYLISTS, YT_FAKE_TRACKS, YT_FAKE_LATENCY, YT_FAKE_QUOTA,
+    YT_FAKE_ERROR_RATE, YT_FAKE_SEED, YT_FAKE_FIXTURES
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+_THUMBS = [
+    {"url": "https://lh3.googleusercontent.com/fake=w60-h60-l90-rj", "width": 60, "height": 60},
+    {"url": "https://lh3.googleusercontent.com/fake=w120-h120-l90-rj", "width": 120, "height": 120},
+]
+_OWNER = {"name": "Sortune Fake", "id": "UCfakeowner000000000000"}
+
+
+class FakeUpstreamError(Exception):
+    """Raised the way ytmusicapi surfaces HTTP errors (status code in the message)."""
+
+
+class FakeYTMusic:
+    def __init__(
+        self,
+        playlists: int = 50,
+        tracks: int | Sequence[int] = 100,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        quota_per_sec: float | None = None,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        fixtures: Path | str | None = None,
+    ):
+        """
+        `tracks` is the size of every playlist, or a sequence of sizes cycled across
+        playlists. `latency` (+ uniform `jitter`) is slept on every call; calls past
+        `quota_per_sec` within a sliding second fail with HTTP 429, and a further
+        `error_rate` share fail with HTTP 500.
+        """
+        self.n_playlists = playlists
+        self.sizes = [tracks] if isinstance(tracks, int) else list(tracks)
+        self.latency = latency
+        self.jitter = jitter
+        self.quota = quota_per_sec
+        self.error_rate = error_rate
+        self.seed = seed
+        self.calls: Counter[str] = Counter()
+        self.throttled = 0
+        self.errors = 0
+        self.added = 0
+        self._window: deque[float] = deque()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self._recorded_library: list[dict] | None = None
+        self._recorded_playlists: dict[str, Path] = {}
+        self._track_templates: list[dict] = [_synthetic_track_template()]
+        self._albums: list[dict] | None = None
+        self._artists: list[dict] | None = None
+        self._edited: dict[str, dict] = {}  # playlists changed through edit calls
+        if fixtures is not None:
+            self._load_fixtures(Path(fixtures))
+
+    @classmethod
+    def from_env(cls) -> FakeYTMusic:
+        quota = os.getenv("YT_FAKE_QUOTA")
+        sizes = [int(s) for s in os.getenv("YT_FAKE_TRACKS", "100").split(",")]
+        return cls(
+            int(os.getenv("YT_FAKE_PLAYLISTS", "50")),
+            sizes,
+            latency=float(os.getenv("YT_FAKE_LATENCY", "0")),
+            quota_per_sec=float(quota) if quota else None,
+            error_rate=float(os.getenv("YT_FAKE_ERROR_RATE", "0")),
+            seed=int(os.getenv("YT_FAKE_SEED", "0")),
+            fixtures=os.getenv("YT_FAKE_FIXTURES") or None,
+        )
+
+    # ---------- ytmusicapi surface ----------
+
+    def get_library_playlists(self, limit: int | None = 25) -> list[dict]:
+        self._upstream("get_library_playlists")
+        return self._library()[:limit]
+
+    def get_playlist(
+        self, playlistId: str, limit: int | None = 100, related: bool = False, **_: Any
+    ) -> dict:
+        self._upstream("get_playlist")
+        if playlistId in self._edited:
+            response = dict(self._edited[playlistId])
+            response["tracks"] = [dict(t) for t in response["tracks"][:limit]]
+            return response
+        return self._playlist(playlistId, limit)
+
+    def edit_playlist(self, playlistId: str, moveItem: str | tuple | None = None, **_: Any):
+        action: dict[str, Any] = {"action": "ACTION_MOVE_VIDEO_BEFORE"}
+        if isinstance(moveItem, tuple):
+            action["setVideoId"], action["movedSetVideoIdSuccessor"] = moveItem
+        else:
+            action["setVideoId"] = moveItem
+        return self._send_request(
+            "browse/edit_playlist",
+            {"playlistId": playlistId, "actions": [action] if moveItem else []},
+        )["status"]
+
+    def add_playlist_items(
+        self, playlistId: str, videoIds: list[str] | None = None, duplicates: bool = False, **_: Any
+    ) -> dict:
+        actions = [{"action": "ACTION_ADD_VIDEO", "addedVideoId": v} for v in videoIds or ()]
+        return self._send_request(
+            "browse/edit_playlist", {"playlistId": playlistId, "actions": actions}
+        )
+
+    def remove_playlist_items(self, playlistId: str, videos: list[dict]) -> str:
+        actions = [
+            {
+                "action": "ACTION_REMOVE_VIDEO",
+                "setVideoId": v["setVideoId"],
+                "removedVideoId": v["videoId"],
+            }
+            for v in videos
+        ]
+        return self._send_request(
+            "browse/edit_playlist", {"playlistId": playlistId, "actions": actions}
+        )["status"]
+
+    def _send_request(self, endpoint: str, body: dict) -> dict:
+        """The raw endpoint ytmusicapi's edit helpers call; takes any number of actions."""
+        if endpoint != "browse/edit_playlist":
+            raise FakeUpstreamError(f"Server returned HTTP 404: Not Found ({endpoint})")
+        self._upstream("edit_playlist")
+        playlist_id = body["playlistId"]
+        with self._lock:
+            playlist = self._edited.get(playlist_id) or self._playlist(playlist_id, None)
+            # Applied to a copy: a failing action rejects the whole request
+            tracks: list[dict] = list(playlist["tracks"])
+            results = [self._apply(playlist_id, tracks, a) for a in body.get("actions", [])]
+            self._edited[playlist_id] = {**playlist, "tracks": tracks, "trackCount": len(tracks)}
+        return {"status": "STATUS_SUCCEEDED", "playlistEditResults": [r for r in results if r]}
+
+    # ---------- Internals ----------
+
+    def _apply(self, playlist_id: str, tracks: list[dict], action: dict) -> dict | None:
+        def position(set_video_id: str) -> int:
+            for i, t in enumerate(tracks):
+                if t.get("setVideoId") == set_video_id:
+                    return i
+            raise FakeUpstreamError(f"Server returned HTTP 400: Bad Request ({set_video_id})")
+
+        kind = action.get("action")
+        if kind == "ACTION_REMOVE_VIDEO":
+            del tracks[position(action["setVideoId"])]
+        elif kind == "ACTION_MOVE_VIDEO_BEFORE":
+            moved = tracks.pop(position(action["setVideoId"]))
+            successor = action.get("movedSetVideoIdSuccessor")
+            tracks.insert(position(successor) if successor else len(tracks), moved)
+        elif kind == "ACTION_ADD_VIDEO":
+            self.added += 1
+            track = self._track(playlist_id, 0)
+            track.update(
+                videoId=action["addedVideoId"],
+                title=f"Added {action['addedVideoId']}",
+                setVideoId=_digest(f"added:{playlist_id}:{self.added}:{self.seed}")[:16].upper(),
+            )
+            tracks.append(track)
+            return {
+                "playlistEditVideoAddedResultData": {
+                    "videoId": track["videoId"],
+                    "setVideoId": track["setVideoId"],
+                }
+            }
+        else:
+            raise FakeUpstreamError(f"Server returned HTTP 400: Bad Request ({kind})")
+        return None
+
+    def _playlist(self, playlistId: str, limit: int | None) -> dict:
+        if playlistId in self._recorded_playlists:
+            with self._recorded_playlists[playlistId].open(encoding="utf-8") as fh:
+                response = json.load(fh)
+            response["tracks"] = response.get("tracks", [])[:limit]
+            return response
+
+        summary = self._summary(playlistId)
+        if summary is None:
+            raise FakeUpstreamError(f"Server returned HTTP 404: Not Found ({playlistId})")
+        total = _count(summary) or 0
+        n = total if limit is None else min(limit, total)
+        return {
+            "owned": True,
+            "id": playlistId,
+            "privacy": "PRIVATE",
+            "title": summary.get("title"),
+            "description": summary.get("description"),
+            "thumbnails": summary.get("thumbnails") or _THUMBS,
+            "author": (summary.get("author") or [_OWNER])[0],
+            "year": "2024",
+            "trackCount": total,
+            "duration_seconds": 0,
+            "related": [],
+            "tracks": [self._track(playlistId, j) for j in range(n)],
+        }
+
+    def get_library_albums(self, limit: int | None = 25, order: str | None = None) -> list[dict]:
+        self._upstream("get_library_albums")
+        if self._albums is not None:
+            return self._albums[:limit]
+        n = self.n_playlists if limit is None else min(limit, self.n_playlists)
+        return [_synthetic_album(i) for i in range(n)]
+
+    def get_library_artists(self, limit: int | None = 25, order: str | None = None) -> list[dict]:
+        self._upstream("get_library_artists")
+        if self._artists is not None:
+            return self._artists[:limit]
+        n = self.n_playlists if limit is None else min(limit, self.n_playlists)
+        return [_synthetic_artist(i) for i in range(n)]
+
+    def _upstream(self, endpoint: str) -> None:
+        """Account for one call: latency, then quota and injected failures."""
+        with self._lock:
+            self.calls[endpoint] += 1
+            now = time.monotonic()
+            while self._window and now - self._window[0] >= 1.0:
+                self._window.popleft()
+            over_quota = self.quota is not None and len(self._window) >= self.quota
+            self._window.append(now)
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            failed = not over_quota and self.error_rate > 0 and self._rng.random() < self.error_rate
+            self.throttled += over_quota
+            self.errors += failed
+        if delay > 0:
+            time.sleep(delay)
+        if over_quota:
+            raise FakeUpstreamError("Server returned HTTP 429: Too Many Requests.")
+        if failed:
+            raise FakeUpstreamError("Server returned HTTP 500: Internal Server Error.")
+
+    def _library(self) -> list[dict]:
+        if self._recorded_library is not None:
+            return self._recorded_library
+        return [self._synthetic_summary(i) for i in range(self.n_playlists)]
+
+    def _summary(self, playlist_id: str) -> dict | None:
+        if self._recorded_library is not None:
+            for summary in self._recorded_library:
+                if summary.get("playlistId") == playlist_id:
+                    return summary if _count(summary) is not None else {**summary, "count": "100"}
+            return None
+        if playlist_id.startswith("PLfake") and playlist_id[6:].isdigit():
+            i = int(playlist_id[6:])
+            return self._synthetic_summary(i) if i < self.n_playlists else None
+        return None
+
+    def _synthetic_summary(self, i: int) -> dict:
+        size = self.sizes[i % len(self.sizes)]
+        return {
+            "title": f"Fake Playlist {i}",
+            "playlistId": f"PLfake{i:05d}",
+            "thumbnails": _THUMBS,
+            "description": f"{_OWNER['name']} • {size} tracks",
+            "count": str(size),
+            "author": [_OWNER],
+        }
+
+    def _track(self, playlist_id: str, j: int) -> dict:
+        template = self._track_templates[j % len(self._track_templates)]
+        # Stable per (playlist, position) so refetches return identical content
+        salt = f"{playlist_id}:{j}:{self.seed}"
+        track = dict(template)
+        track.update(
+            videoId=f"v{_digest(salt)[:10]}",
+            title=f"{template.get('title', 'Track')} #{j}",
+            setVideoId=_digest("set" + salt)[:16].upper(),
+            feedbackTokens={"add": f"add-{salt}", "remove": f"remove-{salt}"},
+        )
+        return track
+
+    def _load_fixtures(self, root: Path) -> None:
+        def read(name: str) -> list[dict] | None:
+            path = root / name
+            if not path.exists():
+                return None
+            with path.open(encoding="utf-8") as fh:
+                return json.load(fh)
+
+        self._recorded_library = read("playlist_data_example.json")
+        self._track_templates = read("track_data_example.json") or self._track_templates
+        self._albums = read("album_data_example.json")
+        self._artists = read("artist_data_example.json")
+        if (root / "playlists").is_dir():
+            self._recorded_playlists = {p.stem: p for p in (root / "playlists").glob("*.json")}
+
+
+def _count(summary: dict) -> int | None:
+    try:
+        return int(str(summary.get("count")).replace(",", ""))
+    except ValueError:
+        return None
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+
+
+def _synthetic_track_template() -> dict:
+    return {
+        "videoId": "v0000000000",
+        "title": "Fake Track",
+        "artists": [{"name": "Fake Artist", "id": "UCfakeartist0000000000"}],
+        "album": {"name": "Fake Album", "id": "MPREb_fakealbum"},
+        "likeStatus": "INDIFFERENT",
+        "inLibrary": False,
+        "thumbnails": _THUMBS,
+        "isAvailable": True,
+        "isExplicit": False,
+        "videoType": "MUSIC_VIDEO_TYPE_ATV",
+        "views": None,
+        "duration": "3:22",
+        "duration_seconds": 202,
+        "setVideoId": "0000000000000000",
+        "feedbackTokens": {"add": "add", "remove": "remove"},
+    }
+
+
+def _synthetic_album(i: int) -> dict:
+    return {
+        "browseId": f"MPREb_fake{i:05d}",
+        "playlistId": f"OLAK5uy_fake{i:05d}",
+        "title": f"Fake Album {i}",
+        "thumbnails": _THUMBS,
+        "type": "Album",
+        "artists": [{"name": f"Fake Artist {i % 7}", "id": f"UCfake{i % 7:05d}"}],
+        "year": str(2000 + i % 25),
+    }
+
+
+def _synthetic_artist(i: int) -> dict:
+    return {
+        "browseId": f"MPLAUCfake{i:05d}",
+        "artist": f"Fake Artist {i}",
+        "shuffleId": f"RDAOfake{i:05d}",
+        "radioId": f"RDEMfake{i:05d}",
+        "subscribers": str(i * 1000),
+        "thumbnails": _THUMBS,
+    }
+
+
+@functools.cache
+def env_backend() -> FakeYTMusic:
+    """The process-wide fake used when YT_BACKEND=fake."""
+    return FakeYTMusic.from_env()
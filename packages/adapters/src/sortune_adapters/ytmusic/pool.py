@@ -0,0 +1,172 @@
+"""
+Process-wide pool of long-lived YTMusicClient instances.
+
+Building a client per request re-reads the OAuth file and opens a fresh HTTP
+session for every call. The pool keeps a few authenticated clients around, all
+sharing one keep-alive `requests.Session`, and refreshes their OAuth access tokens
+in a background thread before they expire so requests never pay for a refresh.
+All clients share one SingleFlight, so identical concurrent calls (e.g. two users
+opening the same playlist) reach YouTube Music once; with REDIS_URL set, this
+also spans the API and worker processes. `pool.limiter` is the process's AIMD rate
+limiter, which imports, syncs and write-backs use unless given their own.
+
+    pool = get_client_pool()
+    with pool.client() as client:
+        client.list_library_playlists()
+
+Env vars (see .env.example):
+    YT_CLIENT_POOL_SIZE (optional, defaults to 4)
+    YT_SINGLEFLIGHT_TTL (optional, seconds a shared result is reused, defaults to 2)
+    REDIS_URL (optional, enables cross-process coalescing)
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import os
+import queue
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+import requests
+from redis import Redis
+from requests.adapters import HTTPAdapter
+
+from ..env import load_env
+from .client import YTMusicClient
+from .ratelimit import AIMDRateLimiter, shared_limiter
+from .singleflight import DEFAULT_RESULT_TTL, SingleFlight
+
+log = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 4
+# How often the refresher wakes, and how close to expiry a token gets refreshed
+DEFAULT_REFRESH_INTERVAL = 60.0
+DEFAULT_REFRESH_MARGIN = 5 * 60.0
+
+
+class YTMusicClientPool:
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        *,
+        factory: Callable[[requests.Session], YTMusicClient] | None = None,
+        flight: SingleFlight | None = None,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        acquire_timeout: float | None = 30.0,
+    ):
+        """
+        `factory` builds one client bound to the shared session (defaults to
+        `YTMusicClient(session=session, flight=flight)`); clients are created lazily,
+        up to `size`, and handed out to one caller at a time.
+        """
+        if size < 1:
+            raise ValueError("size must be >= 1")
+        self.size = size
+        self.refresh_interval = refresh_interval
+        self.refresh_margin = refresh_margin
+        self.acquire_timeout = acquire_timeout
+        self.flight = flight
+        self._factory = factory or (
+            lambda session: YTMusicClient(session=session, flight=self.flight)
+        )
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=size, pool_maxsize=size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._idle: queue.LifoQueue[YTMusicClient] = queue.LifoQueue()
+        self._clients: list[YTMusicClient] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresher: threading.Thread | None = None
+
+    # ---------- Public API ----------
+
+    @contextmanager
+    def client(self) -> Iterator[YTMusicClient]:
+        """Check out a client for the duration of the block."""
+        client = self._acquire()
+        try:
+            yield client
+        finally:
+            self._idle.put(client)
+
+    def refresh_tokens(self) -> int:
+        """Refresh every pooled client's token that is close to expiry; returns how many."""
+        with self._lock:
+            clients = list(self._clients)
+        refreshed = 0
+        for client in clients:
+            try:
+                refreshed += client.refresh_token(self.refresh_margin)
+            except Exception:
+                # The request path refreshes on demand anyway; try again next round
+                log.warning("Background YouTube Music token refresh failed", exc_info=True)
+        return refreshed
+
+    def start(self) -> YTMusicClientPool:
+        """Start the background token refresher (idempotent)."""
+        with self._lock:
+            if self._refresher is None:
+                self._stop.clear()
+                self._refresher = threading.Thread(
+                    target=self._refresh_loop, name="yt-token-refresh", daemon=True
+                )
+                self._refresher.start()
+        return self
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout=5)
+            self._refresher = None
+        self.session.close()
+
+    @property
+    def limiter(self) -> AIMDRateLimiter:
+        return shared_limiter()
+
+    @property
+    def created(self) -> int:
+        return len(self._clients)
+
+    # ---------- Internals ----------
+
+    def _acquire(self) -> YTMusicClient:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._clients) < self.size:
+                client = self._factory(self.session)
+                self._clients.append(client)
+                return client
+        try:
+            return self._idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"No YouTube Music client free after {self.acquire_timeout}s "
+                f"(pool size {self.size}; raise YT_CLIENT_POOL_SIZE?)"
+            ) from None
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            self.refresh_tokens()
+
+
+@functools.cache
+def get_client_pool() -> YTMusicClientPool:
+    """The process-wide pool (sized by YT_CLIENT_POOL_SIZE), started on first use."""
+    load_env()
+    size = int(os.getenv("YT_CLIENT_POOL_SIZE", str(DEFAULT_POOL_SIZE)))
+    redis_url = os.getenv("REDIS_URL")
+    flight = SingleFlight(
+        Redis.from_url(redis_url) if redis_url else None,
+        result_ttl=float(os.getenv("YT_SINGLEFLIGHT_TTL", str(DEFAULT_RESULT_TTL))),
+    )
+    return YTMusicClientPool(size, flight=flight).start()
@@ -0,0 +1,115 @@
+"""
+Client-side rate limiting for YouTube Music calls.
+
+- TokenBucket: thread-safe token bucket (steady `rate` per second, bursts up to `burst`).
+- AIMDRateLimiter: token bucket whose rate adapts like TCP congestion control —
+  additive increase after each success, multiplicative decrease on throttling.
+- shared_limiter(): the process's AIMDRateLimiter, used by imports, syncs and
+  write-backs unless they are given their own, so a 429 seen by one slows them all.
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+
+
+def is_throttle_error(exc: BaseException) -> bool:
+    """True for upstream throttling (HTTP 429 / quota) responses from ytmusicapi."""
+    msg = str(exc).lower()
+    return "429" in msg or "too many requests" in msg or "rate limit" in msg or "quota" in msg
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self._rate = float(rate)
+        self._burst = max(1, burst)
+        self._tokens = float(self._burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def set_rate(self, rate: float) -> None:
+        with self._lock:
+            self._refill()
+            self._rate = rate
+
+    def acquire(self) -> float:
+        """Block until a token is available. Returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self._rate
+            time.sleep(delay)
+            waited += delay
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+
+class AIMDRateLimiter:
+    """
+    Adaptive limiter shared by concurrent workers.
+
+    Each success raises the rate by `increase` req/s (up to `max_rate`); each throttle
+    multiplies it by `decrease` (down to `min_rate`). Throttles arriving within one
+    `cooldown` window count once, so a burst of 429s from in-flight calls does not
+    collapse the rate to the floor.
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        *,
+        min_rate: float = 0.5,
+        max_rate: float = 20.0,
+        increase: float = 0.5,
+        decrease: float = 0.5,
+        burst: int = 4,
+        cooldown: float = 1.0,
+    ):
+        self.bucket = TokenBucket(rate, burst=burst)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self._last_cut = float("-inf")
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    def acquire(self) -> float:
+        return self.bucket.acquire()
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.bucket.set_rate(min(self.max_rate, self.bucket.rate + self.increase))
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_cut < self.cooldown:
+                return
+            self._last_cut = now
+            self.bucket.set_rate(max(self.min_rate, self.bucket.rate * self.decrease))
+
+
+@functools.cache
+def shared_limiter() -> AIMDRateLimiter:
+    """The process-wide limiter (also `get_client_pool().limiter`)."""
+    return AIMDRateLimiter()
@@ -0,0 +1,175 @@
+"""
+Request coalescing ("single-flight") for identical upstream calls.
+
+Concurrent callers asking for the same key share one in-flight fetch: inside a
+process through a Future, and across processes (API workers, RQ jobs) through a
+Redis lock plus a short-lived shared result. A finished result is reused for
+`result_ttl` seconds, which also absorbs UI double-fires. Failures are never
+shared past the callers already waiting on them.
+
+Results are handed to every caller as the same object (in-process) or decoded
+from JSON (cross-process), so they must be JSON-serializable and treated as
+read-only.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any
+
+from redis import Redis
+from redis.exceptions import RedisError, WatchError
+
+log = logging.getLogger(__name__)
+
+DEFAULT_RESULT_TTL = 2.0
+DEFAULT_LOCK_TTL = 60.0
+_SWEEP_AT = 256  # finished flights kept before expired ones are swept
+
+
+@dataclass
+class _Flight:
+    future: Future
+    expires: float | None = None  # None while the fetch is still running
+
+
+class SingleFlight:
+    def __init__(
+        self,
+        redis: Redis | None = None,
+        *,
+        result_ttl: float = DEFAULT_RESULT_TTL,
+        lock_ttl: float = DEFAULT_LOCK_TTL,
+        wait_timeout: float = DEFAULT_LOCK_TTL,
+        poll_interval: float = 0.05,
+        prefix: str = "singleflight",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.redis = redis
+        self.result_ttl = result_ttl
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.prefix = prefix
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._flights: dict[str, _Flight] = {}
+        self.calls = 0  # fetches actually run by this process
+        self.shared = 0  # callers served by someone else's fetch
+
+    def do(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """Return `fetch()`, sharing the call with concurrent (or very recent) identical ones."""
+        with self._lock:
+            now = self._clock()
+            flight = self._flights.get(key)
+            if flight is not None and (flight.expires is None or flight.expires > now):
+                self.shared += 1
+                leader = False
+            else:
+                if len(self._flights) >= _SWEEP_AT:
+                    self._sweep(now)
+                flight = self._flights[key] = _Flight(Future())
+                leader = True
+
+        if not leader:
+            return flight.future.result(timeout=self.wait_timeout)
+
+        try:
+            value = self._across_processes(key, fetch)
+        except BaseException as e:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.future.set_exception(e)
+            raise
+        flight.future.set_result(value)
+        with self._lock:
+            if self.result_ttl > 0:
+                flight.expires = self._clock() + self.result_ttl
+            else:
+                self._flights.pop(key, None)
+        return value
+
+    # ---------- Internals ----------
+
+    def _across_processes(self, key: str, fetch: Callable[[], Any]) -> Any:
+        if self.redis is None:
+            return self._run(fetch)
+        try:
+            return self._coordinate(key, fetch)
+        except RedisError as e:
+            # Coalescing is an optimization; never fail a fetch because Redis is down
+            log.warning("Single-flight coordination unavailable (%s); fetching directly", e)
+            return self._run(fetch)
+
+    def _coordinate(self, key: str, fetch: Callable[[], Any]) -> Any:
+        lock_key = f"{self.prefix}:lock:{key}"
+        result_key = f"{self.prefix}:result:{key}"
+        deadline = self._clock() + self.wait_timeout
+        while True:
+            raw = self.redis.get(result_key)
+            if raw is not None:
+                self.shared += 1
+                return json.loads(raw)
+            token = uuid.uuid4().hex
+            if self.redis.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000)):
+                try:
+                    # The previous holder may have published and released in between
+                    raw = self.redis.get(result_key)
+                    if raw is not None:
+                        self.shared += 1
+                        return json.loads(raw)
+                    value = self._run(fetch)
+                    self._publish(result_key, value)
+                    return value
+                finally:
+                    self._release(lock_key, token)
+            if self._clock() >= deadline:
+                log.warning("Gave up waiting for another process to fetch %s", key)
+                return self._run(fetch)
+            time.sleep(self.poll_interval)
+
+    def _run(self, fetch: Callable[[], Any]) -> Any:
+        self.calls += 1
+        return fetch()
+
+    def _publish(self, result_key: str, value: Any) -> None:
+        if self.result_ttl <= 0:
+            return
+        try:
+            payload = json.dumps(value)
+        except (TypeError, ValueError):
+            return  # not shareable across processes; in-process callers still get it
+        try:
+            self.redis.set(result_key, payload, px=max(1, int(self.result_ttl * 1000)))
+        except RedisError as e:
+            log.warning("Could not share single-flight result: %s", e)
+
+    def _release(self, lock_key: str, token: str) -> None:
+        # Delete the lock only if it is still ours (it may have expired and been retaken)
+        with self.redis.pipeline() as pipe:
+            try:
+                pipe.watch(lock_key)
+                current = pipe.get(lock_key)
+                if isinstance(current, bytes):
+                    current = current.decode()
+                if current == token:
+                    pipe.multi()
+                    pipe.delete(lock_key)
+                    pipe.execute()
+                else:
+                    pipe.unwatch()
+            except WatchError:
+                pass
+            except RedisError as e:
+                log.warning("Could not release single-flight lock (expires on its own): %s", e)
+
+    def _sweep(self, now: float) -> None:
+        for key in [k for k, f in self._flights.items() if f.expires and f.expires <= now]:
+            del self._flights[key]
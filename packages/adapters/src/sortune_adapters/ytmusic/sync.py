@@ -0,0 +1,185 @@
+"""
+Incremental library sync.
+
+The library listing is cheap (one call) and carries per-playlist change markers
+(`count`, `title`, `description`). Each sync compares them against the markers
+stored after the previous sync and re-fetches only playlists that differ; for
+those, a track-level diff against the stored copy (by video id) is reported, and the
+playlist is saved whole (the repo stores one blob per playlist and skips unchanged
+content by hash).
+
+With `entities=True` the library's saved albums and artists are also merged into
+the entity store (see storage/redis_entities.py).
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+
+from sortune_core.diff.tracks import diff_track_ids
+from sortune_core.models.playlist import Playlist
+from sortune_core.models.projection import parse_fields
+
+from sortune_adapters.storage.redis_entities import RedisEntityRepo
+from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
+
+from .client import PlaylistSummary, YTMusicClient
+from .importer import LibraryImporter, is_auto_generated
+
+log = logging.getLogger(__name__)
+
+CHANGE_MARKERS = ("count", "title", "description")
+_TRACK_IDS = parse_fields("tracks.id", Playlist)
+
+
+@dataclass
+class PlaylistSyncResult:
+    playlist_id: str
+    reason: str
+    fetch_seconds: float = 0.0
+    added: int = 0
+    removed: int = 0
+    reordered: bool = False
+    written: bool = False
+    error: str | None = None
+
+
+@dataclass
+class SyncReport:
+    listed: int = 0
+    skipped: int = 0  # unchanged markers, not fetched
+    fetched: int = 0
+    written: int = 0
+    failed: int = 0
+    auto_generated: int = 0
+    gone: list[str] = field(default_factory=list)  # stored but no longer in the library
+    artists: int = 0  # library artists/albums seen, and entity entries that changed
+    albums: int = 0
+    entities_changed: int = 0
+    list_seconds: float = 0.0
+    fetch_seconds: float = 0.0
+    write_seconds: float = 0.0
+    seconds: float = 0.0
+    playlists: list[PlaylistSyncResult] = field(default_factory=list)
+
+    def slowest(self, n: int = 5) -> list[PlaylistSyncResult]:
+        return sorted(self.playlists, key=lambda p: p.fetch_seconds, reverse=True)[:n]
+
+
+def fingerprint(summary: PlaylistSummary) -> str:
+    return json.dumps({k: summary.get(k) for k in CHANGE_MARKERS}, sort_keys=True)
+
+
+def change_reason(summary: PlaylistSummary, previous: str | None) -> str | None:
+    """Why a playlist must be re-fetched, or None if its markers are unchanged."""
+    if previous is None:
+        return "new"
+    if summary.get("count") is None:
+        return "no change marker"
+    old = json.loads(previous)
+    changed = [k for k in CHANGE_MARKERS if old.get(k) != summary.get(k)]
+    return f"{', '.join(changed)} changed" if changed else None
+
+
+class LibrarySync:
+    def __init__(
+        self,
+        client: YTMusicClient,
+        repo: RedisPlaylistRepo,
+        importer: LibraryImporter | None = None,
+    ):
+        self.client = client
+        self.repo = repo
+        # Fetches go through the importer's pool + limiter, always bypassing the cache
+        # (on a copy: the caller's importer keeps its own setting)
+        self.importer = copy.copy(importer) if importer else LibraryImporter(client, repo)
+        self.importer.refresh = True
+
+    def run(self, *, full: bool = False, limit: int = 500, entities: bool = False) -> SyncReport:
+        """
+        Sync the library; `full=True` ignores stored markers and re-fetches everything,
+        `entities=True` also ingests library albums and artists.
+        """
+        report = SyncReport()
+        start = time.perf_counter()
+
+        summaries = self.client.list_library_playlists(limit=limit, refresh=True)
+        report.list_seconds = time.perf_counter() - start
+        report.listed = len(summaries)
+
+        stored = self.repo.get_fingerprints()
+        todo: list[tuple[PlaylistSummary, str]] = []
+        for s in summaries:
+            if is_auto_generated(s):
+                report.auto_generated += 1
+                continue
+            reason = "full sync" if full else change_reason(s, stored.get(s["playlistId"]))
+            if reason is None:
+                report.skipped += 1
+            else:
+                todo.append((s, reason))
+        listed_ids = {s["playlistId"] for s in summaries}
+        report.gone = sorted(pid for pid in stored if pid not in listed_ids)
+
+        reasons = {s["playlistId"]: r for s, r in todo}
+        fetch_start = time.perf_counter()
+        for outcome in self.importer.fetch_many(s for s, _ in todo):
+            pid = outcome.summary["playlistId"]
+            item = PlaylistSyncResult(
+                playlist_id=pid, reason=reasons[pid], fetch_seconds=outcome.seconds
+            )
+            report.playlists.append(item)
+            if outcome.playlist is None:
+                item.error = str(outcome.error)
+                report.failed += 1
+                continue
+            report.fetched += 1
+
+            write_start = time.perf_counter()
+            # Ids only: no validating or resolving the stored copy just to count changes
+            stored_ids = [t["videoId"] for t in self.repo.get_document(pid, _TRACK_IDS)["tracks"]]
+            diff = diff_track_ids(stored_ids, [t.id for t in outcome.playlist.tracks])
+            item.added, item.removed = len(diff.added), len(diff.removed)
+            item.reordered = diff.reordered
+            item.written = self.repo.save(outcome.playlist)
+            report.written += item.written
+            self.repo.set_fingerprints({pid: fingerprint(outcome.summary)})
+            report.write_seconds += time.perf_counter() - write_start
+        report.fetch_seconds = time.perf_counter() - fetch_start - report.write_seconds
+
+        if entities:
+            store = self.repo.entities or RedisEntityRepo(self.repo.r)
+            report.artists, report.albums, report.entities_changed = sync_library_entities(
+                self.client, store, limit=limit
+            )
+
+        report.seconds = time.perf_counter() - start
+        log.info(
+            "Library sync: %d listed, %d skipped, %d fetched, %d written, %d failed in %.1fs",
+            report.listed,
+            report.skipped,
+            report.fetched,
+            report.written,
+            report.failed,
+            report.seconds,
+        )
+        return report
+
+
+def sync_library_entities(
+    client: YTMusicClient, store: RedisEntityRepo, *, limit: int = 500
+) -> tuple[int, int, int]:
+    """
+    Merge the library's saved artists and albums into `store`.
+    Returns (artists listed, albums listed, entity entries changed).
+    """
+    artists = client.list_library_artists(limit=limit, refresh=True)
+    albums = client.list_library_albums(limit=limit, refresh=True)
+    # Album credits are artist references too; library artists win on conflicts
+    credited = [a for album in albums for a in album.artists or ()]
+    changed = store.upsert_artists([*credited, *artists]) + store.upsert_albums(albums)
+    return len(artists), len(albums), changed
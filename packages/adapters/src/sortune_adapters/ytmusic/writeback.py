@@ -0,0 +1,276 @@
+"""
+Write a sorted playlist back to YouTube Music.
+
+Given the desired order of video ids, the upstream playlist is edited in two
+phases, each a list of batched `browse/edit_playlist` requests:
+
+  1. edit: remove entries that are not wanted, add the missing videos;
+  2. move: re-read the playlist and apply the fewest moves that produce the
+     target order (everything outside a longest increasing subsequence moves
+     once, see sortune_core.diff.moves).
+
+Every request takes a token from the AIMD limiter (by default the process-wide
+one, shared with imports and syncs) and throttled requests are retried with
+backoff. With a Redis connection the plan and the index of the next batch are
+checkpointed after every request, so a run that dies halfway (crash, quota
+exhausted, job timeout) resumes where it stopped instead of starting over.
+`dry_run` only plans.
+
+A 5k-track reorder is at most 5k moves, i.e. 50 requests at the default batch
+size, instead of one request per move.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections import defaultdict, deque
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from redis import Redis
+from sortune_core.diff.moves import plan_moves
+from sortune_core.models.playlist import payload_hash
+
+from .client import PlaylistItem, YTMusicClient
+from .ratelimit import AIMDRateLimiter, is_throttle_error, shared_limiter
+
+log = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+CHECKPOINT_TTL_SECONDS = 24 * 3600
+
+
+@dataclass
+class WriteBackReport:
+    playlist_id: str
+    dry_run: bool = False
+    removed: int = 0
+    added: int = 0
+    moved: int = 0
+    requests: int = 0  # edit requests sent (planned, for a dry run)
+    throttled: int = 0
+    resumed: bool = False
+    verified: bool | None = None  # upstream order matched the target afterwards
+    seconds: float = 0.0
+
+
+class WriteBackError(RuntimeError):
+    """A write-back stopped early; with checkpoints, running it again resumes it."""
+
+    def __init__(self, message: str, report: WriteBackReport):
+        super().__init__(message)
+        self.report = report
+
+
+class PlaylistWriteBack:
+    def __init__(
+        self,
+        client: YTMusicClient,
+        *,
+        checkpoints: Redis | None = None,
+        limiter: AIMDRateLimiter | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_retries: int = 4,
+        backoff: float = 0.5,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        self.client = client
+        self.redis = checkpoints
+        self.limiter = limiter or shared_limiter()
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    def run(
+        self, playlist_id: str, video_ids: Sequence[str], *, dry_run: bool = False
+    ) -> WriteBackReport:
+        report = WriteBackReport(playlist_id, dry_run=dry_run)
+        start = time.perf_counter()
+        target = list(video_ids)
+        digest = payload_hash(json.dumps(target))
+
+        items: list[PlaylistItem] | None = None
+        state = None if dry_run else self._load(playlist_id)
+        if state is not None and state["target"] != digest:
+            log.info("Discarding write-back checkpoint for %s (new target)", playlist_id)
+            state = None
+        if state is None:
+            items = self.client.get_playlist_items(playlist_id)
+            state = self._plan_edits(items, target, digest)
+        else:
+            report.resumed = True
+        report.removed, report.added = state["removed"], state["added"]
+
+        if dry_run:
+            report.moved = len(_preview_moves(items, target))
+            report.requests = len(state["batches"]) + -(-report.moved // self.batch_size)
+            report.seconds = time.perf_counter() - start
+            return report
+
+        try:
+            if state["phase"] == "edit":
+                self._execute(playlist_id, state, report)
+                if items is None or state["batches"]:
+                    items = self.client.get_playlist_items(playlist_id)
+                state = self._plan_moves(playlist_id, items, target, state)
+                self._save(playlist_id, state)
+            report.moved = state["moved"]
+            self._execute(playlist_id, state, report)
+        except Exception as e:
+            report.seconds = time.perf_counter() - start
+            raise WriteBackError(f"Write-back of {playlist_id} stopped: {e}", report) from e
+
+        self._clear(playlist_id)
+        final = self.client.get_playlist_items(playlist_id)
+        report.verified = [i["videoId"] for i in final] == target
+        if not report.verified:
+            log.warning("Playlist %s does not match the target order after write-back", playlist_id)
+        report.seconds = time.perf_counter() - start
+        log.info(
+            "Wrote back %s: -%d +%d ~%d in %d request(s), %.1fs",
+            playlist_id,
+            report.removed,
+            report.added,
+            report.moved,
+            report.requests,
+            report.seconds,
+        )
+        return report
+
+    # ---------- Planning ----------
+
+    def _plan_edits(
+        self, items: Sequence[PlaylistItem], target: list[str], digest: str
+    ) -> dict[str, Any]:
+        slots, unused = _match(items, target)
+        actions = [
+            {
+                "action": "ACTION_REMOVE_VIDEO",
+                "setVideoId": i["setVideoId"],
+                "removedVideoId": i["videoId"],
+            }
+            for i in unused
+        ]
+        missing = [v for v, slot in zip(target, slots, strict=True) if slot is None]
+        # SKIP disables the duplicate check, so a target listing a video twice is honoured
+        actions += [
+            {"action": "ACTION_ADD_VIDEO", "addedVideoId": v, "dedupeOption": "DEDUPE_OPTION_SKIP"}
+            for v in missing
+        ]
+        return {
+            "target": digest,
+            "phase": "edit",
+            "batches": self._chunk(actions),
+            "next": 0,
+            "removed": len(unused),
+            "added": len(missing),
+            "moved": 0,
+        }
+
+    def _plan_moves(
+        self,
+        playlist_id: str,
+        items: Sequence[PlaylistItem],
+        target: list[str],
+        state: dict[str, Any],
+    ) -> dict[str, Any]:
+        slots, unused = _match(items, target)
+        if unused or None in slots:
+            raise RuntimeError(
+                f"{playlist_id} does not hold the target tracks after adds/removals "
+                f"({len(unused)} extra, {slots.count(None)} missing); was it edited meanwhile?"
+            )
+        moves = plan_moves([i["setVideoId"] for i in items], slots)
+        actions = []
+        for item, successor in moves:
+            action = {"action": "ACTION_MOVE_VIDEO_BEFORE", "setVideoId": item}
+            if successor is not None:
+                action["movedSetVideoIdSuccessor"] = successor
+            actions.append(action)
+        return {
+            **state,
+            "phase": "move",
+            "batches": self._chunk(actions),
+            "next": 0,
+            "moved": len(moves),
+        }
+
+    def _chunk(self, actions: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+        return [actions[i : i + self.batch_size] for i in range(0, len(actions), self.batch_size)]
+
+    # ---------- Execution ----------
+
+    def _execute(self, playlist_id: str, state: dict[str, Any], report: WriteBackReport) -> None:
+        batches = state["batches"]
+        while state["next"] < len(batches):
+            self._send(playlist_id, batches[state["next"]], report)
+            state["next"] += 1
+            self._save(playlist_id, state)
+
+    def _send(
+        self, playlist_id: str, actions: list[dict[str, Any]], report: WriteBackReport
+    ) -> None:
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            try:
+                self.client.edit_playlist_items(playlist_id, actions)
+            except Exception as e:
+                if not is_throttle_error(e) or attempt == self.max_retries:
+                    raise
+                report.throttled += 1
+                self.limiter.on_throttle()
+                time.sleep(self.backoff * (2**attempt))
+                continue
+            self.limiter.on_success()
+            report.requests += 1
+            return
+
+    # ---------- Checkpoints ----------
+
+    @staticmethod
+    def _key(playlist_id: str) -> str:
+        return f"writeback:{playlist_id}"
+
+    def _load(self, playlist_id: str) -> dict[str, Any] | None:
+        if self.redis is None:
+            return None
+        raw = self.redis.get(self._key(playlist_id))
+        return json.loads(raw) if raw else None
+
+    def _save(self, playlist_id: str, state: dict[str, Any]) -> None:
+        if self.redis is not None:
+            self.redis.set(self._key(playlist_id), json.dumps(state), ex=CHECKPOINT_TTL_SECONDS)
+
+    def _clear(self, playlist_id: str) -> None:
+        if self.redis is not None:
+            self.redis.delete(self._key(playlist_id))
+
+
+def _match(
+    items: Sequence[PlaylistItem], target: Sequence[str]
+) -> tuple[list[str | None], list[PlaylistItem]]:
+    """
+    Assign existing entries to target positions (first come, first served per video).
+    Returns each position's setVideoId (None where the video must be added) and the
+    entries no position wants.
+    """
+    pool: dict[str, deque[PlaylistItem]] = defaultdict(deque)
+    for item in items:
+        pool[item["videoId"]].append(item)
+    slots = [pool[v].popleft()["setVideoId"] if pool.get(v) else None for v in target]
+    used = {s for s in slots if s is not None}
+    return slots, [item for item in items if item["setVideoId"] not in used]
+
+
+def _preview_moves(items: Sequence[PlaylistItem], target: list[str]) -> list:
+    """Moves a run would plan, assuming removals happen and adds land at the end."""
+    slots, unused = _match(items, target)
+    dropped = {i["setVideoId"] for i in unused}
+    current = [i["setVideoId"] for i in items if i["setVideoId"] not in dropped]
+    added = [f"+{n}" for n in range(slots.count(None))]
+    fill = iter(added)
+    return plan_moves(current + added, [s if s is not None else next(fill) for s in slots])
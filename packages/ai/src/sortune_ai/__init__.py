@@ -15,11 +15,27 @@ try:
 except Exception:  # pragma: no cover - fallback in non-built environments
     __version__ = "0.0.0"
 
-from .base import BaseLLM
-from .config import LLMConfig, load_llm_config
-from .factory import get_llm
-from .playlist_namer import generate_playlist_name_suggestions
-from .schemas import PlaylistName, PlaylistSuggestions
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .base import BaseLLM
+    from .config import LLMConfig, load_llm_config
+    from .factory import get_llm
+    from .playlist_namer import generate_playlist_name_suggestions
+    from .schemas import PlaylistName, PlaylistSuggestions
+
+# Exports are imported on first access, so `import sortune_ai` (or of its schemas)
+# does not pull in the provider stack
+_EXPORTS = {
+    "PlaylistName": "schemas",
+    "PlaylistSuggestions": "schemas",
+    "BaseLLM": "base",
+    "LLMConfig": "config",
+    "load_llm_config": "config",
+    "get_llm": "factory",
+    "generate_playlist_name_suggestions": "playlist_namer",
+}
 
 __all__ = [
     "__version__",
@@ -34,3 +50,12 @@ __all__ = [
     # Helpers
     "generate_playlist_name_suggestions",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,37 @@
+"""
+Prometheus metrics for LLM calls (exposed by the API's /metrics together with the
+adapters' metrics, since both use prometheus_client's default registry).
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from prometheus_client import Counter, Histogram
+
+LLM_SECONDS = Histogram(
+    "sortune_llm_call_seconds",
+    "LLM call latency",
+    ["backend", "model", "outcome"],  # outcome: ok | error
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120),
+)
+LLM_TOKENS = Counter(
+    "sortune_llm_tokens_total",
+    "Tokens used by LLM calls, as reported by the provider",
+    ["backend", "model", "kind"],  # kind: input | output
+)
+
+
+def record_usage(backend: str, model: str, message: Any) -> dict[str, int]:
+    """
+    Count the tokens in a LangChain message's `usage_metadata` (if the provider sent
+    any); returns them by kind.
+    """
+    usage = getattr(message, "usage_metadata", None) or {}
+    counted = {}
+    for kind in ("input", "output"):
+        tokens = usage.get(f"{kind}_tokens")
+        if tokens:
+            LLM_TOKENS.labels(backend=backend, model=model, kind=kind).inc(tokens)
+            counted[kind] = tokens
+    return counted
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import time
 from typing import Any
 
+from opentelemetry import trace
+
 from ..base import BaseLLM, LLMRuntimeError
+from ..metrics import LLM_SECONDS, record_usage
+
+tracer = trace.get_tracer(__name__)
 
 
 class LangChainLLM(BaseLLM):
@@ -47,16 +53,30 @@ class LangChainLLM(BaseLLM):
             mk.setdefault("response_format", {"type": "json_object"})
         # Temperature priority: call > default
         temp = self._default_temperature if temperature is None else temperature
-        try:
-            # Most Chat* models accept a string input directly.
-            msg = chat.invoke(
-                prompt,
-                **({"temperature": temp} if temp is not None else {}),
-                **mk,
-            )
-        except TypeError:
-            # Some versions expect temperature via constructor only; retry without passing.
-            msg = chat.invoke(prompt, **mk)
+        start, outcome = time.perf_counter(), "error"
+        with tracer.start_as_current_span(
+            "LangChainLLM.generate",
+            attributes={"gen_ai.system": self._backend, "gen_ai.request.model": self._model_id},
+        ) as span:
+            try:
+                try:
+                    # Most Chat* models accept a string input directly.
+                    msg = chat.invoke(
+                        prompt,
+                        **({"temperature": temp} if temp is not None else {}),
+                        **mk,
+                    )
+                except TypeError:
+                    # Some versions expect temperature via constructor only; retry without it.
+                    msg = chat.invoke(prompt, **mk)
+                outcome = "ok"
+            finally:
+                LLM_SECONDS.labels(
+                    backend=self._backend, model=self._model_id, outcome=outcome
+                ).observe(time.perf_counter() - start)
+            usage = record_usage(self._backend, self._model_id, msg)
+            for kind, tokens in usage.items():
+                span.set_attribute(f"gen_ai.usage.{kind}_tokens", tokens)
         # msg may be a BaseMessage or string depending on version
         content = getattr(msg, "content", None)
         print(content)
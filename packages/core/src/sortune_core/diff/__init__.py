@@ -0,0 +1,11 @@
+from .moves import apply_moves, longest_increasing_subsequence, plan_moves
+from .tracks import TrackDiff, diff_track_ids, diff_tracks
+
+__all__ = [
+    "TrackDiff",
+    "apply_moves",
+    "diff_track_ids",
+    "diff_tracks",
+    "longest_increasing_subsequence",
+    "plan_moves",
+]
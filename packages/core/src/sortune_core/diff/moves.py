@@ -0,0 +1,69 @@
+"""
+Minimal reorder plans: turn one ordering of items into another with as few
+"move X before Y" operations as possible.
+
+Items that already sit in a longest increasing subsequence of their target
+positions stay put; every other item is moved exactly once, so a plan costs
+`len(items) - LIS` moves (e.g. a single moved track costs one move, not n).
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Hashable, Sequence
+
+
+def longest_increasing_subsequence(values: Sequence[int]) -> list[int]:
+    """Indices into `values` of one longest strictly increasing subsequence (O(n log n))."""
+    tails: list[int] = []  # tails[k] = index of the smallest tail of a run of length k+1
+    tail_values: list[int] = []
+    parents = [-1] * len(values)
+    for i, v in enumerate(values):
+        k = bisect_left(tail_values, v)
+        if k:
+            parents[i] = tails[k - 1]
+        if k == len(tails):
+            tails.append(i)
+            tail_values.append(v)
+        else:
+            tails[k] = i
+            tail_values[k] = v
+    out: list[int] = []
+    i = tails[-1] if tails else -1
+    while i != -1:
+        out.append(i)
+        i = parents[i]
+    return out[::-1]
+
+
+def plan_moves[K: Hashable](current: Sequence[K], target: Sequence[K]) -> list[tuple[K, K | None]]:
+    """
+    Moves that turn `current` into `target` (the same unique items, reordered).
+
+    Each move is `(item, successor)`: place `item` immediately before `successor`,
+    or at the end when `successor` is None. Apply them in the order returned.
+    """
+    position = {item: i for i, item in enumerate(target)}
+    if len(position) != len(target) or len(current) != len(target):
+        raise ValueError("current and target must hold the same unique items")
+    try:
+        ranks = [position[item] for item in current]
+    except KeyError as e:
+        raise ValueError(f"{e.args[0]!r} is not in target") from None
+    stay = {current[i] for i in longest_increasing_subsequence(ranks)}
+
+    # Right to left, so every successor is already where it belongs
+    moves: list[tuple[K, K | None]] = []
+    for i in range(len(target) - 1, -1, -1):
+        if target[i] not in stay:
+            moves.append((target[i], target[i + 1] if i + 1 < len(target) else None))
+    return moves
+
+
+def apply_moves[K: Hashable](items: Sequence[K], moves: Sequence[tuple[K, K | None]]) -> list[K]:
+    """Replay a move plan on a list (what the upstream playlist will look like)."""
+    out = list(items)
+    for item, successor in moves:
+        out.remove(item)
+        out.insert(len(out) if successor is None else out.index(successor), item)
+    return out
@@ -0,0 +1,45 @@
+"""
+Track-level diffs between two versions of a playlist.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+from ..models.playlist import Track
+
+
+@dataclass(frozen=True)
+class TrackDiff:
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)  # same id, different metadata
+    reordered: bool = False
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed or self.updated or self.reordered)
+
+
+def diff_tracks(old: Sequence[Track], new: Sequence[Track]) -> TrackDiff:
+    """
+    Compare two track lists by video id.
+    `reordered` is True when the tracks present in both lists changed relative order.
+    """
+    old_by_id = {t.id: t for t in old}
+    updated = [t.id for t in new if t.id in old_by_id and old_by_id[t.id] != t]
+    by_ids = diff_track_ids([t.id for t in old], [t.id for t in new])
+    return TrackDiff(
+        added=by_ids.added, removed=by_ids.removed, updated=updated, reordered=by_ids.reordered
+    )
+
+
+def diff_track_ids(old: Sequence[str], new: Sequence[str]) -> TrackDiff:
+    """`diff_tracks` on video ids alone (no metadata, so nothing is ever `updated`)."""
+    old_ids, new_ids = set(old), set(new)
+    added = [vid for vid in new if vid not in old_ids]
+    removed = [vid for vid in old if vid not in new_ids]
+    kept_old = [vid for vid in old if vid in new_ids]
+    kept_new = [vid for vid in new if vid in old_ids]
+    return TrackDiff(added=added, removed=removed, reordered=kept_old != kept_new)
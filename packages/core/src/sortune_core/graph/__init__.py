@@ -0,0 +1,3 @@
+from .cooccurrence import ArtistGraph, Neighbor, artist_key
+
+__all__ = ["ArtistGraph", "Neighbor", "artist_key"]
@@ -0,0 +1,240 @@
+"""
+Artist co-occurrence graph.
+
+Two artists are related when they appear in the same playlist. The graph keeps the
+raw artist–playlist incidence so a single playlist can be added, replaced or removed
+without re-reading the whole library, and compiles a CSR matrix of cosine-normalized
+artist–artist weights whose rows are pre-sorted, so a top-k query is a slice.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from ..models.playlist import Artist, Playlist
+
+FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Neighbor:
+    key: str
+    name: str
+    score: float
+    shared_playlists: int
+
+
+@dataclass
+class _CSR:
+    """Compressed sparse rows: row i spans indices/data[indptr[i]:indptr[i + 1]]."""
+
+    vocab: list[str]
+    indptr: list[int]
+    indices: list[int]
+    data: list[float]
+    shared: list[int]
+
+
+def artist_key(artist: Artist) -> str:
+    """Stable node key: the YouTube channel id when known, else the folded name."""
+    if artist.id:
+        return artist.id
+    return f"name:{artist.name.casefold()}"
+
+
+class ArtistGraph:
+    """
+    Incrementally maintained artist co-occurrence graph.
+
+    Mutations (`upsert_playlist`, `remove_playlist`) update raw counts in O(a²) for the
+    a artists of that playlist and mark the compiled matrix stale; the next query
+    recompiles it once.
+    """
+
+    def __init__(self) -> None:
+        self._names: dict[str, str] = {}
+        self._incidence: dict[str, frozenset[str]] = {}
+        self._degree: Counter[str] = Counter()
+        self._co: dict[str, Counter[str]] = {}
+        self._counts_ready = True
+        self._csr: _CSR | None = None
+        self._row_of: dict[str, int] = {}
+
+    # ---------- Mutations ----------
+
+    def upsert_playlist(self, playlist: Playlist) -> bool:
+        """Add or replace a playlist's contribution. Returns False if nothing changed."""
+        keys: set[str] = set()
+        for track in playlist.tracks:
+            for artist in track.artists:
+                key = artist_key(artist)
+                keys.add(key)
+                self._names.setdefault(key, artist.name)
+        new = frozenset(keys)
+        if self._incidence.get(playlist.id) == new:
+            return False
+        self._ensure_counts()
+        self._retract(playlist.id)
+        self._incidence[playlist.id] = new
+        self._apply(new, +1)
+        self._csr = None
+        return True
+
+    def remove_playlist(self, playlist_id: str) -> bool:
+        if playlist_id not in self._incidence:
+            return False
+        self._ensure_counts()
+        self._retract(playlist_id)
+        del self._incidence[playlist_id]
+        self._csr = None
+        return True
+
+    # ---------- Queries ----------
+
+    def __len__(self) -> int:
+        return len(self._csr.vocab) if self._csr is not None else len(self._degree)
+
+    @property
+    def playlist_ids(self) -> list[str]:
+        return list(self._incidence)
+
+    def resolve(self, artist: str) -> str | None:
+        """Map an artist id or (case-insensitive) name to its node key."""
+        if artist in self._names:
+            return artist
+        folded = f"name:{artist.casefold()}"
+        if folded in self._names:
+            return folded
+        for key, name in self._names.items():
+            if name.casefold() == artist.casefold():
+                return key
+        return None
+
+    def neighbors(self, artist: str, k: int = 10) -> list[Neighbor]:
+        """Top-k related artists, strongest first. Unknown artists return []."""
+        key = self.resolve(artist)
+        if key is None:
+            return []
+        csr = self.compile()
+        row = self._row_of.get(key)
+        if row is None:
+            return []
+        start = csr.indptr[row]
+        end = min(csr.indptr[row + 1], start + max(k, 0))
+        out: list[Neighbor] = []
+        for pos in range(start, end):
+            other = csr.vocab[csr.indices[pos]]
+            out.append(
+                Neighbor(
+                    key=other,
+                    name=self._names.get(other, other),
+                    score=csr.data[pos],
+                    shared_playlists=csr.shared[pos],
+                )
+            )
+        return out
+
+    def compile(self) -> _CSR:
+        """Build (or return the cached) CSR matrix of normalized, pre-sorted rows."""
+        if self._csr is not None:
+            return self._csr
+        self._ensure_counts()
+        vocab = sorted(self._degree)
+        row_of = {key: i for i, key in enumerate(vocab)}
+        indptr = [0]
+        indices: list[int] = []
+        data: list[float] = []
+        shared: list[int] = []
+        for key in vocab:
+            deg = self._degree[key]
+            row = [
+                (count / math.sqrt(deg * self._degree[other]), count, row_of[other])
+                for other, count in self._co.get(key, {}).items()
+            ]
+            row.sort(key=lambda item: (-item[0], item[2]))
+            for score, count, col in row:
+                indices.append(col)
+                data.append(round(score, 6))
+                shared.append(count)
+            indptr.append(len(indices))
+        self._csr = _CSR(vocab=vocab, indptr=indptr, indices=indices, data=data, shared=shared)
+        self._row_of = row_of
+        return self._csr
+
+    # ---------- Persistence ----------
+
+    def to_dict(self) -> dict[str, Any]:
+        csr = self.compile()
+        return {
+            "version": FORMAT_VERSION,
+            "names": self._names,
+            "incidence": {pid: sorted(keys) for pid, keys in self._incidence.items()},
+            "csr": {
+                "vocab": csr.vocab,
+                "indptr": csr.indptr,
+                "indices": csr.indices,
+                "data": csr.data,
+                "shared": csr.shared,
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ArtistGraph:
+        """
+        Restore a persisted graph. The compiled matrix is reused as-is, so queries
+        need no recomputation; raw counts are rebuilt lazily on the first mutation.
+        """
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported graph format version: {data.get('version')!r}")
+        g = cls()
+        g._names = dict(data.get("names", {}))
+        g._incidence = {pid: frozenset(keys) for pid, keys in data.get("incidence", {}).items()}
+        g._counts_ready = False
+        csr = data.get("csr")
+        if csr is not None:
+            g._csr = _CSR(**csr)
+            g._row_of = {key: i for i, key in enumerate(g._csr.vocab)}
+        return g
+
+    @classmethod
+    def build(cls, playlists: Iterable[Playlist]) -> ArtistGraph:
+        g = cls()
+        for pl in playlists:
+            g.upsert_playlist(pl)
+        return g
+
+    # ---------- Internals ----------
+
+    def _apply(self, keys: frozenset[str], sign: int) -> None:
+        ordered = sorted(keys)
+        for key in ordered:
+            self._degree[key] += sign
+            if self._degree[key] <= 0:
+                del self._degree[key]
+        for i, a in enumerate(ordered):
+            for b in ordered[i + 1 :]:
+                for x, y in ((a, b), (b, a)):
+                    row = self._co.setdefault(x, Counter())
+                    row[y] += sign
+                    if row[y] <= 0:
+                        del row[y]
+                        if not row:
+                            del self._co[x]
+
+    def _retract(self, playlist_id: str) -> None:
+        old = self._incidence.get(playlist_id)
+        if old:
+            self._apply(old, -1)
+
+    def _ensure_counts(self) -> None:
+        if self._counts_ready:
+            return
+        self._degree.clear()
+        self._co.clear()
+        for keys in self._incidence.values():
+            self._apply(keys, +1)
+        self._counts_ready = True
@@ -1,6 +1,22 @@
+import hashlib
+
 from pydantic import BaseModel, Field, model_validator
 
 
+def payload_hasher():
+    """Incremental form of `payload_hash`, for payloads written in chunks."""
+    return hashlib.blake2b(digest_size=16)
+
+
+def payload_hash(payload: str | bytes) -> str:
+    """Stable content hash of a serialized payload (used as storage version / ETag)."""
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    hasher = payload_hasher()
+    hasher.update(payload)
+    return hasher.hexdigest()
+
+
 class Artist(BaseModel):
     name: str
     id: str | None = None
@@ -72,3 +88,12 @@ class Playlist(BaseModel):
     thumbnails: list[dict] | None = None
     # IMPORTANT: avoid shared mutable default list across instances
     tracks: list[Track] = Field(default_factory=list)
+
+    def content_hash(self) -> str:
+        """
+        Hash of the full model JSON: metadata plus every track, in order. Not the
+        repo's stored hash (`PlaylistRepo.get_hash`) in general: RedisPlaylistRepo
+        stores artists and albums with browse ids as references, so the two only
+        agree for playlists without such credits.
+        """
+        return payload_hash(self.model_dump_json(by_alias=True))
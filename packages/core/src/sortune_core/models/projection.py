@@ -0,0 +1,111 @@
+"""
+Field projections: `?fields=tracks.id,tracks.title,tracks.artists.name` selects a
+subset of a model's serialized output.
+
+A spec is parsed against a model into a tree keyed by the serialized (alias) names,
+with None marking "everything below here". Field names and aliases are both
+accepted (`tracks.id` and `tracks.videoId` mean the same thing). The tree can
+then be applied to already-serialized documents (`project`) or handed to pydantic
+so unselected fields are never serialized (`model_include`).
+"""
+
+from __future__ import annotations
+
+import types
+from typing import Any, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+type Fields = dict[str, Fields | None]
+
+
+def parse_fields(spec: str | None, model: type[BaseModel]) -> Fields | None:
+    """
+    Parse a comma-separated list of dotted paths. Returns None (no projection) for an
+    empty spec; raises ValueError on fields `model` does not have.
+    """
+    paths = [p.strip() for p in (spec or "").split(",") if p.strip()]
+    if not paths:
+        return None
+    tree: Fields = {}
+    for path in paths:
+        node: Fields | None = tree
+        current: type[BaseModel] | None = model
+        for depth, part in enumerate(path.split(".")):
+            if node is None:
+                break  # a parent path already selects everything below
+            key, current = _resolve(current, part, path)
+            if depth == path.count("."):
+                node[key] = None
+            else:
+                node = node.setdefault(key, {})
+    return tree
+
+
+def project(doc: Any, fields: Fields | None) -> Any:
+    """Keep only the selected keys of a serialized document (lists are mapped over)."""
+    if fields is None:
+        return doc
+    if isinstance(doc, list):
+        return [project(item, fields) for item in doc]
+    if not isinstance(doc, dict):
+        return doc  # scalars (and stored references) pass through
+    out = {}
+    for key, sub in fields.items():
+        if key in doc:
+            # Leaves are copied as-is rather than through another call (hot for long lists)
+            out[key] = doc[key] if sub is None else project(doc[key], sub)
+    return out
+
+
+def model_include(model: type[BaseModel], fields: Fields | None) -> dict | None:
+    """The tree as a pydantic `include=` argument for `model` (field names, not aliases)."""
+    if fields is None:
+        return None
+    include: dict[str, Any] = {}
+    by_alias = {info.alias or name: (name, info) for name, info in model.model_fields.items()}
+    for key, sub in fields.items():
+        name, info = by_alias[key]
+        if sub is None:
+            include[name] = True
+            continue
+        nested = _nested_model(info.annotation)
+        # Plain dicts are included by key, the way `project` filters them
+        inner = model_include(nested, sub) if nested else _dict_include(sub)
+        include[name] = {"__all__": inner} if _is_list(info.annotation) else inner
+    return include
+
+
+def _dict_include(fields: Fields) -> dict[str, Any]:
+    return {key: True if sub is None else _dict_include(sub) for key, sub in fields.items()}
+
+
+def _resolve(
+    model: type[BaseModel] | None, part: str, path: str
+) -> tuple[str, type[BaseModel] | None]:
+    """Serialized key for `part` of `model`, and the model nested under it (if any)."""
+    if not part:
+        raise ValueError(f"Empty field name in {path!r}")
+    if model is None:
+        return part, None  # inside a free-form dict: any key goes
+    for name, info in model.model_fields.items():
+        if part in (name, info.alias):
+            return info.alias or name, _nested_model(info.annotation)
+    raise ValueError(f"Unknown field {part!r} in {path!r}")
+
+
+def _nested_model(annotation: Any) -> type[BaseModel] | None:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in get_args(annotation):
+        found = _nested_model(arg)
+        if found is not None:
+            return found
+    return None
+
+
+def _is_list(annotation: Any) -> bool:
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        return any(_is_list(arg) for arg in get_args(annotation))
+    return origin is list
@@ -0,0 +1,3 @@
+from .vibe import Recommendation, TrackIndex, track_features
+
+__all__ = ["Recommendation", "TrackIndex", "track_features"]
@@ -1,7 +1,9 @@
-from collections.abc import Iterable
+from collections.abc import Iterable, Mapping, Sequence
 from typing import Protocol
 
-from ..models.playlist import Playlist, Track
+from ..graph.cooccurrence import ArtistGraph
+from ..models.playlist import Album, Artist, Playlist, Track
+from ..models.projection import Fields
 
 
 class TrackRepo(Protocol):
@@ -14,15 +16,116 @@ class TrackRepo(Protocol):
         ...
 
 
+class PlaylistStreamWriter(Protocol):
+    """Incremental write of one playlist's tracks; nothing is visible until `commit`."""
+
+    def append(self, tracks: Sequence[Track]) -> int:
+        """Stage another page of tracks. Returns the number of tracks staged so far."""
+        ...
+
+    def commit(self) -> bool:
+        """Publish the staged playlist. Returns False if the stored copy was identical."""
+        ...
+
+    def abort(self) -> None:
+        """Discard everything staged so far."""
+        ...
+
+
 class PlaylistRepo(Protocol):
     def get(self, playlist_id: str) -> Playlist:
         """Fetch a playlist by ID."""
         ...
 
-    def save(self, playlist: Playlist) -> None:
-        """Persist a playlist."""
+    def save(self, playlist: Playlist) -> bool:
+        """Persist a playlist. Returns False if the stored copy was already identical."""
+        ...
+
+    def get_document(self, playlist_id: str, fields: Fields | None = None) -> dict:
+        """
+        `get(...).model_dump(by_alias=True)`, ideally without building the models,
+        projected to `fields` (only loading what the projection needs, where possible).
+        """
+        ...
+
+    def get_many(self, playlist_ids: Sequence[str]) -> list[Playlist]:
+        """Fetch several playlists in one round trip (missing ones come back empty)."""
+        ...
+
+    def save_many(self, playlists: Sequence[Playlist]) -> list[bool]:
+        """Persist several playlists in one round trip; per-playlist `save` semantics."""
+        ...
+
+    def open_stream(self, playlist: Playlist) -> PlaylistStreamWriter:
+        """Start writing `playlist` (metadata only) with its tracks appended page by page."""
+        ...
+
+    def get_hash(self, playlist_id: str) -> str | None:
+        """Content hash of the stored playlist, or None if nothing is stored."""
+        ...
+
+    def get_applied_hash(self, playlist_id: str, rule_name: str) -> str | None:
+        """Content hash the playlist had right after `rule_name` was last applied."""
+        ...
+
+    def set_applied_hash(self, playlist_id: str, rule_name: str, content_hash: str) -> None:
+        """Remember that `content_hash` is the result of applying `rule_name`."""
+        ...
+
+    def get_hashes(self, playlist_ids: Sequence[str]) -> list[str | None]:
+        """`get_hash` for several playlists in one round trip."""
+        ...
+
+    def get_applied_hashes(self, playlist_ids: Sequence[str], rule_name: str) -> list[str | None]:
+        """`get_applied_hash` for several playlists in one round trip."""
+        ...
+
+    def set_applied_hashes(self, rule_name: str, content_hashes: Mapping[str, str]) -> None:
+        """`set_applied_hash` for several playlists (id -> hash) in one round trip."""
         ...
 
     def load_rule(self, name: str):
         """Return a callable rule object by name."""
         ...
+
+    def list_ids(self) -> Iterable[str]:
+        """Return the IDs of all stored playlists."""
+        ...
+
+
+class EntityRepo(Protocol):
+    """Artists and albums stored once each, keyed by (normalized) browse id."""
+
+    def upsert_artists(self, artists: Iterable[Artist]) -> int:
+        """Merge artists into the store. Returns how many entries changed."""
+        ...
+
+    def upsert_albums(self, albums: Iterable[Album]) -> int:
+        """Merge albums into the store. Returns how many entries changed."""
+        ...
+
+    def get_artists(self, ids: Sequence[str]) -> dict[str, Artist]:
+        """Fetch artists by id in one round trip (unknown ids are left out)."""
+        ...
+
+    def get_albums(self, ids: Sequence[str]) -> dict[str, Album]:
+        """Fetch albums by id in one round trip (unknown ids are left out)."""
+        ...
+
+    def list_artists(self) -> list[Artist]:
+        """Every stored artist."""
+        ...
+
+    def list_albums(self) -> list[Album]:
+        """Every stored album."""
+        ...
+
+
+class GraphRepo(Protocol):
+    def load(self) -> ArtistGraph | None:
+        """Fetch the persisted artist graph, or None if it was never built."""
+        ...
+
+    def save(self, graph: ArtistGraph) -> None:
+        """Persist the artist graph (including its compiled matrix)."""
+        ...
@@ -1,3 +1,27 @@
-from .playlist_service import PlaylistService
+import importlib
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["PlaylistService"]
+if TYPE_CHECKING:
+    from .graph_service import RelatedArtistsService
+    from .playlist_service import PlaylistService, SortResult
+    from .vibe_service import VibeService
+
+# Imported on first access: the vibe service pulls in numpy, which playlist jobs
+# (and `import sortune_core.services.playlist_service`) should not pay for
+_EXPORTS = {
+    "PlaylistService": "playlist_service",
+    "RelatedArtistsService": "graph_service",
+    "SortResult": "playlist_service",
+    "VibeService": "vibe_service",
+}
+
+__all__ = ["PlaylistService", "RelatedArtistsService", "SortResult", "VibeService"]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
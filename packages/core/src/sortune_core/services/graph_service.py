@@ -0,0 +1,39 @@
+from ..graph.cooccurrence import ArtistGraph, Neighbor
+from ..repos.ports import GraphRepo, PlaylistRepo
+
+
+class RelatedArtistsService:
+    """
+    Maintains the artist co-occurrence graph over stored playlists and answers
+    "related artists" queries from its persisted, pre-normalized rows.
+    """
+
+    def __init__(self, playlists: PlaylistRepo, graphs: GraphRepo):
+        self.playlists = playlists
+        self.graphs = graphs
+
+    def rebuild(self) -> ArtistGraph:
+        """Build the graph from scratch over every stored playlist and persist it."""
+        graph = ArtistGraph.build(self.playlists.get(pid) for pid in self.playlists.list_ids())
+        self.graphs.save(graph)
+        return graph
+
+    def refresh_playlist(self, playlist_id: str) -> ArtistGraph:
+        """
+        Incrementally fold one playlist's current contents into the graph.
+        A playlist that no longer has tracks is dropped from the graph.
+        """
+        graph = self.graphs.load()
+        if graph is None:
+            return self.rebuild()
+        pl = self.playlists.get(playlist_id)
+        changed = graph.upsert_playlist(pl) if pl.tracks else graph.remove_playlist(pl.id)
+        if changed:
+            self.graphs.save(graph)
+        return graph
+
+    def related(self, artist: str, k: int = 10) -> list[Neighbor]:
+        graph = self.graphs.load()
+        if graph is None:
+            return []
+        return graph.neighbors(artist, k=k)
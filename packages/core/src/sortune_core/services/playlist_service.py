@@ -1,6 +1,33 @@
+import time
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+
+from opentelemetry import trace
+
 from ..models.playlist import Playlist
 from ..repos.ports import PlaylistRepo, TrackRepo
 
+tracer = trace.get_tracer(__name__)
+
+
+@dataclass(frozen=True)
+class SortResult:
+    """Outcome of sorting one playlist in a batch run."""
+
+    playlist_id: str
+    count: int
+    changed: bool
+    sort_seconds: float
+
+
+def _apply_rule(rule, playlist: Playlist) -> tuple[Playlist, float]:
+    # Module-level so it can be pickled into a ProcessPoolExecutor
+    start = time.perf_counter()
+    playlist.tracks = list(rule.apply(playlist.tracks))
+    return playlist, time.perf_counter() - start
+
 
 class PlaylistService:
     """
@@ -8,14 +35,134 @@ class PlaylistService:
     Wraps repository access + rule application in one place.
     """
 
-    def __init__(self, tracks: TrackRepo, playlists: PlaylistRepo):
+    def __init__(self, tracks: TrackRepo | None, playlists: PlaylistRepo):
         self.tracks = tracks
         self.playlists = playlists
 
     def sort_playlist(self, playlist_id: str, rule_name: str) -> Playlist:
-        """Apply a sorting rule to a playlist and persist the result."""
-        pl = self.playlists.get(playlist_id)
+        """
+        Apply a sorting rule to a playlist and persist the result.
+
+        If the stored content hash equals the hash recorded the last time this rule
+        was applied, the playlist is already in that order: no sort, no write.
+        """
+        with tracer.start_as_current_span(
+            "PlaylistService.sort_playlist",
+            attributes={"sortune.playlist_id": playlist_id, "sortune.rule": rule_name},
+        ) as span:
+            rule = self.playlists.load_rule(rule_name)
+            current = self.playlists.get_hash(playlist_id)
+            pl = self.playlists.get(playlist_id)
+            span.set_attribute("sortune.tracks", len(pl.tracks))
+            if current is not None and current == self.playlists.get_applied_hash(
+                playlist_id, rule_name
+            ):
+                span.set_attribute("sortune.already_sorted", True)
+                return pl
+            with tracer.start_as_current_span("rule.apply", attributes={"sortune.rule": rule_name}):
+                pl.tracks = list(rule.apply(pl.tracks))
+            self.playlists.save(pl)
+            digest = self.playlists.get_hash(playlist_id)
+            if digest is not None:
+                self.playlists.set_applied_hash(playlist_id, rule_name, digest)
+            return pl
+
+    def dedupe_playlist(self, playlist_id: str) -> tuple[Playlist, int]:
+        """
+        Drop repeated tracks (same video id), keeping each one's first position, and
+        persist the result. Returns the playlist and how many entries were removed.
+        """
+        with tracer.start_as_current_span(
+            "PlaylistService.dedupe_playlist", attributes={"sortune.playlist_id": playlist_id}
+        ) as span:
+            pl = self.playlists.get(playlist_id)
+            seen: set[str] = set()
+            unique = []
+            for t in pl.tracks:
+                if t.id not in seen:
+                    seen.add(t.id)
+                    unique.append(t)
+            removed = len(pl.tracks) - len(unique)
+            span.set_attribute("sortune.removed", removed)
+            if removed:
+                pl.tracks = unique
+                self.playlists.save(pl)
+            return pl, removed
+
+    def sort_many(
+        self,
+        playlist_ids: Sequence[str],
+        rule_name: str,
+        *,
+        batch_size: int = 50,
+        executor: Executor | None = None,
+    ) -> Iterator[SortResult]:
+        """
+        Sort many playlists, streaming one `SortResult` per playlist as batches land.
+
+        Batch n+1 is fetched while batch n is sorted, each batch costs the same few
+        round trips whatever its size (hashes and playlists read, playlists and
+        applied-rule markers written, all batched), and sorting runs on `executor`
+        when given (a ProcessPoolExecutor spreads CPU-bound rules across cores; the
+        caller owns its lifecycle). As in `sort_playlist`, playlists still holding the
+        result of the last `rule_name` run are neither sorted nor written.
+        """
         rule = self.playlists.load_rule(rule_name)
-        pl.tracks = list(rule.apply(pl.tracks))
-        self.playlists.save(pl)
-        return pl
+        batches = [
+            list(playlist_ids[i : i + batch_size]) for i in range(0, len(playlist_ids), batch_size)
+        ]
+        if not batches:
+            return
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="sort-prefetch") as prefetch:
+            pending = prefetch.submit(self._fetch_batch, batches[0], rule_name)
+            for i in range(len(batches)):
+                playlists, applied = pending.result()
+                if i + 1 < len(batches):
+                    pending = prefetch.submit(self._fetch_batch, batches[i + 1], rule_name)
+                todo = [pl for pl in playlists if pl.id not in applied]
+
+                # One span per batch; a span left open across `yield` would parent
+                # whatever the consumer does meanwhile
+                with tracer.start_as_current_span(
+                    "PlaylistService.sort_batch",
+                    attributes={
+                        "sortune.rule": rule_name,
+                        "sortune.playlists": len(playlists),
+                        "sortune.already_sorted": len(playlists) - len(todo),
+                    },
+                ):
+                    if executor is None:
+                        done = [_apply_rule(rule, pl) for pl in todo]
+                    else:
+                        done = list(executor.map(_apply_rule, repeat(rule), todo))
+                    written = self.playlists.save_many([pl for pl, _ in done])
+                    sorted_ids = [pl.id for pl, _ in done]
+                    digests = self.playlists.get_hashes(sorted_ids)
+                    self.playlists.set_applied_hashes(
+                        rule_name,
+                        {
+                            pid: d
+                            for pid, d in zip(sorted_ids, digests, strict=True)
+                            if d is not None
+                        },
+                    )
+                results = {
+                    pl.id: SortResult(pl.id, len(pl.tracks), changed, seconds)
+                    for (pl, seconds), changed in zip(done, written, strict=True)
+                }
+                for pl in playlists:
+                    yield results.get(pl.id) or SortResult(pl.id, len(pl.tracks), False, 0.0)
+
+    def _fetch_batch(
+        self, playlist_ids: list[str], rule_name: str
+    ) -> tuple[list[Playlist], set[str]]:
+        """A batch of playlists, and the ids of those `rule_name` was already applied to."""
+        current = self.playlists.get_hashes(playlist_ids)
+        applied = self.playlists.get_applied_hashes(playlist_ids, rule_name)
+        done = {
+            pid
+            for pid, c, a in zip(playlist_ids, current, applied, strict=True)
+            if c is not None and c == a
+        }
+        return self.playlists.get_many(playlist_ids), done
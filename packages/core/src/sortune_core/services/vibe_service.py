@@ -0,0 +1,29 @@
+from ..recommend.vibe import Recommendation, TrackIndex
+from ..repos.ports import PlaylistRepo
+
+
+class VibeService:
+    """
+    "Fill the vibe": suggest on-theme tracks from the user's own library.
+    The index is built once from every stored playlist and reused across queries.
+    """
+
+    def __init__(self, playlists: PlaylistRepo, index: TrackIndex | None = None):
+        self.playlists = playlists
+        self._index = index
+
+    @property
+    def index(self) -> TrackIndex:
+        if self._index is None:
+            self._index = self.build_index()
+        return self._index
+
+    def build_index(self) -> TrackIndex:
+        return TrackIndex.build(
+            t for pid in self.playlists.list_ids() for t in self.playlists.get(pid).tracks
+        )
+
+    def fill(self, playlist_id: str, k: int = 20) -> list[Recommendation]:
+        """Return up to k library tracks like `playlist_id` that it doesn't already hold."""
+        pl = self.playlists.get(playlist_id)
+        return self.index.similar(pl.tracks, k=k)
@@ -0,0 +1,56 @@
+"""
+Benchmark: cold vs warm YTMusicClient response cache (roadmap: warm >= 10x faster).
+
+Uses the offline ytmusicapi stand-in (sortune_adapters.ytmusic.fake, fixed per-call
+latency) and a throwaway SQLite cache file.
+
+Usage:
+    uv run python scripts/bench_cache.py --playlists 50 --tracks 200 --latency 0.15
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from sortune_adapters.ytmusic.cache import ResponseCache
+from sortune_adapters.ytmusic.client import YTMusicClient
+from sortune_adapters.ytmusic.fake import FakeYTMusic
+
+
+def sync_library(client: YTMusicClient) -> int:
+    tracks = 0
+    for summary in client.list_library_playlists(limit=500):
+        tracks += len(client.get_playlist_tracks(summary["playlistId"]))
+    return tracks
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--playlists", type=int, default=50)
+    p.add_argument("--tracks", type=int, default=200)
+    p.add_argument("--latency", type=float, default=0.15)
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(Path(tmp) / "yt.sqlite")
+        fake = FakeYTMusic(args.playlists, args.tracks, latency=args.latency)
+        client = YTMusicClient(yt=fake, cache=cache)
+
+        start = time.perf_counter()
+        n = sync_library(client)
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sync_library(client)
+        warm = time.perf_counter() - start
+        cache.close()
+
+    print(f"{args.playlists} playlists, {n} tracks")
+    print(f"cold: {cold:6.2f}s")
+    print(f"warm: {warm:6.2f}s")
+    print(f"speed-up: {cold / warm:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: serial vs concurrent library import against a local ytmusicapi fake.
+
+The fake (sortune_adapters.ytmusic.fake) answers after a fixed latency, throttles
+(HTTP 429) when called faster than its quota and can inject HTTP 500s, so the
+numbers reflect I/O overlap and back-off, not network noise. Storage is fakeredis.
+
+Usage:
+    uv run python scripts/bench_import.py --playlists 300 --latency 0.15
+    uv run python scripts/bench_import.py --error-rate 0.05 --fixtures .
+"""
+
+import argparse
+import time
+
+import fakeredis
+from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
+from sortune_adapters.ytmusic.client import YTMusicClient
+from sortune_adapters.ytmusic.fake import FakeUpstreamError, FakeYTMusic
+from sortune_adapters.ytmusic.importer import LibraryImporter
+from sortune_adapters.ytmusic.ratelimit import AIMDRateLimiter
+from sortune_core.models.playlist import Playlist
+
+
+def serial(client: YTMusicClient, repo: RedisPlaylistRepo) -> float:
+    """The original import_yt.py loop: fetch then save, one playlist at a time."""
+    start = time.perf_counter()
+    for summary in client.list_library_playlists(limit=500):
+        while True:
+            try:
+                tracks = client.get_playlist_tracks(summary["playlistId"])
+                break
+            except FakeUpstreamError:
+                time.sleep(0.5)
+        playlist = Playlist.model_validate(summary)
+        playlist.tracks = tracks
+        repo.save(playlist)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--playlists", type=int, default=300)
+    p.add_argument("--tracks", type=int, default=50)
+    p.add_argument("--latency", type=float, default=0.15, help="seconds per get_playlist")
+    p.add_argument("--quota", type=float, default=30.0, help="upstream requests/second")
+    p.add_argument("--workers", type=int, default=8)
+    p.add_argument("--error-rate", type=float, default=0.0, help="share of calls failing (500)")
+    p.add_argument("--fixtures", help="directory with recorded *_data_example.json responses")
+    args = p.parse_args()
+
+    def fresh():
+        fake = FakeYTMusic(
+            args.playlists,
+            args.tracks,
+            latency=args.latency,
+            quota_per_sec=args.quota,
+            error_rate=args.error_rate,
+            fixtures=args.fixtures,
+        )
+        return YTMusicClient(yt=fake), RedisPlaylistRepo(fakeredis.FakeRedis())
+
+    client, repo = fresh()
+    t_serial = serial(client, repo)
+
+    client, repo = fresh()
+    importer = LibraryImporter(
+        client,
+        repo,
+        max_workers=args.workers,
+        limiter=AIMDRateLimiter(rate=10, max_rate=args.quota * 1.5, burst=args.workers),
+    )
+    report = importer.run(client.list_library_playlists(limit=500))
+
+    n = args.playlists
+    print(f"serial:     {t_serial:6.2f}s  ({n / t_serial:5.1f} playlists/s)")
+    print(
+        f"concurrent: {report.seconds:6.2f}s  ({report.playlists_per_second:5.1f} playlists/s, "
+        f"{report.throttled} throttled, {len(report.failed)} failed)"
+    )
+    print(f"speed-up:   {t_serial / report.seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
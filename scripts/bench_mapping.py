@@ -0,0 +1,122 @@
+"""
+Benchmark: per-track `_to_track` vs batch `map_tracks` on a 5k-track get_playlist response.
+
+Pass a recorded response with --response (e.g. the JSON dump of
+`YTMusic(...).get_playlist(pid, limit=None)`); without one, a deterministic
+response with the same shape is generated, with a share of unavailable tracks
+(no videoId) so the reject path is exercised too. Both paths log to /dev/null and
+run with the garbage collector paused, so the numbers are mapping cost only.
+
+Usage:
+    uv run python scripts/bench_mapping.py --tracks 5000 --repeat 20
+    uv run python scripts/bench_mapping.py --unavailable 0.1
+    uv run python scripts/bench_mapping.py --response cache/playlist.json
+"""
+
+import argparse
+import copy
+import gc
+import json
+import logging
+import os
+import time
+
+from sortune_adapters.ytmusic.client import YTMusicClient, map_tracks
+
+log = logging.getLogger("sortune_adapters.ytmusic.client")
+
+
+def synthetic_response(n: int, unavailable: float = 0.01) -> dict:
+    every = max(1, round(1 / unavailable)) if unavailable > 0 else 0
+
+    def track(j: int) -> dict:
+        return {
+            "videoId": None if every and j % every == 0 else f"vid{j:07d}",
+            "title": f"Track {j}",
+            "artists": [
+                {"name": f"Artist {j % 211}", "id": f"UC{j % 211:022d}"},
+                *([{"name": f"Feat {j % 13}", "id": None}] if j % 4 == 0 else []),
+            ],
+            "album": {"name": f"Album {j % 503}", "id": f"MPREb_{j % 503:011d}"},
+            "likeStatus": "INDIFFERENT",
+            "inLibrary": None if j % 3 else True,
+            "thumbnails": [
+                {
+                    "url": f"https://lh3.googleusercontent.com/{j}=w60-h60",
+                    "width": 60,
+                    "height": 60,
+                },
+                {"url": f"https://lh3.googleusercontent.com/{j}=w120", "width": 120, "height": 120},
+            ],
+            "isAvailable": not every or j % every != 0,
+            "isExplicit": j % 11 == 0,
+            "videoType": "MUSIC_VIDEO_TYPE_ATV",
+            "duration": f"{3 + j % 3}:{j % 60:02d}",
+            "duration_seconds": 180 + j % 180,
+            "setVideoId": f"{j:016X}",
+            "feedbackTokens": {"add": f"add{j}", "remove": f"rm{j}"},
+        }
+
+    return {
+        "id": "PLbench",
+        "title": "Bench",
+        "trackCount": n,
+        "tracks": [track(j) for j in range(n)],
+    }
+
+
+def per_track(raw: list[dict]) -> int:
+    # The previous mapping loop (each dict mutated, validated and logged individually)
+    out = []
+    for t in raw:
+        try:
+            out.append(YTMusicClient._to_track(t))
+        except Exception:
+            log.warning("Skipping track with missing videoId: %s", t.get("title"))
+    return len(out)
+
+
+def timed(fn, *args) -> tuple[float, object]:
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        result = fn(*args)
+        return time.perf_counter() - start, result
+    finally:
+        gc.enable()
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--tracks", type=int, default=5000)
+    p.add_argument("--repeat", type=int, default=20)
+    p.add_argument("--unavailable", type=float, default=0.01, help="Share of tracks w/o videoId")
+    p.add_argument("--response", help="Recorded get_playlist JSON response")
+    args = p.parse_args()
+
+    if args.response:
+        with open(args.response, encoding="utf-8") as fh:
+            response = json.load(fh)
+    else:
+        response = synthetic_response(args.tracks, args.unavailable)
+    raw = response["tracks"]
+    logging.basicConfig(handlers=[logging.FileHandler(os.devnull)], level=logging.WARNING)
+
+    old, new = [], []
+    for _ in range(args.repeat):
+        data = copy.deepcopy(raw)  # _to_track mutates its input
+        seconds, kept_old = timed(per_track, data)
+        old.append(seconds)
+        seconds, batch = timed(map_tracks, raw)
+        new.append(seconds)
+
+    assert kept_old == len(batch.tracks)
+    print(f"{len(raw)} tracks, {len(batch.rejects)} rejected, best of {args.repeat}")
+    print(f"per-track : {min(old) * 1000:7.1f} ms")
+    print(f"batch     : {min(new) * 1000:7.1f} ms")
+    print(f"speed-up  : {min(old) / min(new):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: GET /playlists/{id} for a large playlist, before/after the fast response path.
+
+"before" serves the playlist the previous way (models loaded from Redis, returned
+through FastAPI's `response_model`, no compression); "after" is the real app route
+(stored JSON rendered with orjson, gzip above SORTUNE_GZIP_MINIMUM_SIZE), plus the
+NDJSON track stream and `?fields=` projections. Uses fakeredis and tracks cycled
+from track_data_example.json.
+
+Usage:
+    uv run python scripts/bench_responses.py --tracks 10000
+"""
+
+import argparse
+import importlib
+import json
+import statistics
+import time
+from pathlib import Path
+
+import fakeredis
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
+from sortune_adapters.ytmusic.client import map_tracks
+from sortune_api.main import app
+from sortune_core.models.playlist import Playlist
+
+playlists_module = importlib.import_module("sortune_api.routes.playlists")
+FIELDS = "fields=tracks.id,tracks.title,tracks.artists.name"
+
+
+def build_repo(n_tracks: int) -> RedisPlaylistRepo:
+    templates = json.loads(Path("track_data_example.json").read_text(encoding="utf-8"))
+    raw = [dict(templates[i % len(templates)], videoId=f"v{i:010d}") for i in range(n_tracks)]
+    repo = RedisPlaylistRepo(fakeredis.FakeRedis())
+    repo.save(Playlist(playlistId="big", title="Big", tracks=map_tracks(raw).tracks))
+    return repo
+
+
+def baseline_app(repo: RedisPlaylistRepo) -> FastAPI:
+    before = FastAPI()
+
+    @before.get("/playlists/{playlist_id}", response_model=Playlist)
+    def get_playlist(playlist_id: str):
+        return repo.get(playlist_id)
+
+    return before
+
+
+def measure(client: TestClient, path: str, headers: dict, runs: int) -> tuple[float, str]:
+    times, size = [], ""
+    for _ in range(runs):
+        start = time.perf_counter()
+        res = client.get(path, headers=headers)
+        times.append(time.perf_counter() - start)
+        # Streamed responses have no Content-Length; TestClient only shows them decoded
+        wire = res.headers.get("content-length")
+        size = f"{int(wire) / 1e6:7.2f} MB" if wire else f"{len(res.content) / 1e6:7.2f} MB decoded"
+    return statistics.median(times) * 1000, size
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--tracks", type=int, default=10_000)
+    p.add_argument("--runs", type=int, default=7)
+    args = p.parse_args()
+
+    repo = build_repo(args.tracks)
+    app.dependency_overrides[playlists_module.get_repo] = lambda: repo
+    # TestClient decodes gzip itself; ask for it explicitly and report the wire size
+    plain = {"Accept-Encoding": "identity"}
+    gzip = {"Accept-Encoding": "gzip"}
+
+    rows = [
+        ("before (response_model)", TestClient(baseline_app(repo)), "/playlists/big", plain),
+        ("after (orjson)", TestClient(app), "/playlists/big", plain),
+        ("after (orjson + gzip)", TestClient(app), "/playlists/big", gzip),
+        ("after NDJSON tracks + gzip", TestClient(app), "/playlists/big/tracks", gzip),
+        ("after ?fields= (id,title,artists)", TestClient(app), f"/playlists/big?{FIELDS}", plain),
+        ("after ?fields=title (no tracks)", TestClient(app), "/playlists/big?fields=title", plain),
+    ]
+    print(f"{args.tracks} tracks, median of {args.runs} runs")
+    for label, client, path, headers in rows:
+        client.get(path, headers=headers)  # warm up
+        ms, size = measure(client, path, headers, args.runs)
+        print(f"  {label:<34} {ms:8.1f} ms  {size}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ Usage:
 
 from redis import Redis
 from rq import Queue
+from sortune_adapters.jobs import enqueue_once
 from sortune_worker.jobs.demo import backfill_demo_playlist
 
 
@@ -14,8 +15,11 @@ def main():
     r = Redis.from_url(redis_url)
     q = Queue("default", connection=r)
 
-    job = q.enqueue(backfill_demo_playlist)
-    print(f"Enqueued job {job.id} to backfill demo playlist")
+    job, created = enqueue_once(q, "demo", backfill_demo_playlist)
+    if created:
+        print(f"Enqueued job {job.id} to backfill demo playlist")
+    else:
+        print(f"Demo backfill already queued or running as job {job.id}")
 
 
 if __name__ == "__main__":
@@ -16,7 +16,7 @@ if __name__ == "__main__":
         raise SystemExit(2)
     r = Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
     repo = RedisPlaylistRepo(r)
-    tracks = YTMusicClient().get_playlist_tracks(pid)
+    tracks = YTMusicClient().get_playlist_tracks(pid, refresh=True)
     name = os.getenv("YT_PLAYLIST_NAME") or f"YT:{pid}"
     repo.save(Playlist(id=pid, name=name, tracks=tracks))
     print(f"Imported {len(tracks)} tracks into Redis as {name}")
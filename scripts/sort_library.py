@@ -0,0 +1,84 @@
+"""
+Re-sort many stored playlists in one go (nightly batch).
+
+Usage:
+    uv run python scripts/sort_library.py                 # all playlists, by_title
+    uv run python scripts/sort_library.py PL1 PL2 --rule by_title --workers 4
+    uv run python scripts/sort_library.py --enqueue       # hand off to the RQ worker
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from redis import Redis
+from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
+from sortune_core.services.playlist_service import PlaylistService
+
+# sort_many prefetches on a thread; spawn workers instead of forking a threaded process
+_SPAWN = get_context("spawn")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("ids", nargs="*", help="Playlist IDs (default: all stored playlists)")
+    parser.add_argument("--rule", default="by_title")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=None, help="0 = sort inline")
+    parser.add_argument("--enqueue", action="store_true", help="Enqueue an RQ job instead")
+    args = parser.parse_args()
+
+    r = Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+
+    if args.enqueue:
+        from rq import Queue
+        from sortune_adapters.jobs import enqueue_once
+        from sortune_worker.jobs.sort import sort_library
+        from sortune_worker.queues import DEFAULT
+
+        job, created = enqueue_once(
+            Queue(DEFAULT, connection=r),
+            "sort_library",
+            sort_library,
+            kwargs={
+                "playlist_ids": args.ids or None,
+                "rule_name": args.rule,
+                "batch_size": args.batch_size,
+                "workers": args.workers,
+            },
+        )
+        if created:
+            print(f"Enqueued job {job.id} to sort with rule '{args.rule}'")
+        else:
+            print(f"The same sort is already queued or running as job {job.id}")
+        return
+
+    repo = RedisPlaylistRepo(r)
+    svc = PlaylistService(tracks=None, playlists=repo)
+    ids = args.ids or repo.list_ids()
+
+    start = time.perf_counter()
+    changed = 0
+    pool = (
+        ProcessPoolExecutor(max_workers=args.workers, mp_context=_SPAWN)
+        if args.workers != 0
+        else None
+    )
+    try:
+        for res in svc.sort_many(ids, args.rule, batch_size=args.batch_size, executor=pool):
+            changed += res.changed
+            status = "sorted" if res.changed else "unchanged"
+            print(
+                f"{res.playlist_id}: {status}, {res.count} tracks, "
+                f"{res.sort_seconds * 1000:.1f} ms"
+            )
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    print(f"Done: {len(ids)} playlists, {changed} changed in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
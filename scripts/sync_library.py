@@ -0,0 +1,58 @@
+"""
+Incrementally sync the YouTube Music library into Redis.
+
+Only playlists whose library markers (track count, title, description) changed
+since the last sync are re-fetched. Prints a report with per-phase timing and the
+slowest playlists.
+
+Usage:
+    uv run python scripts/sync_library.py          # incremental
+    uv run python scripts/sync_library.py --full   # re-fetch everything
+    uv run python scripts/sync_library.py --entities   # also ingest library albums/artists
+"""
+
+import argparse
+import logging
+import os
+
+from redis import Redis
+from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
+from sortune_adapters.ytmusic.client import YTMusicClient
+from sortune_adapters.ytmusic.sync import LibrarySync
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Incremental YouTube Music library sync")
+    parser.add_argument("--full", action="store_true", help="Ignore stored change markers")
+    parser.add_argument(
+        "--entities", action="store_true", help="Also ingest library albums and artists"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    repo = RedisPlaylistRepo(Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0")))
+    report = LibrarySync(YTMusicClient(), repo).run(full=args.full, entities=args.entities)
+
+    print(
+        f"listed {report.listed}, skipped {report.skipped} unchanged, fetched {report.fetched}, "
+        f"wrote {report.written}, failed {report.failed}, "
+        f"auto-generated {report.auto_generated}, gone {len(report.gone)}"
+    )
+    if args.entities:
+        print(
+            f"entities: {report.artists} artists, {report.albums} albums, "
+            f"{report.entities_changed} changed"
+        )
+    print(
+        f"time: list {report.list_seconds:.2f}s, fetch {report.fetch_seconds:.2f}s, "
+        f"write {report.write_seconds:.2f}s, total {report.seconds:.2f}s"
+    )
+    for item in report.slowest():
+        detail = item.error or (
+            f"+{item.added} -{item.removed}" + (" reordered" if item.reordered else "")
+        )
+        print(f"  {item.playlist_id}: {item.fetch_seconds:.2f}s ({item.reason}; {detail})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,4 @@
-import json
 import os
-from typing import Any
 
 from dotenv import load_dotenv
 from langchain_core.output_parsers import JsonOutputParser
@@ -8,6 +6,8 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_ollama import ChatOllama  # Local Ollama backend
 from langchain_openai import ChatOpenAI  # OpenAI GPT backend
 from pydantic import BaseModel, Field
+from redis import Redis
+from sortune_adapters.storage.redis_entities import RedisEntityRepo
 
 load_dotenv()
 
@@ -105,21 +105,13 @@ def suggest_playlist_names(
     )
 
 
-def get_data_from_cache(cache_file_name: str) -> list[dict[str, Any]]:
-    if not os.path.exists(os.path.join("cache", cache_file_name)):
-        return None
-    filepath = os.path.join("cache", cache_file_name)
-    with open(filepath) as f:
-        return json.load(f)
-
-
 # --------- Example usage ---------
 if __name__ == "__main__":
-    albums_list = get_data_from_cache("albums.json")
-    artists_list = get_data_from_cache("artists.json")
+    # Filled by list_playlists.py (or scripts/sync_library.py --entities)
+    entities = RedisEntityRepo(Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0")))
 
-    albums = [album["title"] for album in albums_list]
-    artists = [artist["artist"] for artist in artists_list]
+    albums = [album.name for album in entities.list_albums(library=True)]
+    artists = [artist.name for artist in entities.list_artists(library=True)]
 
     print(f"Albums:\n{albums}\n")
     print(f"Artists:\n{artists}\n")
@@ -4,33 +4,79 @@ import pytest
 from fastapi.testclient import TestClient
 from sortune_api.main import app
 from sortune_core.models.playlist import Playlist, Track
+from sortune_core.models.projection import Fields, project
 
 # Import the routes module once so we can override its dependency + YT client
 playlists_module = importlib.import_module("sortune_api.routes.playlists")
 
 
+class InMemoryStreamWriter:
+    """Collects appended pages and saves them through the repo on commit."""
+
+    def __init__(self, repo: "InMemoryPlaylistRepo", playlist: Playlist):
+        self.repo = repo
+        self.playlist = playlist.model_copy(update={"tracks": []})
+
+    def append(self, tracks) -> int:
+        self.playlist.tracks.extend(tracks)
+        return len(self.playlist.tracks)
+
+    def commit(self) -> bool:
+        return self.repo.save(self.playlist)
+
+    def abort(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
 class InMemoryPlaylistRepo:
     """Tiny in-memory stand-in for RedisPlaylistRepo used by the API routes."""
 
     def __init__(self):
         self.store: dict[str, Playlist] = {}
+        self.hashes: dict[str, str] = {}
+        self.applied: dict[tuple[str, str], str] = {}
 
     # Matches the adapter's interface
     def get(self, playlist_id: str) -> Playlist:
         # Return an existing playlist or a placeholder so callers can mutate & save
-        return self.store.get(
-            playlist_id,
-            Playlist.model_validate(
-                {
-                    "playlistId": playlist_id,
-                    "title": f"Playlist {playlist_id}",
-                    "tracks": [],
-                }
-            ),
+        if playlist_id in self.store:
+            return self.store[playlist_id].model_copy(deep=True)
+        return Playlist.model_validate(
+            {
+                "playlistId": playlist_id,
+                "title": f"Playlist {playlist_id}",
+                "tracks": [],
+            }
         )
 
-    def save(self, playlist: Playlist) -> None:
-        self.store[playlist.id] = playlist
+    def save(self, playlist: Playlist) -> bool:
+        digest = playlist.content_hash()
+        if self.hashes.get(playlist.id) == digest:
+            return False
+        self.store[playlist.id] = playlist.model_copy(deep=True)
+        self.hashes[playlist.id] = digest
+        return True
+
+    def get_document(self, playlist_id: str, fields: Fields | None = None) -> dict:
+        return project(self.get(playlist_id).model_dump(by_alias=True), fields)
+
+    def open_stream(self, playlist: Playlist) -> InMemoryStreamWriter:
+        return InMemoryStreamWriter(self, playlist)
+
+    def get_hash(self, playlist_id: str) -> str | None:
+        return self.hashes.get(playlist_id)
+
+    def get_applied_hash(self, playlist_id: str, rule_name: str) -> str | None:
+        return self.applied.get((playlist_id, rule_name))
+
+    def set_applied_hash(self, playlist_id: str, rule_name: str, content_hash: str) -> None:
+        self.applied[(playlist_id, rule_name)] = content_hash
 
     def load_rule(self, name: str):
         from sortune_core.rules.simple import ByTitle
@@ -83,24 +129,34 @@ def client(repo: InMemoryPlaylistRepo):
 
 
 @pytest.fixture()
-def fake_yt(monkeypatch):
+def fake_yt():
     """
-    Monkeypatch the YTMusicClient used INSIDE the routes module so any call to
+    Override the routes' YTMusicClient dependency so any call to
     /playlists/.../live uses this fake instead of hitting OAuth/network.
     """
 
     class FakeYT:
+        last_version = None  # uncached, so no ETags or 304s
+
         def __init__(self, *_, **__):
             pass
 
-        def list_library_playlists(self, limit: int = 200) -> list[dict]:
+        def library_playlists_version(self, limit: int = 200) -> str | None:
+            return None
+
+        def playlist_version(self, playlist_id: str, limit: int | None = None) -> str | None:
+            return None
+
+        def list_library_playlists(self, limit: int = 200, **_) -> list[dict]:
             items = [
                 {"playlistId": "PL123", "title": "Road Trip", "count": 3, "thumbnails": []},
                 {"playlistId": "PL999", "title": "Focus Mix", "count": 2, "thumbnails": []},
             ]
             return items[:limit]
 
-        def get_playlist_tracks(self, playlist_id: str, limit: int | None = None) -> list[Track]:
+        def get_playlist_tracks(
+            self, playlist_id: str, limit: int | None = None, **_
+        ) -> list[Track]:
             tracks_data = [
                 {
                     "videoId": "vid1",
@@ -120,9 +176,19 @@ def fake_yt(monkeypatch):
             tracks = [Track.model_validate(t) for t in tracks_data]
             return tracks[:limit] if limit else tracks
 
-    # IMPORTANT: patch the symbol as imported by the routes module
-    monkeypatch.setattr(playlists_module, "YTMusicClient", lambda *a, **k: FakeYT())
-    return FakeYT
+        def iter_playlist_tracks(
+            self, playlist_id: str, limit: int | None = None, *, page_size: int = 500, **_
+        ):
+            tracks = self.get_playlist_tracks(playlist_id, limit)
+            for start in range(0, len(tracks), page_size):
+                yield tracks[start : start + page_size]
+
+    # Live routes get their client through this dependency (normally the pool)
+    app.dependency_overrides[playlists_module.get_yt_client] = lambda: FakeYT()
+    try:
+        yield FakeYT
+    finally:
+        app.dependency_overrides.pop(playlists_module.get_yt_client, None)
 
 
 @pytest.fixture()
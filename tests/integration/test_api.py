@@ -1,3 +1,6 @@
+import json
+
+
 def test_health(client):
     res = client.get("/health")
     assert res.status_code == 200
@@ -34,3 +37,103 @@ def test_sort_playlist_unsupported_rule(client):
     res = client.post("/playlists/demo/sort", params={"rule_name": "not_a_rule"})
     assert res.status_code == 400
     assert "Unsupported rule" in res.json()["detail"]
+
+
+def test_get_playlist_returns_content_hash_etag(client, repo):
+    res = client.get("/playlists/demo")
+    assert res.headers["ETag"] == f'"{repo.get_hash("demo")}"'
+
+
+def test_sort_playlist_twice_is_noop(client, repo):
+    first = client.post("/playlists/demo/sort", params={"rule_name": "by_title"})
+    assert first.json()["changed"] is True
+    etag = first.headers["ETag"]
+
+    second = client.post("/playlists/demo/sort", params={"rule_name": "by_title"})
+    assert second.json()["changed"] is False
+    assert second.headers["ETag"] == etag
+
+
+def test_get_playlist_if_none_match_returns_304_without_loading(client, repo, monkeypatch):
+    etag = client.get("/playlists/demo").headers["ETag"]
+
+    def no_load(playlist_id):
+        raise AssertionError("304 path must not load the playlist")
+
+    monkeypatch.setattr(repo, "get", no_load)
+    res = client.get("/playlists/demo", headers={"If-None-Match": f'W/{etag}, "other"'})
+    assert res.status_code == 304
+    assert res.headers["ETag"] == etag
+    assert res.content == b""
+
+
+def test_get_playlist_changed_etag_returns_body(client, repo):
+    etag = client.get("/playlists/demo").headers["ETag"]
+    client.post("/playlists/demo/sort", params={"rule_name": "by_title"})
+
+    res = client.get("/playlists/demo", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+    assert res.json()["tracks"][0]["title"] == "A Song"
+
+
+def test_get_playlist_body_matches_model_dump(client, repo):
+    res = client.get("/playlists/demo")
+    assert res.headers["content-type"] == "application/json"
+    assert res.json() == repo.get("demo").model_dump(mode="json", by_alias=True)
+
+
+def test_playlist_tracks_stream_as_ndjson(client, repo):
+    res = client.get("/playlists/demo/tracks")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    lines = res.text.splitlines()
+    assert [json.loads(line)["videoId"] for line in lines] == ["2", "1"]
+
+    etag = res.headers["ETag"]
+    assert client.get("/playlists/demo/tracks", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_large_responses_are_gzipped(client, repo):
+    demo = repo.get("demo")
+    repo.save(demo.model_copy(update={"tracks": demo.tracks * 50}))
+
+    res = client.get("/playlists/demo", headers={"Accept-Encoding": "gzip"})
+    assert res.headers["content-encoding"] == "gzip"
+    assert len(res.json()["tracks"]) == 100
+
+    small = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+
+def test_get_playlist_fields_projection(client):
+    full = client.get("/playlists/demo")
+    res = client.get("/playlists/demo", params={"fields": "title,tracks.id,tracks.artists.name"})
+    assert res.status_code == 200
+    assert res.json() == {
+        "title": "Demo",
+        "tracks": [
+            {"videoId": "2", "artists": [{"name": "Artist"}]},
+            {"videoId": "1", "artists": [{"name": "Artist"}]},
+        ],
+    }
+    # Each projection is its own representation, with its own ETag
+    etag = res.headers["ETag"]
+    assert etag != full.headers["ETag"]
+    again = client.get(
+        "/playlists/demo",
+        params={"fields": "tracks.artists.name,tracks.videoId,title"},
+        headers={"If-None-Match": etag},
+    )
+    assert again.status_code == 304
+
+    bad = client.get("/playlists/demo", params={"fields": "tracks.nope"})
+    assert bad.status_code == 400
+
+
+def test_playlist_tracks_stream_fields_projection(client):
+    res = client.get("/playlists/demo/tracks", params={"fields": "id,title"})
+    assert [json.loads(line) for line in res.text.splitlines()] == [
+        {"videoId": "2", "title": "b Song"},
+        {"videoId": "1", "title": "A Song"},
+    ]
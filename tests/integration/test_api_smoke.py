@@ -1,3 +1,9 @@
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
 from fastapi.testclient import TestClient
 from sortune_api.main import app
 
@@ -7,3 +13,29 @@ def test_health_endpoint_smoke():
     res = client.get("/health")
     assert res.status_code == 200
     assert res.json() == {"status": "ok"}
+
+
+def test_api_imports_with_the_example_env_file(tmp_path):
+    # The README's `cp .env.example .env`: keys for the worker/UI/adapters must not trip Settings
+    shutil.copy(Path(__file__).parents[2] / ".env.example", tmp_path / ".env")
+    proc = subprocess.run(
+        [sys.executable, "-c", "import sortune_api.main"],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0, proc.stderr
+
+
+def test_api_reads_the_env_file(tmp_path):
+    (tmp_path / ".env").write_text("REDIS_URL=redis://from-dotenv:6400/3\n")
+    code = (
+        "from sortune_api.main import app\n"
+        "from sortune_api.routes.playlists import get_redis\n"
+        "print(get_redis().connection_pool.connection_kwargs['host'])"
+    )
+    env = {k: v for k, v in os.environ.items() if k != "REDIS_URL"}
+    proc = subprocess.run(
+        [sys.executable, "-c", code], cwd=tmp_path, env=env, capture_output=True, text=True
+    )
+    assert proc.stdout.strip() == "from-dotenv", proc.stderr
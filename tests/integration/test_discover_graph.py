@@ -0,0 +1,75 @@
+import pytest
+
+try:
+    import fakeredis
+except Exception:  # pragma: no cover
+    fakeredis = None
+
+from fastapi.testclient import TestClient
+from sortune_adapters.storage.redis_graph import RedisGraphRepo
+from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
+from sortune_api.main import app
+from sortune_api.routes import discover
+from sortune_core.models.playlist import Playlist
+from sortune_core.services.graph_service import RelatedArtistsService
+from sortune_core.services.vibe_service import VibeService
+
+
+def _pl(pid: str, *artists: str) -> Playlist:
+    return Playlist.model_validate(
+        {
+            "playlistId": pid,
+            "title": pid,
+            "tracks": [
+                {"videoId": f"{pid}-{a}", "title": a, "artists": [{"name": a}]} for a in artists
+            ],
+        }
+    )
+
+
+@pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+def test_rebuild_then_incremental_refresh_via_api():
+    r = fakeredis.FakeRedis()
+    playlists = RedisPlaylistRepo(r)
+    playlists.save(_pl("p1", "Alice", "Bob"))
+    playlists.save(_pl("p2", "Alice", "Carol"))
+    svc = RelatedArtistsService(playlists, RedisGraphRepo(r))
+
+    app.dependency_overrides[discover.get_graph_service] = lambda: svc
+    try:
+        client = TestClient(app)
+        res = client.post("/discover/graph/rebuild")
+        assert res.json() == {"status": "ok", "artists": 3, "playlists": 2}
+
+        res = client.get("/discover/artists/related", params={"artist": "Bob"})
+        assert res.status_code == 200
+        assert [i["name"] for i in res.json()["items"]] == ["Alice"]
+
+        playlists.save(_pl("p3", "Bob", "Dave"))
+        client.post("/discover/graph/rebuild", params={"playlist_id": "p3"})
+        res = client.get("/discover/artists/related", params={"artist": "Bob", "k": 5})
+        assert {i["name"] for i in res.json()["items"]} == {"Alice", "Dave"}
+
+        assert client.get("/discover/artists/related", params={"artist": "Zed"}).status_code == 404
+    finally:
+        app.dependency_overrides.pop(discover.get_graph_service, None)
+
+
+@pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+def test_fill_the_vibe_endpoint():
+    r = fakeredis.FakeRedis()
+    playlists = RedisPlaylistRepo(r)
+    playlists.save(_pl("seed", "Alice"))
+    playlists.save(_pl("library", "Alice", "Bob", "Carol"))
+    svc = VibeService(playlists)
+
+    app.dependency_overrides[discover.get_vibe_service] = lambda: svc
+    try:
+        res = TestClient(app).get("/discover/playlists/seed/fill", params={"k": 2})
+        assert res.status_code == 200
+        body = res.json()
+        assert body["playlist"] == "seed"
+        assert len(body["items"]) == 2
+        assert body["items"][0]["track"]["videoId"] == "library-Alice"
+    finally:
+        app.dependency_overrides.pop(discover.get_vibe_service, None)
@@ -0,0 +1,46 @@
+"""
+Cold-start budget for the API and worker processes, measured with `python -X importtime`
+in a fresh interpreter. Heavy optional stacks (LLM providers, ytmusicapi, numpy) must
+only load on first use; the time budgets are loose (about 2x a typical run) so only
+real regressions trip them.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+# Loaded by the first request/job that needs them, never at start-up
+LAZY = ("langchain", "langchain_core", "langchain_openai", "openai", "tiktoken", "ytmusicapi")
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """Cumulative import time (µs) of every module loaded by importing `module`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times.setdefault(name.strip(), int(cumulative))
+    return times
+
+
+@pytest.mark.parametrize(
+    "module, budget_ms, also_lazy",
+    [
+        ("sortune_api.main", 1500, ("numpy", "sortune_ai.factory")),
+        ("sortune_worker.__main__", 500, ("sortune_adapters", "prometheus_client")),
+        ("sortune_worker.jobs.playlists", 1000, ("numpy", "dotenv")),
+    ],
+)
+def test_cold_import_stays_lean(module, budget_ms, also_lazy):
+    times = _import_times(module)
+    loaded = [m for m in (*LAZY, *also_lazy) if m in times]
+    assert not loaded, f"{module} imports {loaded} at start-up"
+    assert times[module] / 1000 < budget_ms
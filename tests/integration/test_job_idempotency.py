@@ -0,0 +1,49 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+try:
+    import fakeredis
+except Exception:  # pragma: no cover
+    fakeredis = None
+
+from rq import Queue, SimpleWorker
+from sortune_adapters.jobs import enqueue_once, idempotency_key
+
+pytestmark = pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+
+
+def test_a_burst_of_identical_enqueues_makes_one_job():
+    r = fakeredis.FakeRedis()
+    q = Queue("default", connection=r)
+
+    def enqueue(_):
+        return enqueue_once(q, "count", len, args=("abc",))
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(enqueue, range(32)))
+
+    assert len({job.id for job, _ in results}) == 1
+    assert sum(created for _, created in results) == 1
+    assert q.count == 1
+
+
+def test_other_arguments_and_ended_jobs_get_new_jobs():
+    r = fakeredis.FakeRedis()
+    q = Queue("default", connection=r)
+    first, _ = enqueue_once(q, "count", len, args=("abc",))
+    other, created = enqueue_once(q, "count", len, args=("abcd",))
+    assert created and other.id != first.id
+
+    SimpleWorker([q], connection=r).work(burst=True)
+    again, created = enqueue_once(q, "count", len, args=("abc",))
+    assert created and again.id != first.id
+    assert r.get(idempotency_key("count", ("abc",))).decode() == again.id
+
+
+def test_keys_ignore_keyword_order_but_not_values():
+    assert idempotency_key("sort", ("p",), {"a": 1, "b": 2}) == idempotency_key(
+        "sort", ("p",), {"b": 2, "a": 1}
+    )
+    assert idempotency_key("sort", ("p",)) != idempotency_key("dedupe", ("p",))
+    assert idempotency_key("sort", ("p",), {"a": 1}) != idempotency_key("sort", ("p",), {"a": 2})
@@ -0,0 +1,188 @@
+import asyncio
+import importlib
+import json
+import threading
+
+import pytest
+
+try:
+    import fakeredis
+except Exception:  # pragma: no cover
+    fakeredis = None
+
+from rq import SimpleWorker
+from rq.job import Job
+from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
+from sortune_adapters.ytmusic.pool import get_client_pool
+from sortune_api import jobs
+from sortune_api.main import app
+from sortune_core.models.playlist import Playlist
+
+playlists_module = importlib.import_module("sortune_api.routes.playlists")
+
+pytestmark = pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+
+PID = "PLfake00000"
+
+
+@pytest.fixture()
+def r(client, monkeypatch):
+    """A fakeredis shared by the API and the jobs; jobs talk to the offline fake upstream."""
+    server = fakeredis.FakeServer()
+    r = fakeredis.FakeRedis(server=server)
+    app.dependency_overrides[playlists_module.get_redis] = lambda: r
+    app.dependency_overrides[playlists_module.get_async_redis] = lambda: fakeredis.FakeAsyncRedis(
+        server=server
+    )
+    app.dependency_overrides[playlists_module.get_repo] = lambda: RedisPlaylistRepo(r)
+    monkeypatch.setenv("YT_BACKEND", "fake")
+    monkeypatch.setenv("YT_FAKE_TRACKS", "40")
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    get_client_pool.cache_clear()
+    try:
+        yield r
+    finally:
+        get_client_pool().close()
+        get_client_pool.cache_clear()
+        app.dependency_overrides.pop(playlists_module.get_redis, None)
+        app.dependency_overrides.pop(playlists_module.get_async_redis, None)
+
+
+def _work(r, *queues: str) -> None:
+    SimpleWorker(list(queues), connection=r).work(burst=True)
+
+
+def test_background_import_reports_progress_and_result(client, r):
+    res = client.post(f"/playlists/yt/import/{PID}?background=true")
+    assert res.status_code == 202
+    job_id = res.json()["job_id"]
+    assert res.headers["Location"] == f"/jobs/{job_id}"
+    assert client.get(f"/jobs/{job_id}").json()["status"] == "queued"
+
+    _work(r, "import")
+    job = client.get(f"/jobs/{job_id}").json()
+    assert (job["status"], job["type"], job["queue"]) == ("finished", "import", "import")
+    assert job["progress"]["stage"] == "storing"
+    assert (job["progress"]["done"], job["progress"]["total"]) == (40, 40)
+    assert job["result"]["count"] == 40 and job["result"]["changed"] is True
+    assert len(RedisPlaylistRepo(r).get(PID).tracks) == 40
+
+
+def _sse(text: str) -> list[tuple[str | None, str, dict]]:
+    events = []
+    for block in text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+        if "event" in fields:
+            events.append((fields.get("id"), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_job_events_stream_progress_then_the_result(client, r):
+    job_id = client.post(f"/playlists/yt/import/{PID}?background=true").json()["job_id"]
+    _work(r, "import")
+
+    res = client.get(f"/jobs/{job_id}/events")
+    assert res.headers["content-type"].startswith("text/event-stream")
+    events = _sse(res.text)
+    assert [(name, data.get("stage")) for _, name, data in events] == [
+        ("progress", "fetching"),
+        ("progress", "storing"),
+        ("finished", None),
+    ]
+    storing = events[1][2]
+    assert (storing["done"], storing["total"], storing["pages"]) == (40, 40, 1)
+    assert storing["bytes_written"] > 0 and storing["eta_seconds"] == 0
+    assert events[2][2]["result"]["count"] == 40
+
+    # A reconnecting client only gets what it has not seen
+    resumed = _sse(
+        client.get(f"/jobs/{job_id}/events", headers={"Last-Event-ID": events[0][0]}).text
+    )
+    assert [name for _, name, _ in resumed] == ["progress", "finished"]
+    assert client.get("/jobs/nope/events").status_code == 404
+
+
+def test_job_events_wait_for_the_running_job_without_blocking_the_loop(client, r):
+    job_id = client.post(f"/playlists/yt/import/{PID}?background=true").json()["job_id"]
+    job = Job.fetch(job_id, connection=r)
+    server = r.connection_pool.connection_kwargs["server"]
+    waiting = threading.Event()
+    chunks: list[str] = []
+    ticks = 0
+
+    async def follow() -> None:
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(tick())
+        async for chunk in jobs.events(fakeredis.FakeAsyncRedis(server=server), job, block_ms=200):
+            chunks.append(chunk)
+            if len(chunks) == 2:  # retry, then a keep-alive: the stream waits on the job
+                waiting.set()
+        ticker.cancel()
+
+    # The worker needs the main thread (signal handlers), so the stream gets its own
+    stream = threading.Thread(target=asyncio.run, args=(follow(),))
+    stream.start()
+    assert waiting.wait(5)
+    _work(r, "import")
+    stream.join(5)
+
+    assert not stream.is_alive()
+    assert chunks[1] == ": keep-alive\n\n"
+    assert [name for _, name, _ in _sse("".join(chunks))] == ["progress", "progress", "finished"]
+    assert ticks >= 10  # the loop kept running through the 200ms blocking read
+
+
+def test_sorts_do_not_wait_behind_imports(client, r):
+    repo = RedisPlaylistRepo(r)
+    repo.save(
+        Playlist.model_validate(
+            {
+                "playlistId": "mine",
+                "title": "Mine",
+                "tracks": [
+                    {"videoId": v, "title": t, "artists": []}
+                    for v, t in [("1", "b"), ("2", "a"), ("1", "b")]
+                ],
+            }
+        )
+    )
+    imported = client.post(f"/playlists/yt/import/{PID}?background=true").json()
+    sort = client.post("/playlists/mine/sort?background=true").json()
+    dedupe = client.post("/playlists/mine/dedupe?background=true").json()
+    assert (imported["queue"], sort["queue"], dedupe["queue"]) == ("import", "sort", "sort")
+
+    _work(r, "sort")
+    assert client.get(f"/jobs/{imported['job_id']}").json()["status"] == "queued"
+    assert client.get(f"/jobs/{sort['job_id']}").json()["result"]["changed"] is True
+    assert client.get(f"/jobs/{dedupe['job_id']}").json()["result"]["removed"] == 1
+    assert [t.title for t in repo.get("mine").tracks] == ["a", "b"]
+
+
+def test_failed_and_unknown_jobs(client, r):
+    assert client.post("/playlists/mine/sort?background=true&rule_name=nope").status_code == 400
+
+    job_id = client.post("/playlists/yt/refresh/PLmissing?background=true").json()["job_id"]
+    _work(r, "import")
+    job = client.get(f"/jobs/{job_id}").json()
+    assert job["status"] == "failed"
+    assert "404" in job["error"] and "Traceback" not in job["error"]
+
+    assert client.get("/jobs/nope").status_code == 404
+
+
+def test_identical_background_requests_share_one_job(client, r):
+    ids = {
+        client.post(f"/playlists/yt/import/{PID}?background=true").json()["job_id"] for _ in "abc"
+    }
+    assert len(ids) == 1
+    other = client.post(f"/playlists/yt/import/{PID}?background=true&limit=5").json()["job_id"]
+    assert other not in ids
+
+    _work(r, "import")
+    # Once the job is over, the same request runs again
+    assert client.post(f"/playlists/yt/import/{PID}?background=true").json()["job_id"] not in ids
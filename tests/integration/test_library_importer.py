@@ -0,0 +1,62 @@
+import pytest
+
+try:
+    import fakeredis
+except Exception:  # pragma: no cover
+    fakeredis = None
+
+from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
+from sortune_adapters.ytmusic.client import YTMusicClient
+from sortune_adapters.ytmusic.importer import LibraryImporter
+from sortune_adapters.ytmusic.ratelimit import AIMDRateLimiter
+
+
+class FlakyYT:
+    """ytmusicapi stand-in: PL1 is throttled once, PL_BAD always fails."""
+
+    def __init__(self):
+        self.calls: dict[str, int] = {}
+
+    def get_playlist(self, playlistId: str, limit=None, **_):
+        self.calls[playlistId] = self.calls.get(playlistId, 0) + 1
+        if playlistId == "PL_BAD":
+            raise RuntimeError("Server returned HTTP 404: Not Found.")
+        if playlistId == "PL1" and self.calls[playlistId] == 1:
+            raise RuntimeError("Server returned HTTP 429: Too Many Requests.")
+        return {"tracks": [{"videoId": f"{playlistId}-v", "title": "T", "artists": []}]}
+
+
+SUMMARIES = [
+    {"playlistId": "PL0", "title": "Zero"},
+    {"playlistId": "PL1", "title": "One"},
+    {"playlistId": "PL_BAD", "title": "Bad"},
+    {"playlistId": "RDMIX", "title": "Mix", "author": [{"name": "YouTube Music"}]},
+]
+
+
+@pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+def test_library_importer_retries_throttles_and_batches_writes():
+    fake = FlakyYT()
+    repo = RedisPlaylistRepo(fakeredis.FakeRedis())
+    importer = LibraryImporter(
+        YTMusicClient(yt=fake),
+        repo,
+        max_workers=3,
+        limiter=AIMDRateLimiter(rate=100, burst=10),
+        batch_size=2,
+        backoff=0.01,
+    )
+
+    report = importer.run(SUMMARIES)
+
+    assert report.imported == 2
+    assert report.skipped == 1
+    assert report.throttled == 1
+    assert list(report.failed) == ["PL_BAD"]
+    assert fake.calls["PL1"] == 2
+    assert "RDMIX" not in fake.calls
+    assert repo.list_ids() == ["PL0", "PL1"]
+    assert repo.get("PL1").name == "One"
+
+    again = importer.run(SUMMARIES[:2])
+    assert (again.imported, again.unchanged) == (0, 2)
@@ -0,0 +1,73 @@
+import pytest
+
+try:
+    import fakeredis
+except Exception:  # pragma: no cover
+    fakeredis = None
+
+from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
+from sortune_adapters.ytmusic.client import YTMusicClient
+from sortune_adapters.ytmusic.importer import LibraryImporter
+from sortune_adapters.ytmusic.sync import LibrarySync
+
+
+class FakeLibrary:
+    def __init__(self):
+        self.tracks = {"PL1": ["a", "b"], "PL2": ["x"]}
+        self.fetches: list[str] = []
+
+    def get_library_playlists(self, limit=25):
+        return [
+            {"playlistId": pid, "title": pid, "count": str(len(ids))}
+            for pid, ids in self.tracks.items()
+        ]
+
+    def get_playlist(self, playlistId, limit=None, **_):
+        self.fetches.append(playlistId)
+        return {
+            "tracks": [{"videoId": v, "title": v, "artists": []} for v in self.tracks[playlistId]]
+        }
+
+
+@pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+def test_incremental_sync_fetches_only_changed_playlists():
+    lib = FakeLibrary()
+    repo = RedisPlaylistRepo(fakeredis.FakeRedis())
+    sync = LibrarySync(YTMusicClient(yt=lib), repo)
+
+    first = sync.run()
+    assert (first.fetched, first.skipped, first.written) == (2, 0, 2)
+    assert {p.reason for p in first.playlists} == {"new"}
+
+    lib.fetches.clear()
+    second = sync.run()
+    assert (second.fetched, second.skipped) == (0, 2)
+    assert lib.fetches == []
+
+    lib.tracks["PL1"] = ["b", "c", "a"]
+    third = sync.run()
+    assert (third.fetched, third.skipped) == (1, 1)
+    [item] = third.playlists
+    assert item.playlist_id == "PL1"
+    assert item.reason == "count changed"
+    assert (item.added, item.removed, item.reordered, item.written) == (
+        1,
+        0,
+        True,
+        True,
+    )
+    assert [t.id for t in repo.get("PL1").tracks] == ["b", "c", "a"]
+
+    del lib.tracks["PL2"]
+    assert sync.run().gone == ["PL2"]
+    assert sync.run(full=True).fetched == 1
+
+
+@pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+def test_sync_leaves_the_callers_importer_alone():
+    repo = RedisPlaylistRepo(fakeredis.FakeRedis())
+    client = YTMusicClient(yt=FakeLibrary())
+    importer = LibraryImporter(client, repo)
+    sync = LibrarySync(client, repo, importer)
+    assert sync.importer.refresh is True and importer.refresh is False
+    assert sync.importer.limiter is importer.limiter  # still paced together
@@ -0,0 +1,120 @@
+import subprocess
+import sys
+
+import pytest
+
+try:
+    import fakeredis
+except Exception:  # pragma: no cover
+    fakeredis = None
+
+from prometheus_client import REGISTRY
+from rq import Queue, SimpleWorker
+from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
+from sortune_adapters.ytmusic.client import YTMusicClient
+from sortune_core.models.playlist import Playlist
+from sortune_worker.metrics import JobMetricsMixin
+
+
+def _value(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_metrics_endpoint_reports_requests_by_route(client):
+    labels = {"method": "GET", "route": "/playlists/{playlist_id}", "status": "200"}
+    before = _value("sortune_http_request_seconds_count", **labels)
+    assert client.get("/playlists/demo").status_code == 200
+
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain")
+    assert 'route="/playlists/{playlist_id}"' in res.text
+    assert _value("sortune_http_request_seconds_count", **labels) == before + 1
+
+
+@pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+def test_repo_and_rule_metrics():
+    repo = RedisPlaylistRepo(fakeredis.FakeRedis())
+    pl = Playlist.model_validate(
+        {
+            "playlistId": "m",
+            "title": "M",
+            "tracks": [{"videoId": str(i), "title": f"t{i}", "artists": []} for i in range(3)],
+        }
+    )
+    saves = _value("sortune_repo_operation_seconds_count", operation="save")
+    gets = _value("sortune_repo_payload_bytes_count", operation="get")
+    read = _value("sortune_repo_payload_bytes_sum", operation="get")
+    rules = _value("sortune_rule_apply_seconds_count", rule="by_title", tracks="<100")
+
+    repo.save(pl)
+    repo.get("m")
+    repo.load_rule("by_title").apply(pl.tracks)
+
+    assert _value("sortune_repo_operation_seconds_count", operation="save") == saves + 1
+    assert _value("sortune_repo_payload_bytes_count", operation="get") == gets + 1
+    assert _value("sortune_repo_payload_bytes_sum", operation="get") > read
+    assert _value("sortune_rule_apply_seconds_count", rule="by_title", tracks="<100") == rules + 1
+
+
+def test_ytmusic_calls_and_errors_by_endpoint():
+    class Throttled:
+        def get_library_playlists(self, limit):
+            raise Exception("HTTP 429: Too Many Requests")
+
+    labels = {"endpoint": "get_library_playlists"}
+    calls = _value("sortune_ytmusic_call_seconds_count", **labels)
+    throttled = _value("sortune_ytmusic_call_errors_total", kind="throttled", **labels)
+
+    with pytest.raises(Exception, match="429"):
+        YTMusicClient(yt=Throttled(), cache=False).list_library_playlists()
+
+    assert _value("sortune_ytmusic_call_seconds_count", **labels) == calls + 1
+    assert _value("sortune_ytmusic_call_errors_total", kind="throttled", **labels) == throttled + 1
+
+
+class _InProcessMetricsWorker(JobMetricsMixin, SimpleWorker):
+    """MetricsWorker without the fork, so the job runs in (and records into) this process."""
+
+
+@pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+def test_worker_records_job_durations():
+    r = fakeredis.FakeRedis()
+    labels = {"queue": "default", "job": "len", "outcome": "ok"}
+    before = _value("sortune_job_seconds_count", **labels)
+
+    Queue("default", connection=r).enqueue(len, "abc")
+    _InProcessMetricsWorker(["default"], connection=r).work(burst=True)
+
+    assert _value("sortune_job_seconds_count", **labels) == before + 1
+
+
+_FORKED_JOBS = """
+import os
+from sortune_worker.__main__ import _prepare_multiproc_dir
+
+_prepare_multiproc_dir()
+from prometheus_client import CollectorRegistry, Counter, multiprocess
+
+jobs = Counter("jobs", "Jobs")
+jobs.inc()
+for _ in range(5):
+    pid = os.fork()
+    if pid == 0:
+        jobs.inc()
+        os._exit(0)
+    os.waitpid(pid, 0)
+registry = CollectorRegistry()
+multiprocess.MultiProcessCollector(registry)
+files = os.listdir(os.environ["PROMETHEUS_MULTIPROC_DIR"])
+print(len(files), registry.get_sample_value("jobs_total"))
+"""
+
+
+def test_work_horses_share_one_set_of_sample_files(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path / "metrics"))
+    proc = subprocess.run(
+        [sys.executable, "-c", _FORKED_JOBS], capture_output=True, text=True, check=False
+    )
+    # The worker's counter file and one for all its horses, however many jobs ran
+    assert proc.stdout.split() == ["2", "6.0"], proc.stderr
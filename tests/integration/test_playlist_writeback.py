@@ -0,0 +1,123 @@
+import importlib
+
+import pytest
+
+try:
+    import fakeredis
+except Exception:  # pragma: no cover
+    fakeredis = None
+
+from sortune_adapters.ytmusic.client import YTMusicClient
+from sortune_adapters.ytmusic.fake import FakeYTMusic
+from sortune_adapters.ytmusic.ratelimit import AIMDRateLimiter
+from sortune_adapters.ytmusic.singleflight import SingleFlight
+from sortune_adapters.ytmusic.writeback import PlaylistWriteBack, WriteBackError
+from sortune_api.main import app
+from sortune_core.models.playlist import Playlist
+
+playlists_module = importlib.import_module("sortune_api.routes.playlists")
+
+pytestmark = pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+
+PID = "PLfake00000"
+
+
+def _setup(tracks: int = 300):
+    fake = FakeYTMusic(playlists=1, tracks=tracks)
+    client = YTMusicClient(yt=fake)
+    current = [i["videoId"] for i in client.get_playlist_items(PID)]
+    return fake, client, current
+
+
+def _fast_limiter() -> AIMDRateLimiter:
+    return AIMDRateLimiter(rate=1000, max_rate=1000, burst=1000)
+
+
+def test_reorder_add_remove_in_batches():
+    fake, client, current = _setup()
+    target = list(reversed(current[5:])) + ["vNEW000001", "vNEW000002"]
+
+    plan = client.write_back(PID, target, dry_run=True)
+    assert (plan.removed, plan.added) == (5, 2)
+    assert fake.calls["edit_playlist"] == 0  # dry runs never write
+
+    report = client.write_back(PID, target, limiter=_fast_limiter(), batch_size=50)
+    assert report.verified is True
+    assert (report.removed, report.added, report.moved) == (5, 2, plan.moved)
+    assert report.requests == fake.calls["edit_playlist"] < report.moved
+    assert [i["videoId"] for i in client.get_playlist_items(PID)] == target
+
+
+@pytest.mark.parametrize("reorder_only", [False, True])
+def test_write_back_reads_past_coalesced_results(reorder_only):
+    # Pooled clients share reads for a while; the re-reads after the edits must not
+    fake = FakeYTMusic(playlists=1, tracks=50)
+    client = YTMusicClient(yt=fake, flight=SingleFlight(None))
+    current = [i["videoId"] for i in client.get_playlist_items(PID)]
+    target = current[::-1]
+    if not reorder_only:
+        target = target[1:] + ["vNEW000001", "vNEW000002"]
+
+    report = client.write_back(PID, target, limiter=_fast_limiter())
+    assert report.verified is True
+    assert [i["videoId"] for i in client.get_playlist_items(PID)] == target
+
+
+def test_interrupted_write_back_resumes_from_checkpoint():
+    fake, client, current = _setup()
+    r = fakeredis.FakeRedis()
+    target = current[1::2] + current[::2]
+    edit = client.edit_playlist_items
+    sent = []
+
+    def flaky(playlist_id, actions):
+        if len(sent) == 2:
+            raise RuntimeError("Server returned HTTP 500: Internal Server Error.")
+        sent.append(len(actions))
+        return edit(playlist_id, actions)
+
+    client.edit_playlist_items = flaky
+    wb = PlaylistWriteBack(client, checkpoints=r, limiter=_fast_limiter(), batch_size=20)
+    with pytest.raises(WriteBackError) as e:
+        wb.run(PID, target)
+    assert e.value.report.requests == 2
+    assert r.exists(f"writeback:{PID}")
+
+    client.edit_playlist_items = edit
+    report = wb.run(PID, target)
+    assert report.resumed and report.verified
+    # Only the batches not already applied are sent again
+    assert report.requests + 2 == -(-report.moved // 20)
+    assert not r.exists(f"writeback:{PID}")
+
+
+def test_throttled_batches_are_retried():
+    fake, client, current = _setup(50)
+    fake.quota = 2  # the first edit after two reads in the same second is throttled
+    wb = PlaylistWriteBack(client, limiter=_fast_limiter(), backoff=0.6)
+    report = wb.run(PID, current[::-1])
+    assert report.verified and report.throttled >= 1
+
+
+def test_write_back_endpoint_uses_the_stored_order(client, repo):
+    fake = FakeYTMusic(playlists=1, tracks=30)
+    yt = YTMusicClient(yt=fake)
+    tracks = yt.get_playlist_tracks(PID)
+    repo.save(Playlist(playlistId=PID, title="Sorted", tracks=tracks[::-1]))
+
+    app.dependency_overrides[playlists_module.get_yt_client] = lambda: yt
+    r = fakeredis.FakeRedis()
+    app.dependency_overrides[playlists_module.get_redis] = lambda: r
+    try:
+        dry = client.post(f"/playlists/yt/writeback/{PID}?dry_run=true").json()
+        assert dry["dry_run"] and dry["moved"] == 29 and fake.calls["edit_playlist"] == 0
+
+        done = client.post(f"/playlists/yt/writeback/{PID}").json()
+        assert done["verified"] is True
+        assert [t.id for t in yt.get_playlist_tracks(PID, refresh=True)] == [
+            t.id for t in tracks[::-1]
+        ]
+        assert client.post("/playlists/yt/writeback/missing").status_code == 404
+    finally:
+        app.dependency_overrides.pop(playlists_module.get_yt_client, None)
+        app.dependency_overrides.pop(playlists_module.get_redis, None)
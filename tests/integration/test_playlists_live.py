@@ -1,8 +1,16 @@
 from __future__ import annotations
 
+import importlib
+
 from fastapi.testclient import TestClient
+from sortune_adapters.ytmusic.cache import ResponseCache
+from sortune_adapters.ytmusic.client import YTMusicClient
+from sortune_adapters.ytmusic.fake import FakeYTMusic
+from sortune_api.main import app
 from sortune_core.models.playlist import Playlist
 
+playlists_module = importlib.import_module("sortune_api.routes.playlists")
+
 
 def test_list_yt_library_playlists_live_ok(client: TestClient, fake_yt) -> None:
     resp = client.get("/playlists/library/live")
@@ -26,6 +34,12 @@ def test_get_yt_playlist_tracks_live_ok(client: TestClient, fake_yt) -> None:
     assert tracks[0]["inLibrary"] is True
 
 
+def test_get_yt_playlist_tracks_live_fields(client: TestClient, fake_yt) -> None:
+    resp = client.get("/playlists/PL123/tracks/live", params={"fields": "id,artists.name"})
+    assert resp.status_code == 200
+    assert resp.json()[0] == {"videoId": "vid1", "artists": [{"name": "Alice"}]}
+
+
 def test_import_yt_playlist_into_redis_persists(
     client: TestClient, fake_yt, repo, clear_yt_env
 ) -> None:
@@ -49,3 +63,73 @@ def test_import_with_env_name_override(client: TestClient, fake_yt, repo, monkey
     assert resp.status_code == 201
     pl = resp.json()
     assert pl["title"] == "My Fav Tracks"
+
+
+def test_stream_import_reports_progress_per_page(
+    client: TestClient, fake_yt, repo, clear_yt_env
+) -> None:
+    import json
+
+    resp = client.post("/playlists/yt/import/PL123/stream?page_size=1")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in resp.text.splitlines()]
+    assert events[:2] == [{"event": "page", "stored": 1}, {"event": "page", "stored": 2}]
+    assert events[-1]["event"] == "done"
+    assert events[-1]["count"] == 2
+    assert events[-1]["changed"] is True
+    assert events[-1]["etag"] == f'"{repo.get_hash("PL123")}"'
+    assert [t.id for t in repo.get("PL123").tracks] == ["vid1", "vid2"]
+
+    again = client.post("/playlists/yt/import/PL123/stream")
+    assert json.loads(again.text.splitlines()[-1])["changed"] is False
+
+
+def test_live_endpoints_answer_304_from_the_upstream_cache(client: TestClient, tmp_path) -> None:
+    fake = FakeYTMusic(playlists=3, tracks=5)
+    yt = YTMusicClient(yt=fake, cache=ResponseCache(tmp_path / "yt.sqlite"))
+    app.dependency_overrides[playlists_module.get_yt_client] = lambda: yt
+    try:
+        for path in ("/playlists/library/live", "/playlists/PLfake00001/tracks/live"):
+            first = client.get(path)
+            assert first.status_code == 200
+            etag = first.headers["ETag"]
+            calls = sum(fake.calls.values())
+
+            again = client.get(path, headers={"If-None-Match": etag})
+            assert again.status_code == 304
+            assert again.headers["ETag"] == etag
+            assert sum(fake.calls.values()) == calls
+
+            # A different limit is a different upstream response
+            other = client.get(path, params={"limit": 2}, headers={"If-None-Match": etag})
+            assert other.status_code == 200
+            assert other.headers["ETag"] != etag
+    finally:
+        app.dependency_overrides.pop(playlists_module.get_yt_client, None)
+
+
+def test_imports_refreshes_and_refresh_reads_bypass_the_upstream_cache(
+    client: TestClient, repo, tmp_path
+) -> None:
+    fake = FakeYTMusic(playlists=3, tracks=5)
+    yt = YTMusicClient(yt=fake, cache=ResponseCache(tmp_path / "yt.sqlite"))
+    app.dependency_overrides[playlists_module.get_yt_client] = lambda: yt
+    try:
+        assert client.get("/playlists/PLfake00001/tracks/live").status_code == 200
+        for method, path in [
+            ("POST", "/playlists/yt/import/PLfake00001"),
+            ("POST", "/playlists/yt/import/PLfake00001/stream"),
+            ("POST", "/playlists/yt/refresh/PLfake00001"),
+            ("GET", "/playlists/PLfake00001/tracks/live?refresh=true"),
+        ]:
+            before = fake.calls["get_playlist"]
+            assert client.request(method, path).status_code < 300
+            assert fake.calls["get_playlist"] > before, path
+
+        # Without refresh=true, live reads are served from the cache
+        before = fake.calls["get_playlist"]
+        client.get("/playlists/PLfake00001/tracks/live")
+        assert fake.calls["get_playlist"] == before
+    finally:
+        app.dependency_overrides.pop(playlists_module.get_yt_client, None)
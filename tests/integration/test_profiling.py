@@ -0,0 +1,115 @@
+import importlib
+import marshal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+try:
+    import fakeredis
+except Exception:  # pragma: no cover
+    fakeredis = None
+
+from rq import SimpleWorker
+from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
+from sortune_api.main import app
+from sortune_api.settings import settings
+from sortune_core.models.playlist import Playlist
+from sortune_worker.profiling import ProfiledJobsMixin
+
+playlists_module = importlib.import_module("sortune_api.routes.playlists")
+
+pytestmark = pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+
+
+@pytest.fixture()
+def r(client, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_ENABLED", True)
+    r = fakeredis.FakeRedis()
+    app.dependency_overrides[playlists_module.get_redis] = lambda: r
+    app.dependency_overrides[playlists_module.get_repo] = lambda: RedisPlaylistRepo(r)
+    RedisPlaylistRepo(r).save(
+        Playlist.model_validate(
+            {
+                "playlistId": "mine",
+                "title": "Mine",
+                "tracks": [{"videoId": v, "title": v, "artists": []} for v in "cab"],
+            }
+        )
+    )
+    try:
+        yield r
+    finally:
+        app.dependency_overrides.pop(playlists_module.get_redis, None)
+
+
+def test_profile_is_stored_and_served(client, r):
+    res = client.post("/playlists/mine/sort?profile=text")
+    assert res.status_code == 200
+    assert res.json()["changed"] is True and "ETag" in res.headers
+
+    profile = client.get(f"/profiles/{res.headers['X-Sortune-Profile-Id']}")
+    assert profile.headers["content-type"].startswith("text/plain")
+    assert "sort_playlist" in profile.text and "cumulative" in profile.text
+    assert client.get("/profiles/nope").status_code == 404
+
+
+def test_inline_profile_replaces_the_response(client, r):
+    res = client.get(
+        "/playlists/mine",
+        headers={"X-Sortune-Profile": "pstats", "X-Sortune-Profile-Inline": "true"},
+    )
+    assert res.headers["X-Sortune-Profile-Status"] == "200"
+    stats = marshal.loads(res.content)
+    assert any(func == "get_document" for (_, _, func) in stats)
+
+    assert client.get("/playlists/mine?profile=flame").status_code == 400
+
+
+def test_overlapping_profiled_requests(client, r):
+    # Both requests wait for each other inside the endpoint, so their captures overlap
+    both_inside = threading.Barrier(2, timeout=5)
+
+    class MeetingRepo(RedisPlaylistRepo):
+        def get_document(self, *args, **kwargs):
+            both_inside.wait()
+            return super().get_document(*args, **kwargs)
+
+    app.dependency_overrides[playlists_module.get_repo] = lambda: MeetingRepo(r)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        responses = list(pool.map(lambda _: client.get("/playlists/mine?profile=text"), range(2)))
+
+    assert [res.status_code for res in responses] == [200, 200]
+    profiled = [res for res in responses if "X-Sortune-Profile-Id" in res.headers]
+    skipped = [res for res in responses if "X-Sortune-Profile-Skipped" in res.headers]
+    assert len(profiled) == 1 and len(skipped) == 1
+    assert skipped[0].headers["X-Sortune-Profile-Skipped"] == "busy"
+    assert skipped[0].json()["title"] == "Mine"
+    profile = client.get(f"/profiles/{profiled[0].headers['X-Sortune-Profile-Id']}")
+    assert "get_document" in profile.text
+
+    # The capture is released: the next request is profiled again
+    app.dependency_overrides[playlists_module.get_repo] = lambda: RedisPlaylistRepo(r)
+    assert "X-Sortune-Profile-Id" in client.get("/playlists/mine?profile=text").headers
+
+
+def test_profiling_is_off_unless_enabled(client, r, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_ENABLED", False)
+    res = client.get("/playlists/mine?profile=flame")
+    assert res.status_code == 200 and "X-Sortune-Profile-Id" not in res.headers
+
+
+class _InProcessProfilingWorker(ProfiledJobsMixin, SimpleWorker):
+    """A profiling worker without the fork."""
+
+
+def test_jobs_queued_by_a_profiled_request_are_profiled(client, r):
+    job_id = client.post("/playlists/mine/sort?background=true&profile=text").json()["job_id"]
+    _InProcessProfilingWorker(["sort"], connection=r).work(burst=True)
+
+    job = client.get(f"/jobs/{job_id}").json()
+    assert job["status"] == "finished" and job["profile"] == f"/profiles/{job_id}"
+    assert "sort_playlist" in client.get(job["profile"]).text
+
+    unprofiled = client.post("/playlists/mine/dedupe?background=true").json()["job_id"]
+    assert "profile" not in client.get(f"/jobs/{unprofiled}").json()
@@ -0,0 +1,147 @@
+import pytest
+
+try:
+    import fakeredis
+except Exception:  # pragma: no cover
+    fakeredis = None
+
+from sortune_adapters.storage.redis_entities import RedisEntityRepo
+from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
+from sortune_adapters.ytmusic.client import YTMusicClient
+from sortune_adapters.ytmusic.fake import FakeYTMusic
+from sortune_adapters.ytmusic.sync import sync_library_entities
+from sortune_core.models.playlist import Album, Artist, Playlist
+from sortune_core.models.projection import parse_fields, project
+
+pytestmark = pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+
+
+def _playlist(n: int = 50) -> Playlist:
+    return Playlist.model_validate(
+        {
+            "playlistId": "PL1",
+            "title": "Refs",
+            "tracks": [
+                {
+                    "videoId": f"v{i}",
+                    "title": f"Song {i}",
+                    "artists": [
+                        {"name": f"Artist {i % 3}", "id": f"UCartist{i % 3}"},
+                        {"name": "Uncredited"},  # no id: stays embedded
+                    ],
+                    "album": {"name": f"Album {i % 5}", "id": f"MPREb_{i % 5}"},
+                    "duration_seconds": 200 + i,
+                }
+                for i in range(n)
+            ],
+        }
+    )
+
+
+def test_library_entities_are_normalized_and_merged():
+    store = RedisEntityRepo(fakeredis.FakeRedis())
+    store.upsert_artists(
+        [
+            Artist.model_validate(
+                {"browseId": "MPLAUCx", "artist": "X", "subscribers": "10K", "thumbnails": []}
+            )
+        ]
+    )
+    # A sparse track reference to the same channel must not erase library data
+    assert store.upsert_artists([Artist(name="X", id="UCx")]) == 0
+    # ...nor rename it: stored tracks reference it by id
+    assert store.upsert_artists([Artist(name="X (Official)", id="UCx")]) == 0
+
+    artist = store.get_artist("UCx")
+    assert artist.name == "X" and artist.subscribers == "10K"
+    assert store.names("artists", ["UCx", "UCmissing"]) == {"UCx": "X"}
+
+    store.upsert_albums([Album.model_validate({"browseId": "MPREb_a", "title": "A"})])
+    store.upsert_albums([Album(name="A", id="MPREb_a", year="2020")])
+    assert store.get_album("MPREb_a").year == "2020"
+    assert [a.id for a in store.list_albums(library=True)] == ["MPREb_a"]
+
+
+def test_tracks_reference_entities_and_round_trip():
+    r = fakeredis.FakeRedis()
+    pl = _playlist()
+    RedisPlaylistRepo(r, entities=False).save(pl)
+    embedded = r.strlen("playlist:PL1")
+    r.flushall()
+
+    repo = RedisPlaylistRepo(r)
+    repo.save(pl)
+    assert r.strlen("playlist:PL1") < embedded
+    assert repo.get("PL1") == pl
+    assert repo.get_many(["PL1", "nope"])[0] == pl
+    assert sorted(a.id for a in repo.entities.list_artists()) == [f"UCartist{i}" for i in range(3)]
+
+    # Streamed and whole saves store the same bytes
+    stored = r.get("playlist:PL1")
+    with repo.open_stream(pl.model_copy(update={"tracks": []})) as w:
+        w.append(pl.tracks[:20])
+        w.append(pl.tracks[20:])
+        assert w.commit() is False
+    assert r.get("playlist:PL1") == stored
+
+
+def test_other_playlists_crediting_another_name_change_nothing(monkeypatch):
+    r = fakeredis.FakeRedis()
+    repo = RedisPlaylistRepo(r)
+    p1 = _playlist()
+    repo.save(p1)
+    etag = repo.get_hash("PL1")
+
+    renamed = p1.model_copy(update={"id": "PL2"}, deep=True)
+    renamed.tracks[0].artists[0].name = "Artist 0 (feat. Someone)"
+    renamed.tracks[0].album.name = "Album 0 (Deluxe)"
+    repo.save(renamed)
+    assert repo.get("PL2") == renamed
+    assert repo.get("PL1") == p1 and repo.get_hash("PL1") == etag
+
+    # An unchanged save costs no entity writes and changes nothing
+    monkeypatch.setattr(
+        repo.entities, "upsert_from_tracks", lambda *a: pytest.fail("entities written")
+    )
+    assert repo.save(p1) is False
+    assert repo.get("PL1") == p1 and repo.get("PL2") == renamed
+
+
+def test_library_entities_sync_through_the_client():
+    store = RedisEntityRepo(fakeredis.FakeRedis())
+    client = YTMusicClient(yt=FakeYTMusic(playlists=4))
+
+    artists, albums, changed = sync_library_entities(client, store)
+    assert (artists, albums) == (4, 4)
+    assert changed > 0
+    assert store.get_artist("UCfake00002").name == "Fake Artist 2"
+    assert store.get_album("MPREb_fake00001").name == "Fake Album 1"
+    assert sync_library_entities(client, store)[2] == 0
+
+
+def test_projected_documents_load_only_what_is_selected(monkeypatch):
+    r = fakeredis.FakeRedis()
+    repo = RedisPlaylistRepo(r)
+    pl = _playlist()
+    repo.save(pl)
+    full = pl.model_dump(by_alias=True)
+
+    fields = parse_fields("tracks.id,tracks.artists.name", Playlist)
+    assert repo.get_document("PL1", fields) == project(full, fields)
+
+    # No tracks selected: the metadata prefix is enough, the blob is never GET in full
+    monkeypatch.setattr(r, "get", lambda key: pytest.fail(f"GET {key}"))
+    assert repo.get_document("PL1", parse_fields("id,title", Playlist)) == {
+        "playlistId": "PL1",
+        "title": "Refs",
+    }
+    assert repo.get_document("missing", parse_fields("title", Playlist)) == {
+        "title": "Playlist missing"
+    }
+    monkeypatch.undo()
+
+    # No artists/albums selected: references are not resolved
+    monkeypatch.setattr(repo.entities, "names", lambda *a: pytest.fail("resolved references"))
+    assert repo.get_document("PL1", parse_fields("tracks.title", Playlist))["tracks"][3] == {
+        "title": "Song 3"
+    }
@@ -6,7 +6,7 @@ except Exception:  # pragma: no cover
     fakeredis = None
 
 from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
-from sortune_core.models.playlist import Playlist
+from sortune_core.models.playlist import Playlist, Track
 
 
 @pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
@@ -50,3 +50,111 @@ def test_redis_repo_get_missing_returns_empty_playlist():
     loaded = repo.get("missing")
     assert loaded.id == "missing"
     assert loaded.tracks == []
+
+
+@pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+def test_redis_repo_skips_identical_saves_and_tracks_hash():
+    r = fakeredis.FakeRedis()
+    repo = RedisPlaylistRepo(r)
+    pl = Playlist.model_validate(
+        {"playlistId": "p", "title": "P", "tracks": [{"videoId": "1", "title": "A", "artists": []}]}
+    )
+
+    assert repo.get_hash("p") is None
+    assert repo.save(pl) is True
+    assert repo.get_hash("p") == pl.content_hash()
+    assert repo.save(pl) is False
+
+    pl.name = "Renamed"
+    assert repo.save(pl) is True
+    assert repo.get_hash("p") == pl.content_hash()
+
+    # Hash without a payload (e.g. key evicted) must not block the write
+    r.delete("playlist:p")
+    assert repo.save(pl) is True
+    assert repo.list_ids() == ["p"]
+
+
+def _page(start: int, n: int) -> list[Track]:
+    return [
+        Track.model_validate({"videoId": f"v{i}", "title": f"Song {i}", "artists": []})
+        for i in range(start, start + n)
+    ]
+
+
+@pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+def test_stream_write_matches_regular_save_byte_for_byte():
+    r = fakeredis.FakeRedis()
+    repo = RedisPlaylistRepo(r)
+    meta = Playlist.model_validate({"playlistId": "big", "title": "Big", "description": "x"})
+
+    with repo.open_stream(meta) as writer:
+        assert writer.append(_page(0, 3)) == 3
+        assert writer.append([]) == 3
+        assert writer.append(_page(3, 2)) == 5
+        # nothing is visible before commit
+        assert r.get("playlist:big") is None
+        assert writer.commit() is True
+
+    full = meta.model_copy(update={"tracks": _page(0, 5)})
+    assert r.get("playlist:big").decode() == full.model_dump_json(by_alias=True)
+    assert repo.get_hash("big") == full.content_hash()
+    assert r.ttl("playlist:big") == -1
+    assert repo.save(full) is False  # same bytes, same hash
+
+    with repo.open_stream(meta) as writer:
+        writer.append(_page(0, 5))
+        assert writer.commit() is False
+    assert repo.list_ids() == ["big"]
+
+
+@pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+def test_stream_write_failure_keeps_previous_copy():
+    r = fakeredis.FakeRedis()
+    repo = RedisPlaylistRepo(r)
+    meta = Playlist.model_validate({"playlistId": "p", "title": "P"})
+    repo.save(meta.model_copy(update={"tracks": _page(0, 1)}))
+
+    with pytest.raises(RuntimeError):
+        with repo.open_stream(meta) as writer:
+            writer.append(_page(10, 2))
+            raise RuntimeError("upstream failed mid-playlist")
+
+    assert [t.id for t in repo.get("p").tracks] == ["v0"]
+    assert not list(r.scan_iter("playlist-staging:*"))
+
+
+@pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+def test_concurrent_stream_writes_never_mix_pages():
+    r = fakeredis.FakeRedis()
+    repo = RedisPlaylistRepo(r)
+    meta = Playlist.model_validate({"playlistId": "p", "title": "P"})
+
+    with repo.open_stream(meta) as a, repo.open_stream(meta) as b:
+        a.append(_page(0, 2))
+        b.append(_page(10, 3))
+        a.append(_page(2, 2))
+        assert a.commit() is True
+        b.append(_page(13, 1))
+        assert b.commit() is True  # the last commit wins, whole
+    assert [t.id for t in repo.get("p").tracks] == ["v10", "v11", "v12", "v13"]
+    assert not list(r.scan_iter("playlist-staging:*"))
+
+
+@pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+def test_expired_staging_is_never_committed():
+    r = fakeredis.FakeRedis()
+    repo = RedisPlaylistRepo(r)
+    meta = Playlist.model_validate({"playlistId": "p", "title": "P"})
+    repo.save(meta.model_copy(update={"tracks": _page(0, 1)}))
+
+    for expire_before in ("append", "commit"):
+        with pytest.raises(RuntimeError, match="expired"):
+            with repo.open_stream(meta) as writer:
+                writer.append(_page(10, 2))
+                r.delete(writer._staging)
+                if expire_before == "append":
+                    writer.append(_page(12, 2))
+                writer.commit()
+        assert [t.id for t in repo.get("p").tracks] == ["v0"]
+        assert not list(r.scan_iter("playlist-staging:*"))
@@ -0,0 +1,143 @@
+from datetime import UTC, datetime
+
+import pytest
+
+try:
+    import fakeredis
+except Exception:  # pragma: no cover
+    fakeredis = None
+
+from rq import SimpleWorker
+from rq.job import Job
+from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
+from sortune_adapters.ytmusic.fake import env_backend
+from sortune_adapters.ytmusic.pool import get_client_pool
+from sortune_worker.scheduler import DEFAULT_SCHEDULES, Schedule, Scheduler, load_schedules
+
+pytestmark = pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+
+HOUR = 3600
+# Midnight UTC, 2026-01-01
+T0 = datetime(2026, 1, 1, tzinfo=UTC).timestamp()
+
+
+def _hourly(name: str = "hourly", jitter: int = 0) -> Schedule:
+    return Schedule(name, "0 * * * *", "builtins.dict", kwargs={"a": 1}, jitter=jitter)
+
+
+def _work(r) -> None:
+    SimpleWorker(["default"], connection=r).work(burst=True)
+
+
+def test_runs_once_per_slot():
+    r = fakeredis.FakeRedis()
+    s = Scheduler(r, [_hourly()])
+    assert s.tick(T0 + 10) == []  # first sight: plans the next slot
+    assert float(s.state("hourly")["next_run"]) == T0 + HOUR
+
+    assert s.tick(T0 + HOUR - 1) == []
+    [run] = s.tick(T0 + HOUR)
+    assert (run.slot, run.enqueued, run.coalesced) == (T0 + HOUR, True, 0)
+    assert Job.fetch(run.job_id, connection=r).meta["schedule"] == "hourly"
+    assert s.tick(T0 + HOUR + 5) == []
+
+    _work(r)
+    state = s.state("hourly")
+    assert float(state["next_run"]) == T0 + 2 * HOUR
+    assert (state["last_job_id"], state["last_outcome"]) == (run.job_id, "enqueued")
+
+
+def test_missed_runs_are_coalesced_and_state_survives_a_restart():
+    r = fakeredis.FakeRedis()
+    Scheduler(r, [_hourly()]).tick(T0)
+
+    # Down for five hours: a new scheduler runs the missed slots once
+    [run] = Scheduler(r, [_hourly()]).tick(T0 + 5 * HOUR + 60)
+    assert (run.slot, run.coalesced) == (T0 + HOUR, 4)
+    assert float(Scheduler(r, [_hourly()]).state("hourly")["next_run"]) == T0 + 6 * HOUR
+
+
+def test_a_run_is_skipped_while_the_previous_job_is_in_progress():
+    r = fakeredis.FakeRedis()
+    s = Scheduler(r, [_hourly()])
+    s.tick(T0)
+    [first] = s.tick(T0 + HOUR)
+    [second] = s.tick(T0 + 2 * HOUR)  # nothing has worked the first job yet
+    assert not second.enqueued and second.job_id == first.job_id
+    assert s.state("hourly")["last_outcome"] == "skipped"
+
+    _work(r)
+    [third] = s.tick(T0 + 3 * HOUR)
+    assert third.enqueued and third.job_id != first.job_id
+
+
+def test_jitter_spreads_schedules_sharing_a_cron_expression():
+    r = fakeredis.FakeRedis()
+    schedules = [_hourly(f"s{i}", jitter=600) for i in range(5)]
+    s = Scheduler(r, schedules)
+    s.tick(T0)
+    due = {x.name: float(s.state(x.name)["due_at"]) for x in schedules}
+    assert len(set(due.values())) == 5
+    assert all(T0 + HOUR <= d <= T0 + HOUR + 600 for d in due.values())
+    # The offsets are per schedule and slot, not per scheduler
+    assert Scheduler(r, schedules).state("s0")["due_at"] == repr(due["s0"])
+
+    # Nothing starts before its own offset
+    first = min(due, key=due.get)
+    assert [run.schedule for run in s.tick(due[first])] == [first]
+    assert len(s.tick(T0 + HOUR + 600)) == 4
+
+
+def test_editing_the_cron_expression_replans():
+    r = fakeredis.FakeRedis()
+    Scheduler(r, [_hourly()]).tick(T0)
+    daily = Schedule("hourly", "0 6 * * *", "builtins.dict")
+    s = Scheduler(r, [daily])
+    assert s.tick(T0 + HOUR) == []
+    assert float(s.state("hourly")["next_run"]) == T0 + 6 * HOUR
+
+
+def test_only_one_scheduler_leads():
+    r = fakeredis.FakeRedis()
+    a, b = Scheduler(r, [], interval=1), Scheduler(r, [], interval=1)
+    assert a.lead() and not b.lead()
+    assert a.lead()  # renewing
+    a.resign()
+    assert b.lead() and not a.lead()
+
+
+def test_load_schedules():
+    assert load_schedules(None) == DEFAULT_SCHEDULES
+    assert load_schedules("[]") == []
+    [s] = load_schedules('[{"name": "x", "cron": "*/5 * * * *", "func": "m.f", "jitter": 30}]')
+    assert (s.queue, s.jitter, s.kwargs) == ("default", 30, {})
+    with pytest.raises(ValueError, match="cron"):
+        load_schedules('[{"name": "x", "cron": "every day", "func": "m.f"}]')
+    with pytest.raises(ValueError, match="Duplicate"):
+        load_schedules(
+            '[{"name": "x", "cron": "* * * * *", "func": "m.f"},'
+            ' {"name": "x", "cron": "0 * * * *", "func": "m.f"}]'
+        )
+
+
+def test_scheduled_library_sync(monkeypatch):
+    r = fakeredis.FakeRedis()
+    monkeypatch.setenv("YT_BACKEND", "fake")
+    monkeypatch.setenv("YT_FAKE_PLAYLISTS", "3")
+    monkeypatch.setenv("YT_FAKE_TRACKS", "10")
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    get_client_pool.cache_clear()
+    env_backend.cache_clear()
+    try:
+        [sync] = [s for s in DEFAULT_SCHEDULES if s.name == "library-sync"]
+        s = Scheduler(r, [sync])
+        s.tick(T0)
+        [run] = s.tick(T0 + 6 * HOUR + sync.jitter)
+        SimpleWorker([sync.queue], connection=r).work(burst=True)
+        result = Job.fetch(run.job_id, connection=r).return_value()
+        assert result["listed"] == 3 and result["written"] == 3
+        assert len(RedisPlaylistRepo(r).list_ids()) == 3
+    finally:
+        get_client_pool().close()
+        get_client_pool.cache_clear()
+        env_backend.cache_clear()
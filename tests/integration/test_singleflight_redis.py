@@ -0,0 +1,57 @@
+import threading
+
+import pytest
+
+try:
+    import fakeredis
+except Exception:  # pragma: no cover
+    fakeredis = None
+
+from sortune_adapters.ytmusic.singleflight import SingleFlight
+
+
+@pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+def test_coalescing_spans_processes_through_redis():
+    server = fakeredis.FakeServer()
+    api = SingleFlight(fakeredis.FakeRedis(server=server), result_ttl=5, poll_interval=0.01)
+    worker = SingleFlight(fakeredis.FakeRedis(server=server), result_ttl=5, poll_interval=0.01)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_fetch():
+        started.set()
+        release.wait(2)
+        return {"tracks": ["a", "b"]}
+
+    def unexpected_fetch():
+        raise AssertionError("worker should reuse the API's fetch")
+
+    out = {}
+    t = threading.Thread(target=lambda: out.setdefault("api", api.do("k", slow_fetch)))
+    t.start()
+    started.wait(2)
+    w = threading.Thread(target=lambda: out.setdefault("worker", worker.do("k", unexpected_fetch)))
+    w.start()
+    release.set()
+    t.join(2)
+    w.join(2)
+
+    assert out == {"api": {"tracks": ["a", "b"]}, "worker": {"tracks": ["a", "b"]}}
+    assert (api.calls, worker.calls, worker.shared) == (1, 0, 1)
+    # The lock is released; only the short-lived shared result remains
+    r = fakeredis.FakeRedis(server=server)
+    assert r.exists("singleflight:lock:k") == 0
+    assert 0 < r.pttl("singleflight:result:k") <= 5000
+
+
+@pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+def test_failed_leader_releases_lock_for_next_caller():
+    r = fakeredis.FakeRedis()
+    flight = SingleFlight(r, result_ttl=5)
+
+    def boom():
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        flight.do("k", boom)
+    assert r.exists("singleflight:lock:k") == 0
+    assert flight.do("k", lambda: [1]) == [1]
@@ -0,0 +1,106 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import pytest
+
+try:
+    import fakeredis
+except Exception:  # pragma: no cover
+    fakeredis = None
+
+from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
+from sortune_core.models.playlist import Playlist
+from sortune_core.services.playlist_service import PlaylistService
+
+
+def _seed(repo: RedisPlaylistRepo, n: int) -> list[str]:
+    ids = []
+    for i in range(n):
+        pid = f"pl{i}"
+        repo.save(
+            Playlist.model_validate(
+                {
+                    "playlistId": pid,
+                    "title": pid,
+                    "tracks": [{"videoId": t, "title": t, "artists": []} for t in ("c", "a", "B")],
+                }
+            )
+        )
+        ids.append(pid)
+    return ids
+
+
+@pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+def test_sort_many_streams_results_and_persists_in_batches():
+    repo = RedisPlaylistRepo(fakeredis.FakeRedis())
+    ids = _seed(repo, 7)
+    svc = PlaylistService(tracks=None, playlists=repo)
+
+    results = list(svc.sort_many(ids, "by_title", batch_size=3))
+    assert [r.playlist_id for r in results] == ids
+    assert all(r.changed and r.count == 3 and r.sort_seconds >= 0 for r in results)
+    assert [t.title for t in repo.get("pl4").tracks] == ["a", "B", "c"]
+
+    again = list(svc.sort_many(ids, "by_title", batch_size=3))
+    assert not any(r.changed for r in again)
+
+
+@pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+def test_sort_many_on_process_pool():
+    repo = RedisPlaylistRepo(fakeredis.FakeRedis())
+    ids = _seed(repo, 4)
+    svc = PlaylistService(tracks=None, playlists=repo)
+
+    with ProcessPoolExecutor(max_workers=2, mp_context=get_context("spawn")) as pool:
+        results = list(svc.sort_many(ids, "by_title", batch_size=2, executor=pool))
+
+    assert sum(r.changed for r in results) == 4
+    assert [t.title for t in repo.get("pl0").tracks] == ["a", "B", "c"]
+
+
+@pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+def test_sort_many_rejects_unknown_rule():
+    repo = RedisPlaylistRepo(fakeredis.FakeRedis())
+    with pytest.raises(ValueError):
+        list(PlaylistService(tracks=None, playlists=repo).sort_many(["x"], "nope"))
+
+
+@pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+def test_sort_many_skips_playlists_the_rule_was_already_applied_to():
+    repo = RedisPlaylistRepo(fakeredis.FakeRedis())
+    ids = _seed(repo, 3)
+    svc = PlaylistService(tracks=None, playlists=repo)
+    list(svc.sort_many(ids, "by_title"))
+    assert all(repo.get_applied_hash(pid, "by_title") == repo.get_hash(pid) for pid in ids)
+
+    # pl1 changes upstream (a re-import): only it is sorted and written again
+    repo.save(repo.get("pl1").model_copy(update={"tracks": list(reversed(repo.get("pl1").tracks))}))
+    saved = []
+    save_many = repo.save_many
+    repo.save_many = lambda playlists: saved.extend(p.id for p in playlists) or save_many(playlists)
+
+    results = list(svc.sort_many(ids, "by_title"))
+    assert saved == ["pl1"]
+    assert [(r.playlist_id, r.count, r.changed) for r in results] == [
+        ("pl0", 3, False),
+        ("pl1", 3, True),
+        ("pl2", 3, False),
+    ]
+    assert [t.title for t in repo.get("pl1").tracks] == ["a", "B", "c"]
+
+
+@pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+def test_sort_many_reads_and_records_markers_per_batch_not_per_playlist(monkeypatch):
+    repo = RedisPlaylistRepo(fakeredis.FakeRedis())
+    ids = _seed(repo, 10)
+    svc = PlaylistService(tracks=None, playlists=repo)
+    for name in ("get_hash", "get_applied_hash", "set_applied_hash"):
+        monkeypatch.setattr(repo, name, lambda *a, _name=name: pytest.fail(f"{_name} per playlist"))
+    batches = []
+    get_many = repo.get_many
+    monkeypatch.setattr(repo, "get_many", lambda pids: batches.append(len(pids)) or get_many(pids))
+
+    assert sum(r.changed for r in svc.sort_many(ids, "by_title", batch_size=4)) == 10
+    assert batches == [4, 4, 2]
+    assert repo.get_applied_hashes(ids, "by_title") == repo.get_hashes(ids)
+    assert not any(r.changed for r in svc.sort_many(ids, "by_title", batch_size=4))
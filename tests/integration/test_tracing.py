@@ -0,0 +1,124 @@
+import importlib
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+try:
+    import fakeredis
+except Exception:  # pragma: no cover
+    fakeredis = None
+
+try:
+    from opentelemetry import sdk as otel_sdk
+except Exception:  # pragma: no cover
+    otel_sdk = None
+
+from rq import SimpleWorker
+from sortune_adapters.storage.redis_repo import RedisPlaylistRepo
+from sortune_adapters.telemetry import clear_spans, configure_tracing, finished_spans
+from sortune_adapters.ytmusic.client import YTMusicClient
+from sortune_adapters.ytmusic.fake import FakeYTMusic
+from sortune_ai.providers import LangChainLLM
+from sortune_api.main import app
+from sortune_core.models.playlist import Playlist
+from sortune_worker.tracing import TracedJobsMixin
+
+playlists_module = importlib.import_module("sortune_api.routes.playlists")
+
+pytestmark = pytest.mark.skipif(otel_sdk is None, reason="opentelemetry-sdk not installed")
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def spans():
+    # The tracer provider can only be installed once per process
+    configure_tracing("sortune-test", "memory")
+
+
+@pytest.fixture(autouse=True)
+def _clear():
+    clear_spans()
+
+
+def _by_name() -> dict:
+    return {s.name: s for s in finished_spans()}
+
+
+def test_request_span_is_named_by_route_and_continues_the_callers_trace(client):
+    res = client.get(
+        "/playlists/demo", headers={"traceparent": f"00-{TRACE_ID}-00f067aa0ba902b7-01"}
+    )
+    assert res.status_code == 200
+
+    span = _by_name()["GET /playlists/{playlist_id}"]
+    assert format(span.context.trace_id, "032x") == TRACE_ID
+    assert span.attributes["http.route"] == "/playlists/{playlist_id}"
+    assert span.attributes["http.response.status_code"] == 200
+
+
+class _InProcessTracedWorker(TracedJobsMixin, SimpleWorker):
+    """A tracing worker without the fork, so the job's spans are recorded in this process."""
+
+
+@pytest.mark.skipif(fakeredis is None, reason="fakeredis not installed")
+def test_background_job_spans_join_the_request_trace(client):
+    r = fakeredis.FakeRedis()
+    app.dependency_overrides[playlists_module.get_redis] = lambda: r
+    app.dependency_overrides[playlists_module.get_repo] = lambda: RedisPlaylistRepo(r)
+    try:
+        RedisPlaylistRepo(r).save(
+            Playlist.model_validate(
+                {
+                    "playlistId": "mine",
+                    "title": "Mine",
+                    "tracks": [{"videoId": v, "title": v, "artists": []} for v in "ba"],
+                }
+            )
+        )
+        assert client.post("/playlists/mine/sort?background=true").status_code == 202
+        _InProcessTracedWorker(["sort"], connection=r).work(burst=True)
+    finally:
+        app.dependency_overrides.pop(playlists_module.get_redis, None)
+
+    spans = _by_name()
+    request, job = spans["POST /playlists/{playlist_id}/sort"], spans["job sort"]
+    assert job.context.trace_id == request.context.trace_id
+    assert job.attributes["sortune.job_ok"] is True
+
+    sort = spans["PlaylistService.sort_playlist"]
+    assert sort.parent.span_id == job.context.span_id
+    assert sort.attributes["sortune.tracks"] == 2
+    for child in ("RedisPlaylistRepo.get", "rule.apply", "RedisPlaylistRepo.save"):
+        assert spans[child].parent.span_id == sort.context.span_id
+    assert spans["RedisPlaylistRepo.get"].attributes["sortune.payload_bytes"] > 0
+
+
+def test_ytmusic_spans_separate_upstream_calls_from_mapping():
+    client = YTMusicClient(yt=FakeYTMusic(tracks=30, latency=0), cache=False)
+    assert len(client.get_playlist_tracks("PLfake00000")) == 30
+
+    spans = _by_name()
+    call = spans["ytmusic.get_playlist"]
+    assert spans["ytmusic.upstream.get_playlist"].parent.span_id == call.context.span_id
+    assert spans["ytmusic.map_tracks"].attributes["sortune.tracks"] == 30
+
+
+def test_llm_span_records_model_and_tokens(monkeypatch):
+    class FakeChatOpenAI:
+        def __init__(self, model: str, **kwargs):
+            pass
+
+        def invoke(self, prompt: str, **kwargs):
+            return SimpleNamespace(
+                content="{}", usage_metadata={"input_tokens": 9, "output_tokens": 3}
+            )
+
+    monkeypatch.setitem(sys.modules, "langchain_openai", SimpleNamespace(ChatOpenAI=FakeChatOpenAI))
+    LangChainLLM(model="gpt-4o-mini").generate("hi")
+
+    span = _by_name()["LangChainLLM.generate"]
+    assert span.attributes["gen_ai.request.model"] == "gpt-4o-mini"
+    assert span.attributes["gen_ai.usage.input_tokens"] == 9
+    assert span.attributes["gen_ai.usage.output_tokens"] == 3
@@ -47,3 +47,32 @@ def test_langchain_llm_generate_uses_mocked_chat(monkeypatch):
     assert calls["invoke"]["kwargs"].get("seed") == 7
     # Extra kwargs forwarded
     assert calls["invoke"]["kwargs"].get("foo") == "bar"
+
+
+def test_langchain_llm_records_latency_and_tokens(monkeypatch):
+    from prometheus_client import REGISTRY
+
+    class FakeChatOpenAI:
+        def __init__(self, model: str, **kwargs):
+            pass
+
+        def invoke(self, prompt: str, **kwargs):
+            return SimpleNamespace(
+                content="{}", usage_metadata={"input_tokens": 12, "output_tokens": 5}
+            )
+
+    monkeypatch.setitem(sys.modules, "langchain_openai", SimpleNamespace(ChatOpenAI=FakeChatOpenAI))
+    labels = {"backend": "openai", "model": "metered"}
+
+    def value(name: str, **extra: str) -> float:
+        return REGISTRY.get_sample_value(name, {**labels, **extra}) or 0.0
+
+    calls = value("sortune_llm_call_seconds_count", outcome="ok")
+    tokens_in = value("sortune_llm_tokens_total", kind="input")
+    tokens_out = value("sortune_llm_tokens_total", kind="output")
+
+    LangChainLLM(model="metered", backend="openai").generate("hi")
+
+    assert value("sortune_llm_call_seconds_count", outcome="ok") == calls + 1
+    assert value("sortune_llm_tokens_total", kind="input") == tokens_in + 12
+    assert value("sortune_llm_tokens_total", kind="output") == tokens_out + 5
@@ -0,0 +1,61 @@
+from sortune_core.graph.cooccurrence import ArtistGraph
+from sortune_core.models.playlist import Playlist
+
+
+def _pl(pid: str, *artist_sets: list[str]) -> Playlist:
+    return Playlist.model_validate(
+        {
+            "playlistId": pid,
+            "title": pid,
+            "tracks": [
+                {
+                    "videoId": f"{pid}-{i}",
+                    "title": f"T{i}",
+                    "artists": [{"name": a} for a in artists],
+                }
+                for i, artists in enumerate(artist_sets)
+            ],
+        }
+    )
+
+
+def test_neighbors_ranked_by_normalized_cooccurrence() -> None:
+    g = ArtistGraph.build(
+        [
+            _pl("p1", ["Alice"], ["Bob"]),
+            _pl("p2", ["Alice", "Bob"], ["Carol"]),
+            _pl("p3", ["Carol"], ["Dave"]),
+        ]
+    )
+    out = g.neighbors("alice", k=5)
+    assert [n.name for n in out] == ["Bob", "Carol"]
+    assert out[0].shared_playlists == 2
+    assert out[0].score == 1.0
+    assert g.neighbors("alice", k=1)[0].name == "Bob"
+    assert g.neighbors("Nobody") == []
+
+
+def test_incremental_update_matches_full_rebuild() -> None:
+    p1 = _pl("p1", ["Alice"], ["Bob"])
+    p2 = _pl("p2", ["Alice"], ["Carol"])
+    g = ArtistGraph.build([p1, p2])
+
+    p2_new = _pl("p2", ["Bob"], ["Carol"])
+    assert g.upsert_playlist(p2_new) is True
+    assert g.upsert_playlist(p2_new) is False
+
+    fresh = ArtistGraph.build([p1, p2_new])
+    assert g.to_dict() == fresh.to_dict()
+
+    assert g.remove_playlist("p1") is True
+    assert [n.name for n in g.neighbors("Alice")] == []
+    assert [n.name for n in g.neighbors("Bob")] == ["Carol"]
+
+
+def test_roundtrip_serves_queries_and_accepts_updates() -> None:
+    g = ArtistGraph.build([_pl("p1", ["Alice"], ["Bob"])])
+    restored = ArtistGraph.from_dict(g.to_dict())
+    assert restored.neighbors("Alice") == g.neighbors("Alice")
+
+    restored.upsert_playlist(_pl("p2", ["Alice"], ["Carol"]))
+    assert {n.name for n in restored.neighbors("Alice")} == {"Bob", "Carol"}
@@ -0,0 +1,41 @@
+import pytest
+from pydantic import TypeAdapter
+from sortune_core.models.playlist import Playlist, Track
+from sortune_core.models.projection import model_include, parse_fields, project
+
+TRACK = Track.model_validate(
+    {
+        "videoId": "v1",
+        "title": "Song",
+        "artists": [{"name": "A", "id": "UCa", "thumbnails": [{"url": "u"}]}],
+        "album": {"name": "Al", "id": "MPREb_1"},
+        "likeStatus": "LIKE",
+    }
+)
+
+
+def test_parse_fields_accepts_names_and_aliases():
+    fields = parse_fields("tracks.id, tracks.videoId,tracks.artists.name,name", Playlist)
+    assert fields == {"tracks": {"videoId": None, "artists": {"name": None}}, "title": None}
+    # A whole subtree wins over parts of it, in either order
+    assert parse_fields("tracks.title,tracks", Playlist) == {"tracks": None}
+    assert parse_fields(" , ", Playlist) is None
+
+
+@pytest.mark.parametrize("spec", ["tracks.nope", "tracks..id", "bogus"])
+def test_parse_fields_rejects_unknown_fields(spec):
+    with pytest.raises(ValueError):
+        parse_fields(spec, Playlist)
+
+
+def test_project_matches_pydantic_include():
+    fields = parse_fields("id,artists.name,album,likeStatus", Track)
+    doc = project(TRACK.model_dump(by_alias=True), fields)
+    assert doc == {
+        "videoId": "v1",
+        "artists": [{"name": "A"}],
+        "album": TRACK.album.model_dump(),
+        "likeStatus": "LIKE",
+    }
+    include = {"__all__": model_include(Track, fields)}
+    assert TypeAdapter(list[Track]).dump_python([TRACK], by_alias=True, include=include) == [doc]
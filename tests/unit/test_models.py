@@ -18,3 +18,23 @@ def test_playlist_model_validation():
     assert pl.id == "demo"
     assert pl.tracks[0].title == "Test"
     assert pl.tracks[0].artists[0].name == "Tester"
+
+
+def test_content_hash_tracks_order_and_metadata():
+    data = {
+        "playlistId": "demo",
+        "title": "Demo",
+        "tracks": [
+            {"videoId": "1", "title": "A", "artists": []},
+            {"videoId": "2", "title": "B", "artists": []},
+        ],
+    }
+    a = Playlist.model_validate(data)
+    b = Playlist.model_validate(data)
+    assert a.content_hash() == b.content_hash()
+
+    b.tracks.reverse()
+    assert a.content_hash() != b.content_hash()
+
+    c = Playlist.model_validate({**data, "title": "Other"})
+    assert a.content_hash() != c.content_hash()
@@ -0,0 +1,59 @@
+import time
+
+import pytest
+from sortune_adapters.ytmusic.client import YTMusicClient
+from sortune_adapters.ytmusic.importer import LibraryImporter
+from sortune_adapters.ytmusic.pool import YTMusicClientPool
+from sortune_adapters.ytmusic.ratelimit import (
+    AIMDRateLimiter,
+    TokenBucket,
+    is_throttle_error,
+    shared_limiter,
+)
+from sortune_adapters.ytmusic.writeback import PlaylistWriteBack
+
+
+def test_token_bucket_allows_burst_then_paces() -> None:
+    bucket = TokenBucket(rate=50, burst=3)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    elapsed = time.monotonic() - start
+    # 3 immediate tokens, then 2 more at 50/s
+    assert 0.03 <= elapsed < 0.5
+
+
+def test_token_bucket_rejects_non_positive_rate() -> None:
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_aimd_increases_additively_and_halves_once_per_cooldown() -> None:
+    limiter = AIMDRateLimiter(rate=4, increase=1, decrease=0.5, max_rate=6, cooldown=60)
+    limiter.on_success()
+    limiter.on_success()
+    limiter.on_success()
+    assert limiter.rate == 6  # capped
+
+    limiter.on_throttle()
+    limiter.on_throttle()  # same cooldown window: ignored
+    assert limiter.rate == 3
+
+
+def test_is_throttle_error() -> None:
+    assert is_throttle_error(Exception("Server returned HTTP 429: Too Many Requests."))
+    assert not is_throttle_error(Exception("Server returned HTTP 404: Not Found."))
+
+
+def test_imports_and_write_backs_share_the_process_limiter() -> None:
+    client = YTMusicClient(yt=object(), cache=False)
+    pool = YTMusicClientPool(1)
+    try:
+        limiter = LibraryImporter(client, repo=None).limiter
+        assert limiter is shared_limiter() is pool.limiter
+        assert PlaylistWriteBack(client).limiter is limiter
+        # Callers can still bring their own
+        own = AIMDRateLimiter()
+        assert PlaylistWriteBack(client, limiter=own).limiter is own
+    finally:
+        pool.close()
@@ -0,0 +1,41 @@
+import random
+
+import pytest
+from sortune_core.diff.moves import apply_moves, longest_increasing_subsequence, plan_moves
+
+
+def test_lis_indices() -> None:
+    values = [3, 1, 4, 1, 5, 9, 2, 6]
+    idx = longest_increasing_subsequence(values)
+    picked = [values[i] for i in idx]
+    assert len(picked) == 4
+    assert picked == sorted(set(picked))
+    assert longest_increasing_subsequence([]) == []
+
+
+def test_single_moved_item_costs_one_move() -> None:
+    current = list("abcdefgh")
+    target = ["h", *"abcdefg"]
+    moves = plan_moves(current, target)
+    assert moves == [("h", "a")]
+    assert apply_moves(current, moves) == target
+    assert plan_moves(current, current) == []
+
+
+def test_random_permutations_round_trip_with_minimal_moves() -> None:
+    rng = random.Random(7)
+    for n in (1, 2, 10, 200):
+        current = list(range(n))
+        target = current[:]
+        rng.shuffle(target)
+        moves = plan_moves(current, target)
+        assert apply_moves(current, moves) == target
+        ranks = [target.index(x) for x in current]
+        assert len(moves) == n - len(longest_increasing_subsequence(ranks))
+
+
+def test_plan_requires_the_same_items() -> None:
+    with pytest.raises(ValueError):
+        plan_moves(["a", "b"], ["a", "c"])
+    with pytest.raises(ValueError):
+        plan_moves(["a", "a"], ["a", "a"])
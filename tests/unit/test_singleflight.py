@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+from sortune_adapters.ytmusic.client import YTMusicClient
+from sortune_adapters.ytmusic.singleflight import SingleFlight
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_concurrent_identical_calls_share_one_fetch():
+    flight = SingleFlight(result_ttl=0)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(2)
+        return {"tracks": [1, 2, 3]}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", fetch)))
+    leader.start()
+    started.wait(2)
+    followers = [
+        threading.Thread(target=lambda: results.append(flight.do("k", fetch))) for _ in range(4)
+    ]
+    for t in followers:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in [leader, *followers]:
+        t.join(2)
+
+    assert len(calls) == 1
+    assert len(results) == 5 and all(r is results[0] for r in results)
+    assert flight.shared == 4
+    # result_ttl=0: a later call fetches again
+    flight.do("k", fetch)
+    assert len(calls) == 2
+
+
+def test_results_are_reused_for_ttl_and_failures_are_not():
+    clock = _Clock()
+    flight = SingleFlight(result_ttl=2.0, clock=clock)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return len(calls)
+
+    assert flight.do("a", fetch) == 1
+    clock.now = 1.5
+    assert flight.do("a", fetch) == 1
+    assert flight.do("b", fetch) == 2  # different key
+    clock.now = 2.5
+    assert flight.do("a", fetch) == 3
+
+    def boom():
+        raise RuntimeError("429")
+
+    with pytest.raises(RuntimeError):
+        flight.do("c", boom)
+    assert flight.do("c", fetch) == 4
+
+
+def test_client_coalesces_by_endpoint_and_arguments():
+    class Backend:
+        def __init__(self):
+            self.calls = []
+
+        def get_playlist(self, playlistId, limit=None):
+            self.calls.append((playlistId, limit))
+            return {"tracks": [{"videoId": "v", "title": "T", "artists": []}]}
+
+    backend = Backend()
+    flight = SingleFlight(result_ttl=60)
+    a = YTMusicClient(yt=backend, flight=flight)
+    b = YTMusicClient(yt=backend, flight=flight)
+    a.get_playlist_tracks("PL1")
+    b.get_playlist_tracks("PL1")
+    b.get_playlist_tracks("PL1", limit=5)
+    assert backend.calls == [("PL1", None), ("PL1", 5)]
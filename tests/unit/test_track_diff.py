@@ -0,0 +1,31 @@
+from sortune_core.diff.tracks import diff_track_ids, diff_tracks
+from sortune_core.models.playlist import Track
+
+
+def _t(vid: str, title: str | None = None) -> Track:
+    return Track.model_validate({"videoId": vid, "title": title or vid, "artists": []})
+
+
+def test_diff_tracks_reports_adds_removes_updates_and_order() -> None:
+    old = [_t("a"), _t("b"), _t("c")]
+    new = [_t("c"), _t("a", "A (Remastered)"), _t("d")]
+    diff = diff_tracks(old, new)
+    assert diff.added == ["d"]
+    assert diff.removed == ["b"]
+    assert diff.updated == ["a"]
+    assert diff.reordered is True
+    assert diff.changed
+
+
+def test_diff_tracks_identical_lists() -> None:
+    tracks = [_t("a"), _t("b")]
+    diff = diff_tracks(tracks, list(tracks))
+    assert not diff.changed
+    # removing a track does not by itself count as a reorder
+    assert diff_tracks(tracks, tracks[1:]).reordered is False
+
+
+def test_diff_track_ids_matches_diff_tracks_without_updates() -> None:
+    diff = diff_track_ids(["a", "b", "c"], ["c", "a", "d"])
+    assert (diff.added, diff.removed, diff.updated, diff.reordered) == (["d"], ["b"], [], True)
+    assert not diff_track_ids(["a", "b"], ["a", "b"]).changed
@@ -0,0 +1,82 @@
+import numpy as np
+from sortune_core.models.playlist import Track
+from sortune_core.recommend.vibe import TrackIndex
+
+
+def _t(vid: str, artist: str, album: str, year: str | None = None, dur: int = 200) -> Track:
+    return Track.model_validate(
+        {
+            "videoId": vid,
+            "title": vid,
+            "artists": [{"name": artist}],
+            "album": {"name": album, "year": year},
+            "duration_seconds": dur,
+        }
+    )
+
+
+LIBRARY = [
+    _t("k1", "Kishore", "Gold", "1975"),
+    _t("k2", "Kishore", "Gold", "1976"),
+    _t("k3", "Kishore", "Silver", "1979"),
+    _t("m1", "Metallica", "Black", "1991", dur=400),
+    _t("m2", "Metallica", "Load", "1996", dur=420),
+    _t("x1", "Other", "Misc", "2020", dur=60),
+]
+
+
+def test_similar_prefers_shared_artist_and_album() -> None:
+    index = TrackIndex.build(LIBRARY)
+    out = index.similar([LIBRARY[0]], k=3)
+    ids = [r.track.id for r in out]
+    assert "k1" not in ids  # seeds are excluded
+    assert ids[:2] == ["k2", "k3"]
+    assert out[0].score >= out[1].score >= out[2].score
+
+
+def test_similar_uses_tags_and_respects_exclude() -> None:
+    seed = LIBRARY[3]  # m1
+    # Untagged, the unrelated x1 ranks behind the Kishore tracks
+    untagged = TrackIndex.build(LIBRARY).similar([seed], k=4, exclude=["m2"])
+    assert [r.track.id for r in untagged][-1] == "x1"
+
+    # Sharing a tag with the seed lifts it above them
+    index = TrackIndex.build(LIBRARY, tags={"m1": ["metal"], "m2": ["metal"], "x1": ["metal"]})
+    out = index.similar([seed], k=4, exclude=["m2"])
+    assert [r.track.id for r in out][0] == "x1"
+    assert out[0].score > out[1].score
+    assert "m2" not in [r.track.id for r in out]
+    assert index.similar([], k=5) == []
+
+
+def test_query_on_50k_tracks_only_sorts_the_top_k(monkeypatch) -> None:
+    n, dim = 50_000, 256
+    rng = np.random.default_rng(0)
+    matrix = rng.standard_normal((n, dim)).astype(np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    tracks = [
+        Track.model_construct(id=str(i), title=str(i), artists=[], in_library=False)
+        for i in range(n)
+    ]
+    index = TrackIndex(tracks, matrix, dim)
+    seeds = tracks[:30]
+
+    # The query's cost is one matrix-vector product, a linear-time selection over
+    # the library and a sort of only the k winners (never of all 50k scores)
+    calls: dict[str, list[int]] = {"argpartition": [], "argsort": []}
+    for name, sizes in calls.items():
+        real = getattr(np, name)
+
+        def spy(a, *args, _real=real, _sizes=sizes, **kwargs):
+            _sizes.append(len(a))
+            return _real(a, *args, **kwargs)
+
+        monkeypatch.setattr(np, name, spy)
+    out = index.similar(seeds, k=20)
+    monkeypatch.undo()
+
+    assert calls == {"argpartition": [n], "argsort": [20]}
+    centroid = matrix[:30].mean(axis=0)
+    scores = matrix @ (centroid / np.linalg.norm(centroid))
+    scores[:30] = -np.inf
+    assert [r.track.id for r in out] == [str(i) for i in np.argsort(-scores)[:20]]
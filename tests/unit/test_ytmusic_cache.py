@@ -0,0 +1,92 @@
+from sortune_adapters.ytmusic.cache import ResponseCache
+from sortune_adapters.ytmusic.client import YTMusicClient
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingFetch:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self) -> dict:
+        self.calls += 1
+        return {"version": self.calls}
+
+
+def test_fresh_hit_stale_revalidate_and_expiry(tmp_path) -> None:
+    clock = Clock()
+    cache = ResponseCache(
+        tmp_path / "c.sqlite", ttls={"get_playlist": 10}, stale_ttl=100, clock=clock
+    )
+    fetch = CountingFetch()
+    args = {"playlistId": "PL1", "limit": None}
+
+    assert cache.get_or_fetch("get_playlist", args, fetch) == {"version": 1}
+    clock.now += 5
+    assert cache.get_or_fetch("get_playlist", args, fetch) == {"version": 1}
+    assert fetch.calls == 1
+
+    # Stale: old value served immediately, refreshed in the background
+    clock.now += 10
+    assert cache.get_or_fetch("get_playlist", args, fetch) == {"version": 1}
+    cache._bg.shutdown(wait=True)
+    assert fetch.calls == 2
+    assert cache.entry("get_playlist", args).value == {"version": 2}
+
+    # Past ttl + stale_ttl: blocking re-fetch
+    clock.now += 1_000
+    assert cache.get_or_fetch("get_playlist", args, fetch) == {"version": 3}
+    cache.close()
+
+
+def test_refresh_bypasses_and_arguments_are_part_of_the_key(tmp_path) -> None:
+    cache = ResponseCache(tmp_path / "c.sqlite")
+    fetch = CountingFetch()
+
+    cache.get_or_fetch("get_playlist", {"playlistId": "A"}, fetch)
+    cache.get_or_fetch("get_playlist", {"playlistId": "B"}, fetch)
+    assert fetch.calls == 2
+    assert cache.get_or_fetch("get_playlist", {"playlistId": "A"}, fetch, refresh=True) == {
+        "version": 3
+    }
+    assert cache.entry("get_playlist", {"playlistId": "A"}).value == {"version": 3}
+    cache.close()
+
+
+def test_client_serves_repeat_calls_from_cache(tmp_path) -> None:
+    class FakeYT:
+        calls = 0
+
+        def get_playlist(self, playlistId, limit=None):
+            FakeYT.calls += 1
+            return {"tracks": [{"videoId": "v1", "title": "Song", "artists": []}]}
+
+    cache = ResponseCache(tmp_path / "c.sqlite")
+    client = YTMusicClient(yt=FakeYT(), cache=cache)
+    assert [t.id for t in client.get_playlist_tracks("PL")] == ["v1"]
+    assert [t.id for t in client.get_playlist_tracks("PL")] == ["v1"]
+    assert FakeYT.calls == 1
+    client.get_playlist_tracks("PL", refresh=True)
+    assert FakeYT.calls == 2
+    cache.close()
+
+
+def test_fresh_digest_tracks_the_served_entry(tmp_path):
+    clock = Clock()
+    cache = ResponseCache(tmp_path / "c.sqlite", ttls={"get_playlist": 60}, clock=clock)
+    args = {"playlistId": "A"}
+    assert cache.fresh_digest("get_playlist", args) is None
+
+    entry = cache.get_or_fetch_entry("get_playlist", args, lambda: {"v": 1})
+    assert cache.fresh_digest("get_playlist", args) == entry.digest
+    assert cache.get_or_fetch_entry("get_playlist", args, lambda: {"v": 2}).digest == entry.digest
+
+    clock.now += 61  # stale: served, but no longer a version a 304 may vouch for
+    assert cache.fresh_digest("get_playlist", args) is None
+    cache.close()
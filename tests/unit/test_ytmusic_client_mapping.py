@@ -1,4 +1,4 @@
-from sortune_adapters.ytmusic.client import YTMusicClient
+from sortune_adapters.ytmusic.client import YTMusicClient, map_tracks
 from sortune_core.models.playlist import Track
 
 
@@ -37,3 +37,57 @@ def test_to_track_respects_in_library_alias() -> None:
     raw = {"videoId": "id42", "title": "Alias Field", "artists": [], "inLibrary": True}
     t: Track = YTMusicClient._to_track(raw)
     assert t.in_library is True
+
+
+def test_iter_playlist_tracks_yields_mapped_pages() -> None:
+    class Backend:
+        def get_playlist(self, playlistId, limit=None):
+            tracks = [{"videoId": f"v{i}", "title": f"T{i}", "artists": []} for i in range(5)]
+            tracks.insert(2, {"title": "no id", "artists": []})
+            return {"tracks": tracks}
+
+    client = YTMusicClient(yt=Backend())
+    pages = list(client.iter_playlist_tracks("PL", page_size=2))
+    assert [[t.id for t in page] for page in pages] == [["v0", "v1"], ["v2"], ["v3", "v4"]]
+    assert [t.id for t in client.get_playlist_tracks("PL")] == ["v0", "v1", "v2", "v3", "v4"]
+
+
+def test_map_tracks_validates_page_and_collects_rejects() -> None:
+    raw = [
+        {"videoId": "a", "title": "A", "artists": [{"name": "X"}], "inLibrary": None},
+        {"videoId": None, "title": "Unavailable", "artists": []},
+        {"id": "b", "title": "B", "artists": [], "thumbnails": [{"url": "u"}]},
+        {"videoId": "c", "title": "C", "artists": "not-a-list"},
+        "garbage",
+        {"videoId": "d", "title": "D", "artists": []},
+    ]
+    before = [dict(t) if isinstance(t, dict) else t for t in raw]
+
+    batch = map_tracks(raw)
+
+    assert [t.id for t in batch.tracks] == ["a", "b", "d"]
+    assert batch.tracks[0].in_library is False
+    assert [(r.index, r.title) for r in batch.rejects] == [
+        (1, "Unavailable"),
+        (3, "C"),
+        (4, None),
+    ]
+    assert batch.rejects[0].reasons == ["videoId: missing"]
+    assert batch.rejects[1].reasons[0].startswith("artists:")
+    assert raw == before  # input untouched
+
+
+def test_map_tracks_matches_per_track_mapping() -> None:
+    raw = [
+        {
+            "videoId": f"v{i}",
+            "title": f"T{i}",
+            "artists": [{"artist": "Solo", "browseId": "UC1"}],
+            "album": {"title": "Alb", "browseId": "MP1"},
+            "likeStatus": "LIKE",
+            "duration_seconds": 100 + i,
+        }
+        for i in range(3)
+    ]
+    expected = [YTMusicClient._to_track(dict(t)) for t in raw]
+    assert map_tracks(raw).tracks == expected
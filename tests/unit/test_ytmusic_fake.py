@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pytest
+from sortune_adapters.ytmusic.client import YTMusicClient
+from sortune_adapters.ytmusic.fake import FakeUpstreamError, FakeYTMusic, env_backend
+from sortune_adapters.ytmusic.ratelimit import is_throttle_error
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_synthetic_library_has_configured_sizes_and_stable_content():
+    fake = FakeYTMusic(3, [5, 2000], seed=7)
+    client = YTMusicClient(yt=fake)
+    summaries = client.list_library_playlists()
+    assert [s["count"] for s in summaries] == ["5", "2000", "5"]
+
+    big = client.get_playlist_tracks(summaries[1]["playlistId"])
+    assert len(big) == 2000
+    assert len({t.id for t in big}) == 2000
+    assert client.get_playlist_tracks(summaries[1]["playlistId"]) == big
+    assert len(client.get_playlist_tracks(summaries[1]["playlistId"], limit=10)) == 10
+    assert fake.get_playlist(summaries[0]["playlistId"])["trackCount"] == 5
+    assert fake.calls["get_playlist"] == 4
+
+    with pytest.raises(FakeUpstreamError, match="404"):
+        fake.get_playlist("PLmissing")
+
+
+def test_quota_throttles_and_error_rate_injects_failures():
+    fake = FakeYTMusic(1, 1, quota_per_sec=2)
+    fake.get_library_playlists()
+    fake.get_library_playlists()
+    with pytest.raises(FakeUpstreamError) as exc:
+        fake.get_library_playlists()
+    assert is_throttle_error(exc.value)
+    assert fake.throttled == 1
+
+    flaky = FakeYTMusic(1, 1, error_rate=0.5, seed=1)
+    outcomes = []
+    for _ in range(200):
+        try:
+            flaky.get_library_albums()
+            outcomes.append(True)
+        except FakeUpstreamError as e:
+            assert "500" in str(e) and not is_throttle_error(e)
+            outcomes.append(False)
+    assert 60 < outcomes.count(False) < 140
+    assert flaky.errors == outcomes.count(False)
+
+
+def test_recorded_fixtures_are_served_in_their_recorded_shape():
+    fake = FakeYTMusic(fixtures=REPO_ROOT)
+    client = YTMusicClient(yt=fake)
+    summaries = client.list_library_playlists()
+    assert summaries[0]["playlistId"] == "PLXLnGytrEMpDI3fZcz1QL-8PnLkzRb6Iy"
+
+    tracks = client.get_playlist_tracks(summaries[0]["playlistId"])
+    assert len(tracks) == 271
+    assert tracks[0].title.startswith("Khaab")
+    assert client.list_library_albums()[0].name == "Seoul"
+    assert client.list_library_artists()[0].name == "Celene Cruz"
+
+
+def test_client_targets_the_fake_via_env(monkeypatch):
+    monkeypatch.setenv("YT_BACKEND", "fake")
+    monkeypatch.setenv("YT_FAKE_PLAYLISTS", "4")
+    monkeypatch.setenv("YT_FAKE_TRACKS", "3")
+    env_backend.cache_clear()
+    try:
+        client = YTMusicClient()
+        assert len(client.list_library_playlists()) == 4
+        assert len(client.get_playlist_tracks("PLfake00002")) == 3
+        assert client._cache is None  # the fake is never cached implicitly
+    finally:
+        env_backend.cache_clear()
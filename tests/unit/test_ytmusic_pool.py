@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pytest
+from sortune_adapters.ytmusic.client import YTMusicClient
+from sortune_adapters.ytmusic.pool import YTMusicClientPool
+
+
+class _Credentials:
+    def __init__(self):
+        self.calls = 0
+
+    def refresh_token(self, refresh_token):
+        self.calls += 1
+        return {"access_token": f"fresh-{self.calls}", "expires_in": 3600}
+
+
+class _Token:
+    def __init__(self, expires_at):
+        self.credentials = _Credentials()
+        self.refresh_token = "r"
+        self.access_token = "stale"
+        self.expires_at = expires_at
+        self.stored = 0
+
+    def update(self, fresh):
+        self.access_token = fresh["access_token"]
+        self.expires_at = int(time.time()) + fresh["expires_in"]
+
+    def store_token(self):
+        self.stored += 1
+
+
+class _Backend:
+    def __init__(self, expires_at):
+        self._token = _Token(expires_at)
+
+
+def test_pool_reuses_clients_and_shares_one_session():
+    sessions = []
+
+    def factory(session):
+        sessions.append(session)
+        return YTMusicClient(yt=object(), cache=None, session=session)
+
+    pool = YTMusicClientPool(2, factory=factory)
+    with pool.client() as a:
+        pass
+    with pool.client() as b:
+        assert b is a
+    with pool.client() as c, pool.client() as d:
+        assert c is not d
+    assert pool.created == 2
+    assert all(s is pool.session for s in sessions)
+    pool.close()
+
+
+def test_pool_blocks_until_a_client_is_returned():
+    pool = YTMusicClientPool(1, factory=lambda s: YTMusicClient(yt=object()), acquire_timeout=2)
+    got = []
+    with pool.client() as held:
+        t = threading.Thread(target=lambda: got.append(pool._acquire()))
+        t.start()
+        time.sleep(0.05)
+        assert got == []
+    t.join(timeout=2)
+    assert got == [held]
+
+    busy = YTMusicClientPool(1, factory=lambda s: YTMusicClient(yt=object()), acquire_timeout=0.01)
+    with busy.client(), pytest.raises(TimeoutError):
+        with busy.client():
+            pass
+
+
+def test_refresh_tokens_only_touches_tokens_near_expiry():
+    now = time.time()
+    backends = iter([_Backend(now + 30), _Backend(now + 3600)])
+    pool = YTMusicClientPool(2, factory=lambda s: YTMusicClient(yt=next(backends)))
+    with pool.client() as expiring, pool.client() as fresh:
+        pass
+
+    assert pool.refresh_tokens() == 1
+    assert expiring._yt._token.access_token == "fresh-1"
+    assert expiring._yt._token.stored == 1
+    assert fresh._yt._token.credentials.calls == 0
+    # Already refreshed: nothing left to do
+    assert pool.refresh_tokens() == 0
+    # Injected backends without OAuth tokens are skipped
+    assert YTMusicClient(yt=object()).refresh_token() is False